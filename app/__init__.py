@@ -1,6 +1,7 @@
 import click
 import logging
 import os
+import secrets
 import time
 from decimal import Decimal, InvalidOperation
 from datetime import datetime, timezone as dt_timezone
@@ -16,12 +17,24 @@ from flask import (
     send_from_directory,
 )
 from flask_login import current_user
+from jinja2 import FileSystemBytecodeCache
 from werkzeug.middleware.proxy_fix import ProxyFix
 from dotenv import load_dotenv
 from flask_wtf.csrf import CSRFError
 
+from .assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    asset_urls as bundle_asset_urls,
+    build_assets,
+    init_assets,
+    manifest_version,
+)
+from .compression import init_compression
 from .config import Config
+from .database import configure_engines, init_replica_routing
 from .extensions import csrf, db, login_manager, migrate
+from .fragment_cache import init_fragment_cache
+from .job_events import init_job_events
 from .models import User, Workshop, Store
 from .timezone import format_cordoba_datetime
 
@@ -41,9 +54,21 @@ def create_app(config_class=Config):
 
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
+    bytecode_cache_dir = app.config.get("JINJA_BYTECODE_CACHE_DIR")
+    if bytecode_cache_dir:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+    init_fragment_cache(app)
+    init_assets(app)
+    init_job_events(app)
+
     app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
+    init_compression(app)
 
     db.init_app(app)
+    configure_engines(app)
+    init_replica_routing(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     csrf.init_app(app)
@@ -60,6 +85,7 @@ def create_app(config_class=Config):
 
     @app.get("/health")
     def health_check():
+        # Publico (lo consultan el balanceador y Docker): solo responde si hay base.
         try:
             db.session.execute(db.text("SELECT 1"))
             return {"status": "ok", "db": "connected"}, 200
@@ -78,10 +104,26 @@ def create_app(config_class=Config):
 
     @app.get("/sw.js")
     def service_worker_file():
+        manifest = app.extensions["asset_manifest"]
+        if manifest:
+            precache_urls = [
+                url_for("static", filename=path) for _, path in sorted(manifest.items())
+            ]
+            cache_version = manifest_version(manifest)
+        else:
+            asset_version = app.config["ASSET_VERSION"]
+            precache_urls = [url_for("app_css_file", v=asset_version)] + [
+                url_for("static", filename=f"js/{name}", v=asset_version)
+                for name in ("pagination.js", "table-search.js", "app-tour.js", "pull-to-refresh.js")
+            ]
+            cache_version = asset_version
         response = app.response_class(
             render_template(
                 "sw.js.j2",
-                asset_version=app.config["ASSET_VERSION"],
+                asset_version=cache_version,
+                precache_urls=precache_urls,
+                offline_ttl_ms=max(app.config["OFFLINE_CACHE_TTL_HOURS"], 1) * 3600 * 1000,
+                offline_max_entries=max(app.config["OFFLINE_CACHE_MAX_ENTRIES"], 1),
             ),
             mimetype="application/javascript",
         )
@@ -214,24 +256,50 @@ def create_app(config_class=Config):
                     }
                 )
 
+        # Clave del cache offline del service worker: una por sesion, asi el
+        # navegador descarta las copias de otra sesion o usuario.
+        offline_cache_key = None
+        if (
+            service_worker_enabled
+            and app.config.get("OFFLINE_CACHE_ENABLED")
+            and current_user.is_authenticated
+            and g.get("active_workshop") is not None
+        ):
+            offline_cache_key = session.get("offline_cache_key")
+            if not offline_cache_key:
+                offline_cache_key = secrets.token_urlsafe(16)
+                session["offline_cache_key"] = offline_cache_key
+
+        manifest = app.extensions["asset_manifest"]
+
         def asset_url(path: str) -> str:
+            built = manifest.get(path)
+            if built:
+                return url_for("static", filename=built)
             if path == "css/app.css":
                 return url_for("app_css_file", v=asset_version)
             return url_for("static", filename=path, v=asset_version)
 
+        def asset_urls(bundle: str) -> list[str]:
+            return bundle_asset_urls(manifest, bundle, asset_url)
+
         return {
             "theme": theme,
             "stores": stores,
             "active_store": g.get("active_store"),
             "asset_version": asset_version,
             "service_worker_enabled": service_worker_enabled,
+            "offline_cache_key": offline_cache_key,
             "asset_url": asset_url,
+            "asset_urls": asset_urls,
             "app_tour": app_tour,
         }
 
     @app.after_request
     def apply_security_headers(response):
-        if request.path.startswith("/static/"):
+        if request.path.startswith("/static/dist/"):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        elif request.path.startswith("/static/"):
             response.headers["Cache-Control"] = "public, max-age=31536000"
 
         response.headers["X-Content-Type-Options"] = "nosniff"
@@ -283,6 +351,15 @@ def create_app(config_class=Config):
     def format_datetime_cordoba(value, fmt="%d/%m/%Y %H:%M"):
         return format_cordoba_datetime(value, fmt)
 
+    def format_filesize(value):
+        size = float(value or 0)
+        if size < 1024:
+            return f"{size:.0f} B"
+        for unit in ("KB", "MB", "GB"):
+            size /= 1024
+            if size < 1024 or unit == "GB":
+                return f"{size:.1f} {unit}"
+
     @app.cli.command("create-superadmin")
     @click.option("--email", prompt=True)
     @click.option("--name", prompt=True)
@@ -313,6 +390,136 @@ def create_app(config_class=Config):
         db.session.commit()
         click.echo("Super admin creado")
 
+    @app.cli.command("refresh-monthly-stats")
+    @click.option("--months", default=24, show_default=True, type=click.IntRange(min=1))
+    @click.option("--workshop-id", type=int, default=None)
+    def refresh_monthly_stats(months, workshop_id):
+        """Reconstruye el rollup mensual por taller de los ultimos meses."""
+        from .date_ranges import current_month_start, shift_months
+        from .services.stats_service import StatsService
+
+        last_month = current_month_start()
+        first_month = shift_months(last_month, -(months - 1))
+        written = StatsService.refresh_range(first_month, last_month, workshop_id)
+        click.echo(
+            f"Rollup mensual actualizado: {written} fila(s) entre "
+            f"{first_month:%Y-%m} y {last_month:%Y-%m}"
+        )
+
+    @app.cli.command("prune-offline-mutations")
+    @click.option("--days", default=30, show_default=True, type=click.IntRange(min=1))
+    def prune_offline_mutations(days):
+        """Borra las claves de idempotencia de la cola offline mas viejas que --days."""
+        from .services.offline_mutation_service import OfflineMutationService
+
+        deleted = OfflineMutationService.prune(days)
+        click.echo(f"Claves de cola offline borradas: {deleted}")
+
+    @app.cli.command("tenant-export")
+    @click.argument("workshop_id", type=int)
+    @click.option(
+        "--output",
+        type=click.Path(dir_okay=False, writable=True),
+        default=None,
+        help="Archivo .tar de salida (por defecto taller_<id>_<fecha>.tar)",
+    )
+    def tenant_export(workshop_id, output):
+        """Exporta todos los datos de un taller a un snapshot (COPY, PostgreSQL)."""
+        from .services.tenant_snapshot_service import TenantSnapshotService
+
+        output = output or f"taller_{workshop_id}_{datetime.now(dt_timezone.utc):%Y%m%d%H%M}.tar"
+        started = time.monotonic()
+        try:
+            manifest = TenantSnapshotService.export_workshop(workshop_id, output)
+        except ValueError as exc:
+            raise click.ClickException(str(exc)) from exc
+        for table_name, table in manifest["tables"].items():
+            click.echo(f"  {table_name}: {table['rows']} fila(s)")
+        click.echo(f"Snapshot escrito en {output} en {time.monotonic() - started:.1f} s")
+
+    @app.cli.command("tenant-import")
+    @click.argument("archive", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--name", default=None, help="Nombre del taller importado")
+    @click.option(
+        "--owner-email",
+        default=None,
+        help="Usuario existente que queda asociado al taller importado",
+    )
+    def tenant_import(archive, name, owner_email):
+        """Importa un snapshot como taller nuevo, con ids nuevos."""
+        from .services.tenant_snapshot_service import TenantSnapshotService
+
+        started = time.monotonic()
+        try:
+            workshop_id, counts = TenantSnapshotService.import_archive(
+                archive, name=name, owner_email=owner_email
+            )
+        except ValueError as exc:
+            raise click.ClickException(str(exc)) from exc
+        for table_name, rows in counts.items():
+            click.echo(f"  {table_name}: {rows} fila(s)")
+        click.echo(
+            f"Taller {workshop_id} importado en {time.monotonic() - started:.1f} s"
+        )
+
+    @app.cli.command("tenant-purge")
+    @click.argument("workshop_id", type=int)
+    @click.option(
+        "--batch-size",
+        default=1000,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help="Filas por transaccion",
+    )
+    @click.confirmation_option(prompt="Se borran todos los datos del taller. ¿Continuar?")
+    def tenant_purge(workshop_id, batch_size):
+        """Borra un taller con todos sus datos, por tandas (anonimiza audit_logs)."""
+        from .models import Workshop
+        from .services.tenant_purge_service import TenantPurgeService
+
+        if db.session.get(Workshop, workshop_id) is None:
+            raise click.ClickException(f"No existe el taller {workshop_id}")
+
+        def progress(table_name, rows):
+            click.echo(f"  {table_name}: {rows} fila(s)")
+
+        started = time.monotonic()
+        TenantPurgeService.purge(workshop_id, batch_size=batch_size, progress=progress)
+        click.echo(f"Taller {workshop_id} borrado en {time.monotonic() - started:.1f} s")
+
+    @app.cli.command("compile-templates")
+    def compile_templates_command():
+        """Compila todos los templates al bytecode cache (JINJA_BYTECODE_CACHE_DIR)."""
+        from .warmup import warm_templates
+
+        cache_dir = app.config.get("JINJA_BYTECODE_CACHE_DIR")
+        if not cache_dir:
+            raise click.ClickException(
+                "Configura JINJA_BYTECODE_CACHE_DIR para compilar los templates"
+            )
+        compiled = warm_templates(app)
+        click.echo(f"{compiled} template(s) compilados en {cache_dir}")
+
+    @app.cli.command("build-assets")
+    def build_assets_command():
+        """Genera static/dist: bundles con hash, .gz/.br y manifest.json."""
+        manifest = build_assets(app.static_folder)
+        app.extensions["asset_manifest"] = manifest
+        click.echo(f"{len(manifest)} asset(s) generados en static/dist")
+
+    @app.cli.command("warmup")
+    def warmup_command():
+        """Precompila templates, consultas calientes y estilos del PDF."""
+        from .warmup import warm_up
+
+        summary = warm_up(app)
+        click.echo(
+            f"Warm-up: {summary['templates']} template(s), "
+            f"{summary['queries']} consulta(s), "
+            f"PDF {'listo' if summary['pdf'] else 'no disponible'} "
+            f"en {summary['elapsed_ms']} ms"
+        )
+
     @app.cli.command("send-test-email")
     @click.option("--to", prompt="Email destino de prueba")
     def send_test_email(to):
@@ -339,7 +546,11 @@ def create_app(config_class=Config):
 
         click.echo(f"Correo de prueba enviado a {to_value}")
 
+    from .services.offline_mutation_service import version_token
+
     app.jinja_env.filters["currency"] = format_currency
     app.jinja_env.filters["datetime_cordoba"] = format_datetime_cordoba
+    app.jinja_env.filters["filesize"] = format_filesize
+    app.jinja_env.filters["version_token"] = version_token
 
     return app
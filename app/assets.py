@@ -0,0 +1,222 @@
+"""Build de assets estaticos: bundles con hash de contenido y precompresion.
+
+``flask build-assets`` (se corre en el build de la imagen) escribe en
+``static/dist`` los bundles minificados, sus hermanos ``.gz``/``.br`` y un
+``manifest.json`` que mapea el path logico (``css/app.css``) al archivo con
+hash. Sin manifest (desarrollo) todo se sirve como antes desde los fuentes.
+"""
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+
+from flask import request, send_from_directory, url_for
+
+
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+CSS_ENTRY = "css/app.css"
+# Scripts que base.html carga en todas las paginas, en orden de ejecucion.
+JS_BUNDLES = {
+    "js/app.js": [
+        "js/pwa-register.js",
+        "js/table-search.js",
+        "js/pagination.js",
+        "js/app-tour.js",
+        "js/pull-to-refresh.js",
+        "js/detail-drawer.js",
+        "js/job-events.js",
+    ],
+}
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_CSS_IMPORT = re.compile(r"""@import\s+(?:url\()?\s*["']([^"']+)["']\s*\)?\s*;""")
+_CSS_URL = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+
+
+def _read(static_folder, path):
+    with open(os.path.join(static_folder, path), encoding="utf-8") as handle:
+        return handle.read()
+
+
+def _rewrite_css_urls(css, path):
+    base = posixpath.dirname(path)
+
+    def _absolute(match):
+        quote, target = match.groups()
+        if target.startswith(("data:", "http:", "https:", "/", "#")):
+            return match.group(0)
+        resolved = posixpath.normpath(posixpath.join(base, target))
+        return f"url({quote}/static/{resolved}{quote})"
+
+    return _CSS_URL.sub(_absolute, css)
+
+
+def bundle_css(static_folder, path=CSS_ENTRY, _seen=None):
+    """Resuelve los @import recursivamente en un unico CSS."""
+    seen = _seen if _seen is not None else set()
+    if path in seen:
+        return ""
+    seen.add(path)
+    css = _rewrite_css_urls(_read(static_folder, path), path)
+    base = posixpath.dirname(path)
+
+    def _inline(match):
+        target = posixpath.normpath(posixpath.join(base, match.group(1)))
+        return bundle_css(static_folder, target, seen)
+
+    return _CSS_IMPORT.sub(_inline, css)
+
+
+def minify_css(css):
+    css = _CSS_COMMENT.sub("", css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def _ends_in_template(line, inside):
+    """Indica si la linea termina dentro de un template literal (backticks).
+
+    Las comillas simples y dobles no cruzan lineas; los template literals si.
+    """
+    quote = "`" if inside else None
+    index = 0
+    while index < len(line):
+        char = line[index]
+        if quote:
+            if char == "\\":
+                index += 1
+            elif char == quote:
+                quote = None
+        elif char in "'\"`":
+            quote = char
+        elif line.startswith("//", index):
+            break
+        index += 1
+    return quote == "`"
+
+
+def minify_js(js):
+    """Minificacion conservadora: indentacion, lineas vacias y comentarios de linea.
+
+    No une lineas, asi que no depende de la insercion automatica de ``;``. Las
+    lineas dentro de un template literal de varias lineas quedan intactas.
+    """
+    lines = []
+    inside = False
+    for line in js.splitlines():
+        ends_inside = _ends_in_template(line, inside)
+        if inside:
+            lines.append(line if ends_inside else line.rstrip())
+        elif ends_inside:
+            lines.append(line.lstrip())
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith("//"):
+                lines.append(stripped)
+        inside = ends_inside
+    return "\n".join(lines) + "\n"
+
+
+def _write_asset(dist_path, logical_path, content):
+    data = content.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    stem, ext = posixpath.splitext(posixpath.basename(logical_path))
+    relative = f"{DIST_DIR}/{stem}.{digest}{ext}"
+    target = os.path.join(dist_path, f"{stem}.{digest}{ext}")
+    with open(target, "wb") as handle:
+        handle.write(data)
+    with open(target + ".gz", "wb") as handle:
+        handle.write(gzip.compress(data, compresslevel=9, mtime=0))
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+    if brotli is not None:
+        with open(target + ".br", "wb") as handle:
+            handle.write(brotli.compress(data, quality=11))
+    return relative
+
+
+def build_assets(static_folder):
+    """Regenera ``static/dist`` y devuelve el manifest escrito."""
+    dist_path = os.path.join(static_folder, DIST_DIR)
+    shutil.rmtree(dist_path, ignore_errors=True)
+    os.makedirs(dist_path)
+
+    manifest = {CSS_ENTRY: _write_asset(dist_path, CSS_ENTRY, minify_css(bundle_css(static_folder)))}
+    for bundle, members in JS_BUNDLES.items():
+        source = ";\n".join(minify_js(_read(static_folder, member)) for member in members)
+        manifest[bundle] = _write_asset(dist_path, bundle, source)
+    js_folder = os.path.join(static_folder, "js")
+    for name in sorted(os.listdir(js_folder)):
+        if name.endswith(".js"):
+            logical = f"js/{name}"
+            manifest[logical] = _write_asset(
+                dist_path, logical, minify_js(_read(static_folder, logical))
+            )
+
+    with open(os.path.join(dist_path, MANIFEST_NAME), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, DIST_DIR, MANIFEST_NAME), encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def manifest_version(manifest):
+    if not manifest:
+        return None
+    return hashlib.sha256(
+        json.dumps(manifest, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:12]
+
+
+def init_assets(app):
+    """Carga el manifest y sirve ``static/dist`` con negociacion de encoding."""
+    app.extensions["asset_manifest"] = load_manifest(app.static_folder)
+    static_view = app.view_functions["static"]
+
+    def static_file(filename):
+        if filename.startswith(f"{DIST_DIR}/"):
+            response = _send_precompressed(app, filename)
+            if response is not None:
+                return response
+        return static_view(filename=filename)
+
+    app.view_functions["static"] = static_file
+
+
+def _send_precompressed(app, filename):
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    for encoding, suffix in PRECOMPRESSED:
+        if not request.accept_encodings[encoding]:
+            continue
+        if not os.path.isfile(os.path.join(app.static_folder, filename + suffix)):
+            continue
+        response = send_from_directory(app.static_folder, filename + suffix, mimetype=mimetype)
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
+    return None
+
+
+def asset_urls(manifest, bundle, fallback_url):
+    """URLs a incluir para un bundle: el archivo con hash o sus fuentes."""
+    built = manifest.get(bundle)
+    if built:
+        return [url_for("static", filename=built)]
+    return [fallback_url(member) for member in JS_BUNDLES[bundle]]
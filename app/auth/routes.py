@@ -1,7 +1,6 @@
 from datetime import datetime, timedelta
 import logging
 import math
-import pyotp
 
 from flask import current_app, flash, redirect, render_template, request, session, url_for
 from flask_login import login_required, login_user, logout_user
@@ -281,6 +280,8 @@ def login_two_factor():
         return redirect(url_for("auth.login"))
     form = TwoFactorForm()
     if form.validate_on_submit():
+        import pyotp
+
         totp = pyotp.TOTP(user.two_factor_secret)
         if not totp.verify(form.code.data, valid_window=1):
             flash("Codigo incorrecto.", "error")
@@ -413,4 +414,8 @@ def logout():
     session.pop("pending_2fa_user_id", None)
     session.pop("pending_2fa_remember", None)
     session.pop("two_factor_pending_secret", None)
-    return redirect(url_for("auth.login"))
+    session.pop("offline_cache_key", None)
+    response = redirect(url_for("auth.login"))
+    # Borra el cache offline de trabajos en navegadores que lo soportan.
+    response.headers["Clear-Site-Data"] = '"cache"'
+    return response
@@ -0,0 +1,153 @@
+"""Compresion gzip/brotli de respuestas HTML, JSON y fragmentos.
+
+Se aplica en ``after_request`` a respuestas de texto de la app. Las que se
+sirven con ``send_file`` (PDFs, uploads, static) quedan afuera: ya vienen
+comprimidas o tienen su propia version precomprimida en ``static/dist``.
+Las respuestas en streaming se comprimen por chunk con flush, asi el cliente
+sigue recibiendo datos a medida que se generan.
+"""
+
+import threading
+import time
+import zlib
+
+from flask import request
+
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+}
+
+_lock = threading.Lock()
+_stats = {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0}
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def compression_stats():
+    """Contadores del proceso actual para /admin/runtime."""
+    with _lock:
+        stats = dict(_stats)
+    stats["cpu_ms"] = round(stats.pop("cpu_seconds") * 1000, 1)
+    stats["ratio"] = (
+        round(stats["bytes_out"] / stats["bytes_in"], 3) if stats["bytes_in"] else None
+    )
+    return stats
+
+
+def _record(bytes_in, bytes_out, cpu_seconds, responses=0):
+    with _lock:
+        _stats["responses"] += responses
+        _stats["bytes_in"] += bytes_in
+        _stats["bytes_out"] += bytes_out
+        _stats["cpu_seconds"] += cpu_seconds
+
+
+class _Compressor:
+    def __init__(self, encoding, config):
+        self.encoding = encoding
+        if encoding == "br":
+            self._impl = _brotli().Compressor(quality=config["COMPRESSION_BROTLI_QUALITY"])
+        else:
+            self._impl = zlib.compressobj(
+                config["COMPRESSION_LEVEL"], zlib.DEFLATED, zlib.MAX_WBITS | 16
+            )
+
+    def compress(self, data):
+        if self.encoding == "br":
+            return self._impl.process(data)
+        return self._impl.compress(data)
+
+    def flush(self):
+        if self.encoding == "br":
+            return self._impl.flush()
+        return self._impl.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == "br":
+            return self._impl.finish()
+        return self._impl.flush(zlib.Z_FINISH)
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if accepted["br"] and _brotli() is not None:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _is_compressible(response):
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.direct_passthrough or "Content-Encoding" in response.headers:
+        return False
+    return "no-transform" not in response.headers.get("Cache-Control", "")
+
+
+def _stream(chunks, compressor):
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        started = time.thread_time()
+        data = compressor.compress(chunk) + compressor.flush()
+        _record(len(chunk), len(data), time.thread_time() - started)
+        if data:
+            yield data
+    started = time.thread_time()
+    tail = compressor.finish()
+    _record(0, len(tail), time.thread_time() - started, responses=1)
+    if tail:
+        yield tail
+
+
+def init_compression(app):
+    """Registra el after_request; conviene llamarlo antes que otros hooks.
+
+    Flask ejecuta los after_request en orden inverso al registro, asi la
+    compresion ve la respuesta ya terminada.
+    """
+
+    @app.after_request
+    def compress_response(response):
+        config = app.config
+        if not config.get("COMPRESSION_ENABLED", True) or not _is_compressible(response):
+            return response
+        response.vary.add("Accept-Encoding")
+        encoding = _choose_encoding()
+        if encoding is None:
+            return response
+
+        compressor = _Compressor(encoding, config)
+        if response.is_streamed:
+            response.response = _stream(response.response, compressor)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < config["COMPRESSION_MIN_SIZE"]:
+                return response
+            started = time.thread_time()
+            compressed = compressor.compress(data) + compressor.finish()
+            _record(len(data), len(compressed), time.thread_time() - started, responses=1)
+            response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        return response
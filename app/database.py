@@ -0,0 +1,104 @@
+import time
+
+from flask import current_app, g, request, session
+from sqlalchemy import event
+
+from .db_session import PRIMARY_PINNED_KEY, REPLICA_BIND_KEY
+from .extensions import db
+
+
+PRIMARY_UNTIL_SESSION_KEY = "db_primary_until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def read_only(view):
+    """Marca una vista como de solo lectura: puede leer desde la replica."""
+    view.db_read_only = True
+    return view
+
+
+def init_replica_routing(app):
+    """Decide por request si las lecturas van a la replica.
+
+    Tras cualquier request que escribe (POST, etc.) se guarda en la sesion
+    una marca con TTL; mientras siga vigente las vistas de solo lectura
+    leen del primario, asi el redirect posterior ve sus propios cambios.
+    """
+
+    @app.before_request
+    def route_reads_to_replica():
+        g.db_use_replica = False
+        db.session.info.pop(PRIMARY_PINNED_KEY, None)
+        if REPLICA_BIND_KEY not in current_app.config.get("SQLALCHEMY_BINDS", {}):
+            return
+        if request.method not in SAFE_METHODS:
+            return
+        view = current_app.view_functions.get(request.endpoint)
+        if not getattr(view, "db_read_only", False):
+            return
+        primary_until = session.get(PRIMARY_UNTIL_SESSION_KEY)
+        if primary_until:
+            if primary_until > time.time():
+                return
+            session.pop(PRIMARY_UNTIL_SESSION_KEY, None)
+        g.db_use_replica = True
+
+    @app.after_request
+    def stick_to_primary_after_write(response):
+        if (
+            request.method not in SAFE_METHODS
+            and REPLICA_BIND_KEY in current_app.config.get("SQLALCHEMY_BINDS", {})
+        ):
+            session[PRIMARY_UNTIL_SESSION_KEY] = (
+                time.time() + current_app.config["DB_REPLICA_STICKY_SECONDS"]
+            )
+        return response
+
+
+@event.listens_for(db.session, "after_flush")
+def _pin_primary_after_write(db_session, flush_context):
+    db_session.info[PRIMARY_PINNED_KEY] = True
+
+
+def configure_engines(app):
+    """Ajustes por conexion que no se pueden expresar en SQLALCHEMY_ENGINE_OPTIONS."""
+    timeout_ms = app.config.get("DB_STATEMENT_TIMEOUT_MS") or 0
+    if not app.config.get("DB_PGBOUNCER") or timeout_ms <= 0:
+        return
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        if engine.dialect.name != "postgresql":
+            continue
+        # En transaction pooling un SET de sesion quedaria en otra conexion
+        # del servidor; SET LOCAL vive solo dentro de la transaccion actual.
+        event.listen(engine, "begin", _set_local_statement_timeout(timeout_ms))
+
+
+def _set_local_statement_timeout(timeout_ms):
+    def _on_begin(connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+    return _on_begin
+
+
+def dispose_engines(app, close=False):
+    """Descarta las conexiones del pool de cada engine.
+
+    Tras un fork se usa close=False: no cierra sockets que el master (u otros
+    workers) siguen usando y el worker arranca con un pool vacio. El master
+    cierra las suyas (close=True) antes de forkear.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=close)
+
+
+def pool_status(engine):
+    pool = engine.pool
+    status = {"class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name] = method()
+    return status
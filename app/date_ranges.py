@@ -0,0 +1,95 @@
+"""Filtros de mes compartidos por los dashboards y reportes.
+
+Los meses se interpretan en hora de Cordoba y se traducen a rangos
+semiabiertos ``[inicio, fin)`` sobre columnas guardadas en UTC naive, de modo
+que la condicion compara la columna desnuda y puede resolverse con un range
+scan sobre el indice de ``created_at``.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import DateTime, Float
+
+from .timezone import CORDOBA_TZ, cordoba_month_bounds_utc, now_cordoba_naive
+
+
+def current_month_start() -> date:
+    return now_cordoba_naive().date().replace(day=1)
+
+
+def parse_month_start(raw_month: str | None, default: date | None = None) -> date | None:
+    """Convierte 'YYYY-MM' en el primer dia del mes; ``default`` si es invalido."""
+    value = (raw_month or "").strip()
+    if not value:
+        return default
+    try:
+        parsed = datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        return default
+    return parsed.replace(day=1)
+
+
+def next_month(month_start: date) -> date:
+    if month_start.month == 12:
+        return date(month_start.year + 1, 1, 1)
+    return date(month_start.year, month_start.month + 1, 1)
+
+
+def shift_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + (month_start.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range_filters(column, month_start: date | None) -> list:
+    """Condiciones ``column >= inicio AND column < fin`` para el mes dado."""
+    if month_start is None:
+        return []
+    start_utc, end_utc = cordoba_month_bounds_utc(month_start)
+    return [column >= start_utc, column < end_utc]
+
+
+class month_bucket(FunctionElement):
+    """Primer instante del mes (hora de Cordoba) de una columna UTC naive."""
+
+    type = DateTime()
+    inherit_cache = True
+    name = "month_bucket"
+
+
+@compiles(month_bucket)
+def _compile_month_bucket_default(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return (
+        "date_trunc('month', "
+        f"timezone('{CORDOBA_TZ.key}', timezone('UTC', {column})))"
+    )
+
+
+@compiles(month_bucket, "sqlite")
+def _compile_month_bucket_sqlite(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    offset = datetime.now(CORDOBA_TZ).utcoffset()
+    offset_hours = int(offset.total_seconds() // 3600) if offset else 0
+    return f"strftime('%Y-%m-01 00:00:00', {column}, '{offset_hours:+d} hours')"
+
+
+class elapsed_seconds(FunctionElement):
+    """Segundos entre dos columnas ``DateTime``: ``elapsed_seconds(inicio, fin)``."""
+
+    type = Float()
+    inherit_cache = True
+    name = "elapsed_seconds"
+
+
+@compiles(elapsed_seconds)
+def _compile_elapsed_seconds_default(element, compiler, **kw):
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"EXTRACT(EPOCH FROM ({end} - {start}))"
+
+
+@compiles(elapsed_seconds, "sqlite")
+def _compile_elapsed_seconds_sqlite(element, compiler, **kw):
+    start, end = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"((julianday({end}) - julianday({start})) * 86400.0)"
@@ -0,0 +1,27 @@
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+
+
+REPLICA_BIND_KEY = "replica"
+PRIMARY_PINNED_KEY = "db_primary_pinned"
+
+
+class RoutingSession(Session):
+    """Sesion que envia las lecturas de vistas de solo lectura a la replica.
+
+    La replica se usa solo si la request la habilito (g.db_use_replica), si
+    existe el bind "replica" y si la sesion todavia no escribio nada; los
+    flush y todo lo posterior a una escritura van siempre al primario.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._replica_allowed():
+            replica = self._db.engines.get(REPLICA_BIND_KEY)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_allowed(self):
+        if self._flushing or self.info.get(PRIMARY_PINNED_KEY):
+            return False
+        return has_app_context() and bool(g.get("db_use_replica"))
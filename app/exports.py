@@ -0,0 +1,194 @@
+"""Exportaciones CSV/XLSX en streaming.
+
+Las filas llegan de una consulta con ``yield_per`` (en PostgreSQL es un
+cursor del lado del servidor) y se escriben por tandas: el worker nunca tiene
+en memoria mas que una tanda, sin importar cuantas filas tenga el taller.
+
+El XLSX se arma a mano (es un ZIP con XML) escribiendo la hoja dentro del ZIP
+a medida que se generan las filas, asi no hace falta ninguna dependencia ni
+un archivo temporal.
+"""
+
+import csv
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from xml.sax.saxutils import escape
+
+from flask import current_app, stream_with_context
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import String
+
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+YIELD_PER = 1000
+CHUNK_BYTES = 64 * 1024
+
+# Un texto que empieza asi Excel lo interpreta como formula (CSV injection).
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# Caracteres de control que XML 1.0 no admite.
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class joined_names(FunctionElement):
+    """Concatena los valores del grupo con ``", "`` (string_agg / group_concat)."""
+
+    type = String()
+    inherit_cache = True
+
+
+@compiles(joined_names)
+def _joined_names_default(element, compiler, **kw):
+    return "string_agg(%s, ', ')" % compiler.process(element.clauses, **kw)
+
+
+@compiles(joined_names, "sqlite")
+def _joined_names_sqlite(element, compiler, **kw):
+    return "group_concat(%s, ', ')" % compiler.process(element.clauses, **kw)
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%d/%m/%Y %H:%M")
+    if isinstance(value, date):
+        return value.strftime("%d/%m/%Y")
+    return str(value)
+
+
+def _csv_cell(value):
+    """Como ``_text``, pero con ``'`` delante de los textos que parecen formulas.
+
+    Solo se tocan los textos: numeros y fechas salen tal cual.
+    """
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return _text(value)
+
+
+def csv_chunks(header, rows):
+    # BOM para que Excel abra el archivo como UTF-8.
+    buffer = StringIO()
+    buffer.write("\ufeff")
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([_csv_cell(value) for value in row])
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+class _Sink:
+    """Destino sin ``seek`` para ``ZipFile``: acumula bytes hasta el proximo yield."""
+
+    def __init__(self):
+        self._parts = []
+        self.size = 0
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        self.size = 0
+        return data
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+def _xlsx_cell(value):
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f"<c><v>{value}</v></c>"
+    text = _XML_INVALID.sub("", _text(value))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def _xlsx_row(number, values):
+    cells = "".join(_xlsx_cell(value) for value in values)
+    return f'<row r="{number}">{cells}</row>'.encode("utf-8")
+
+
+def xlsx_chunks(sheet_name, header, rows):
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _WORKBOOK.format(name=escape(sheet_name[:31])))
+        archive.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(_SHEET_HEAD.encode("utf-8"))
+            sheet.write(_xlsx_row(1, header))
+            for number, row in enumerate(rows, start=2):
+                sheet.write(_xlsx_row(number, row))
+                if sink.size >= CHUNK_BYTES:
+                    yield sink.drain()
+            sheet.write(_SHEET_TAIL.encode("utf-8"))
+    yield sink.drain()
+
+
+def export_response(export_format, filename, sheet_name, header, rows):
+    """Respuesta en streaming; ``rows`` es un iterable perezoso de tuplas."""
+    if export_format == "xlsx":
+        chunks = xlsx_chunks(sheet_name, header, rows)
+    else:
+        chunks = csv_chunks(header, rows)
+    response = current_app.response_class(
+        stream_with_context(chunks), mimetype=EXPORT_FORMATS[export_format]
+    )
+    response.headers["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{export_format}"'
+    )
+    response.headers["Cache-Control"] = "no-store"
+    return response
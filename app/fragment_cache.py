@@ -0,0 +1,103 @@
+"""Cache de fragmentos renderizados para las filas de los listados.
+
+Uso en templates::
+
+    {% cache "job-row", job.id, job.cache_version %} ... {% endcache %}
+
+Las partes de la clave se combinan con el taller activo, asi dos tenants
+nunca comparten fragmentos. El token CSRF del request se reemplaza por un
+marcador antes de guardar y se vuelve a insertar al servir, para que un
+fragmento renderizado en una sesion no filtre su token a otra.
+"""
+
+import threading
+from collections import OrderedDict
+
+from flask import current_app, g, has_request_context
+from flask_wtf.csrf import generate_csrf
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+CSRF_MARKER = "\x00csrf-token\x00"
+
+
+class FragmentCache:
+    """LRU en memoria del proceso; cada worker de gunicorn tiene la suya."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+class FragmentCacheExtension(Extension):
+    tags = {"cache"}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if("comma"):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        call = self.call_method("_render_cached", [nodes.Tuple(parts, "load")])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, parts, caller):
+        cache = current_app.extensions.get("fragment_cache")
+        workshop = g.get("active_workshop") if has_request_context() else None
+        if cache is None or workshop is None:
+            return caller()
+
+        key = (workshop.id, parts)
+        csrf_token = _current_csrf_token()
+        cached = cache.get(key)
+        if cached is None:
+            rendered = str(caller())
+            cached = rendered.replace(csrf_token, CSRF_MARKER) if csrf_token else rendered
+            cache.set(key, cached)
+        if csrf_token:
+            return Markup(cached.replace(CSRF_MARKER, csrf_token))
+        return Markup(cached)
+
+
+def _current_csrf_token():
+    if not current_app.config.get("WTF_CSRF_ENABLED", True):
+        return None
+    return generate_csrf()
+
+
+def init_fragment_cache(app):
+    app.jinja_env.add_extension(FragmentCacheExtension)
+    size = app.config.get("FRAGMENT_CACHE_SIZE") or 0
+    if size > 0:
+        app.extensions["fragment_cache"] = FragmentCache(size)
@@ -0,0 +1,84 @@
+"""GET condicional (ETag debil / 304) para listados y detalles del taller.
+
+El ETag se arma antes de ejecutar la vista con datos que ya estan en memoria:
+el ``data_version`` del taller activo, la sucursal, el usuario, la URL, la
+fecha del dia y el token CSRF de la sesion. Si coincide con ``If-None-Match`` se responde 304
+sin correr la consulta principal ni renderizar.
+"""
+
+import hashlib
+import time
+from datetime import date
+from functools import wraps
+
+from flask import current_app, g, make_response, request, session
+from flask_login import current_user
+
+from .services.version_service import VersionService
+from .timezone import now_cordoba_naive
+
+
+CONDITIONAL_METHODS = {"GET", "HEAD"}
+
+
+def conditional_get(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = view_etag() if request.method in CONDITIONAL_METHODS else None
+        if etag is None:
+            return view(*args, **kwargs)
+
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "private, no-cache"
+        response.vary.add("Cookie")
+        return response
+
+    return wrapper
+
+
+def view_etag():
+    """ETag del request actual, o None si la respuesta no se puede reutilizar."""
+    workshop = g.get("active_workshop")
+    if workshop is None or not current_user.is_authenticated:
+        return None
+    # Un flash pendiente se consume al renderizar: esa respuesta es unica.
+    if session.get("_flashes"):
+        return None
+
+    active_store = g.get("active_store")
+    parts = (
+        current_app.config.get("ASSET_VERSION"),
+        request.full_path,
+        current_user.id,
+        current_user.role,
+        current_user.tour_completed_version,
+        current_user.tour_dismissed_version,
+        workshop.id,
+        VersionService.current(workshop),
+        active_store.id if active_store else None,
+        *_day_parts(),
+        *_csrf_parts(),
+    )
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _day_parts():
+    # Vencidos, "hoy" de la agenda y los badges dependen de la fecha: la copia
+    # cacheada no sobrevive a la medianoche (del servidor ni de Cordoba).
+    return (date.today(), now_cordoba_naive().date())
+
+
+def _csrf_parts():
+    # El HTML embebe tokens CSRF firmados con fecha: la copia cacheada se
+    # renueva cada media vida del token y cuando cambia la sesion.
+    if not current_app.config.get("WTF_CSRF_ENABLED", True):
+        return ()
+    time_limit = current_app.config.get("WTF_CSRF_TIME_LIMIT", 3600)
+    bucket = int(time.time() // (time_limit / 2)) if time_limit else 0
+    return (session.get("csrf_token"), bucket)
@@ -0,0 +1,142 @@
+"""Eventos de trabajos en vivo para el listado y la agenda (SSE / long-poll).
+
+Cada worker tiene un ``JobEventBroker`` en memoria con los ultimos eventos.
+En PostgreSQL los commits publican con ``pg_notify`` y un hilo por worker
+escucha el canal (LISTEN) y alimenta su broker, asi todos los workers ven
+todos los eventos. Sin PostgreSQL (tests, desarrollo con SQLite) el evento
+se publica directo en el broker del proceso despues del commit.
+
+Las esperas bloqueantes (streams SSE y long-poll) tienen un cupo por worker
+(``JOB_EVENTS_MAX_WAITERS``): con gthread cada espera ocupa un hilo, asi que
+sin cupo la respuesta vuelve enseguida y el cliente reintenta mas tarde. La
+app principal arranca sin cupo (nunca bloquea un hilo) y ``/jobs/events`` se
+rutea a la instancia ``events`` (``gunicorn.events.conf.py``), que si espera.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+from sqlalchemy.engine import make_url
+
+
+NOTIFY_CHANNEL = "job_events"
+# Los ids son timestamps del worker que publica: al reconectar se reenvia
+# una ventana hacia atras y el cliente descarta los ids ya vistos.
+REPLAY_WINDOW_NS = 2_000_000_000
+
+logger = logging.getLogger("job_events")
+
+
+class JobEventBroker:
+    def __init__(self, maxlen=500, max_waiters=0):
+        self._events = deque(maxlen=maxlen)
+        self._seq = 0
+        self._condition = threading.Condition()
+        self._waiters = threading.BoundedSemaphore(max_waiters) if max_waiters > 0 else None
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def publish(self, event):
+        with self._condition:
+            self._seq += 1
+            self._events.append((self._seq, event))
+            self._condition.notify_all()
+
+    def cursor(self):
+        with self._condition:
+            return self._seq
+
+    def since(self, store_id, last_id, window=True):
+        """Eventos de la sucursal posteriores a ``last_id``.
+
+        Con ``window`` se incluyen tambien los ultimos segundos anteriores,
+        para no perder eventos de otro worker que llegaron fuera de orden.
+        """
+        threshold = (last_id or 0) - (REPLAY_WINDOW_NS if window else 0)
+        with self._condition:
+            events = [
+                event
+                for _, event in self._events
+                if event["store_id"] == store_id and event["id"] > threshold
+            ]
+            return events, self._seq
+
+    def wait(self, store_id, cursor, timeout):
+        """Bloquea hasta que llegue un evento de la sucursal o venza ``timeout``."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                events = [
+                    event
+                    for seq, event in self._events
+                    if seq > cursor and event["store_id"] == store_id
+                ]
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events, self._seq
+                self._condition.wait(remaining)
+
+    def acquire_waiter(self):
+        return self._waiters is not None and self._waiters.acquire(blocking=False)
+
+    def release_waiter(self):
+        self._waiters.release()
+
+    def ensure_listener(self, app):
+        """Arranca (una vez por proceso) el hilo LISTEN de PostgreSQL."""
+        url = app.config.get("JOB_EVENTS_DATABASE_URL") or app.config.get(
+            "SQLALCHEMY_DATABASE_URI", ""
+        )
+        if not url or make_url(url).get_backend_name() != "postgresql":
+            return
+        conninfo = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        with self._listener_lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen,
+                args=(conninfo,),
+                name="job-events-listener",
+                daemon=True,
+            )
+            self._listener.start()
+
+    def _listen(self, conninfo):
+        import psycopg
+
+        backoff = 1
+        while True:
+            try:
+                with psycopg.connect(conninfo, autocommit=True) as connection:
+                    connection.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    backoff = 1
+                    for notify in connection.notifies():
+                        try:
+                            self.publish(json.loads(notify.payload))
+                        except (TypeError, ValueError, KeyError):
+                            logger.warning("Evento de trabajo invalido: %r", notify.payload)
+            except Exception:
+                logger.exception("LISTEN %s interrumpido; reintento en %ss", NOTIFY_CHANNEL, backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+
+def init_job_events(app):
+    app.extensions["job_events"] = JobEventBroker(
+        maxlen=app.config["JOB_EVENTS_BUFFER"],
+        max_waiters=app.config["JOB_EVENTS_MAX_WAITERS"],
+    )
+
+
+def public_event(event):
+    """Evento para el navegador: el id (nanosegundos) supera el entero seguro
+    de JavaScript, asi que viaja como texto."""
+    return {**event, "id": str(event["id"])}
+
+
+def format_sse(event):
+    data = json.dumps(public_event(event), separators=(",", ":"))
+    return f"id: {event['id']}\nevent: job\ndata: {data}\n\n"
@@ -1,3 +1,4 @@
+from flask import current_app
 from flask_wtf import FlaskForm
 from flask_wtf.file import FileAllowed, FileField, FileRequired
 from decimal import Decimal, InvalidOperation
@@ -200,18 +201,50 @@ class JobForm(FlaskForm):
             raise ValidationError("Selecciona al menos un service")
 
 
+class JobNotesForm(FlaskForm):
+    notes = TextAreaField("Notas", validators=[Optional(), Length(max=1000)])
+
+
+JOB_STATUS_CHOICES = [
+    ("open", "Abierto"),
+    ("in_progress", "En progreso"),
+    ("ready", "Listo"),
+    ("closed", "Cerrado"),
+    ("cancelled", "Cancelado"),
+]
+
+
 class JobStatusForm(FlaskForm):
     status = SelectField(
         "Estado",
+        choices=JOB_STATUS_CHOICES,
+        validators=[DataRequired()],
+    )
+
+
+class JobBulkForm(FlaskForm):
+    action = SelectField(
+        "Accion",
         choices=[
-            ("open", "Abierto"),
-            ("in_progress", "En progreso"),
-            ("ready", "Listo"),
-            ("closed", "Cerrado"),
-            ("cancelled", "Cancelado"),
+            ("status", "Cambiar estado"),
+            ("pdf", "Descargar PDFs"),
+            ("delete", "Eliminar"),
         ],
         validators=[DataRequired()],
     )
+    status = SelectField("Estado", choices=JOB_STATUS_CHOICES, validators=[Optional()])
+    job_ids = SelectMultipleField("Trabajos", coerce=int, validate_choice=False)
+
+    def validate_status(self, field):
+        if self.action.data == "status" and not field.data:
+            raise ValidationError("Elige un estado")
+
+    def validate_job_ids(self, field):
+        if not field.data:
+            raise ValidationError("Selecciona al menos un trabajo")
+        limit = current_app.config["JOBS_BULK_MAX"]
+        if len(field.data) > limit:
+            raise ValidationError(f"Puedes seleccionar hasta {limit} trabajos")
 
 
 class TwoFactorSetupForm(FlaskForm):
@@ -10,7 +10,6 @@ from decimal import Decimal, InvalidOperation
 from flask import current_app, flash, g, redirect, url_for, session
 from flask_login import current_user
 from sqlalchemy.orm import joinedload
-from PIL import Image
 from io import BytesIO
 
 from ..models import Store, Client, Bicycle, BicycleBrand, ServiceType, Job
@@ -118,6 +117,8 @@ def validate_upload(file_storage):
         if "<svg" not in text or re.search(r"<script|onload=|onerror=", text):
             return None, "SVG invalido."
     else:
+        from PIL import Image
+
         try:
             image = Image.open(BytesIO(data))
             image.verify()
@@ -168,6 +169,18 @@ def delete_upload(rel_path):
         file_path.unlink()
 
 
+def workshop_storage_bytes(workshop_id):
+    """Bytes ocupados por los archivos subidos de un taller."""
+    upload_root = Path(current_app.config["UPLOAD_FOLDER"]) / str(workshop_id)
+    if not upload_root.is_dir():
+        return 0
+    total = 0
+    for entry in os.scandir(upload_root):
+        if entry.is_file(follow_symlinks=False):
+            total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
 def get_workshop_or_redirect():
     workshop = g.active_workshop
     if workshop is None:
@@ -229,6 +242,47 @@ def paginate_query(query, page, per_page=10):
     }
 
 
+def parse_cursor(raw):
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def keyset_paginate(query, key_column, *, before=None, after=None, per_page=25):
+    """Pagina por clave (id) sin OFFSET ni COUNT sobre la tabla completa.
+
+    `before` trae la pagina siguiente (ids menores) y `after` la anterior.
+    """
+    if after is not None:
+        rows = (
+            query.filter(key_column > after)
+            .order_by(key_column.asc())
+            .limit(per_page + 1)
+            .all()
+        )
+        has_prev = len(rows) > per_page
+        items = list(reversed(rows[:per_page]))
+        has_next = True
+    else:
+        if before is not None:
+            query = query.filter(key_column < before)
+        rows = query.order_by(key_column.desc()).limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        items = rows[:per_page]
+        has_prev = before is not None
+    key_name = key_column.key
+    return {
+        "items": items,
+        "per_page": per_page,
+        "has_prev": has_prev and bool(items),
+        "has_next": has_next and bool(items),
+        "prev_cursor": getattr(items[0], key_name) if items else None,
+        "next_cursor": getattr(items[-1], key_name) if items else None,
+    }
+
+
 def generate_temp_password(length=12):
     alphabet = string.ascii_letters + string.digits
     while True:
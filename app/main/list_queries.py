@@ -0,0 +1,371 @@
+"""Consultas proyectadas para los listados de trabajos, bicicletas y clientes.
+
+Los listados solo muestran unas pocas columnas por fila, asi que en lugar de
+hidratar entidades completas (con sus relaciones lazy y columnas grandes)
+seleccionamos las columnas necesarias y las volcamos en objetos livianos con
+``__slots__``. Los nombres de atributos replican los de los modelos para que
+los templates sigan leyendo ``job.bicycle.client.full_name`` y similares.
+
+``cache_version`` resume todo lo que muestra la fila (incluido el drawer) y
+es la clave del fragment cache de los templates: cambia si cambia la entidad
+o algo relacionado que se renderiza junto a ella.
+"""
+
+from datetime import date
+
+from sqlalchemy import func, or_
+
+from ..extensions import db
+from ..models import Bicycle, BicycleBrand, Client, Job, JobItem, ServiceType
+
+
+JOB_LIST_STATUSES = (
+    "all",
+    "open",
+    "in_progress",
+    "ready",
+    "closed",
+    "cancelled",
+    "overdue",
+)
+
+
+class BrandRow:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class ClientRefRow:
+    __slots__ = ("id", "full_name", "updated_at")
+
+    def __init__(self, id, full_name, updated_at=None):
+        self.id = id
+        self.full_name = full_name
+        self.updated_at = updated_at
+
+
+class BicycleRefRow:
+    __slots__ = ("id", "model", "brand_rel", "client", "updated_at")
+
+    def __init__(self, id, model, brand_rel, client, updated_at=None):
+        self.id = id
+        self.model = model
+        self.brand_rel = brand_rel
+        self.client = client
+        self.updated_at = updated_at
+
+
+class ServiceTypeRow:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class JobItemRow:
+    __slots__ = ("service_type",)
+
+    def __init__(self, service_type):
+        self.service_type = service_type
+
+
+class JobRow:
+    __slots__ = (
+        "id",
+        "code",
+        "status",
+        "estimated_delivery_at",
+        "created_at",
+        "updated_at",
+        "bicycle",
+        "items",
+    )
+
+    def __init__(
+        self,
+        id,
+        code,
+        status,
+        estimated_delivery_at,
+        created_at,
+        bicycle,
+        updated_at=None,
+    ):
+        self.id = id
+        self.code = code
+        self.status = status
+        self.estimated_delivery_at = estimated_delivery_at
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.bicycle = bicycle
+        self.items = []
+
+    @property
+    def cache_version(self):
+        return (
+            self.updated_at,
+            self.bicycle.updated_at,
+            self.bicycle.client.updated_at,
+            self.bicycle.brand_rel.name if self.bicycle.brand_rel else None,
+            tuple(item.service_type.name for item in self.items),
+        )
+
+
+class BicycleRow:
+    __slots__ = ("id", "model", "description", "brand_rel", "client", "updated_at")
+
+    def __init__(self, id, model, description, brand_rel, client, updated_at=None):
+        self.id = id
+        self.model = model
+        self.description = description
+        self.brand_rel = brand_rel
+        self.client = client
+        self.updated_at = updated_at
+
+    @property
+    def cache_version(self):
+        return (
+            self.updated_at,
+            self.client.updated_at,
+            self.brand_rel.name if self.brand_rel else None,
+        )
+
+
+class ClientRow:
+    __slots__ = (
+        "id",
+        "client_code",
+        "full_name",
+        "email",
+        "phone",
+        "bicycle_count",
+        "updated_at",
+    )
+
+    def __init__(
+        self, id, client_code, full_name, email, phone, bicycle_count, updated_at=None
+    ):
+        self.id = id
+        self.client_code = client_code
+        self.full_name = full_name
+        self.email = email
+        self.phone = phone
+        self.bicycle_count = bicycle_count
+        self.updated_at = updated_at
+
+    @property
+    def cache_version(self):
+        return (self.updated_at, self.bicycle_count)
+
+
+def jobs_list_query(workshop_id, store_id):
+    """Trabajos de la sucursal con bicicleta, cliente y marca ya unidos."""
+    return (
+        db.session.query(
+            Job.id,
+            Job.code,
+            Job.status,
+            Job.estimated_delivery_at,
+            Job.created_at,
+            Job.updated_at,
+            Bicycle.id,
+            Bicycle.model,
+            Bicycle.updated_at,
+            Client.id,
+            Client.full_name,
+            Client.updated_at,
+            BicycleBrand.name,
+        )
+        .select_from(Job)
+        .join(Bicycle, Job.bicycle_id == Bicycle.id)
+        .join(Client, Bicycle.client_id == Client.id)
+        .outerjoin(BicycleBrand, Bicycle.brand_id == BicycleBrand.id)
+        .filter(Job.workshop_id == workshop_id, Job.store_id == store_id)
+    )
+
+
+def filter_jobs(query, status, search_query):
+    """Filtros del listado de trabajos (estado/atrasados y busqueda).
+
+    Sirven para cualquier consulta que ya una bicicleta, cliente y marca,
+    como ``jobs_list_query`` o la exportacion.
+    """
+    if status == "overdue":
+        query = query.filter(
+            Job.active_status_clause(),
+            Job.estimated_delivery_at < date.today(),
+        )
+    elif status != "all":
+        query = query.filter(Job.status == status)
+
+    if search_query:
+        search_term = f"%{search_query.lower()}%"
+        service_match = (
+            db.session.query(JobItem.id)
+            .join(ServiceType, JobItem.service_type_id == ServiceType.id)
+            .filter(
+                JobItem.job_id == Job.id,
+                func.lower(func.coalesce(ServiceType.name, "")).like(search_term),
+            )
+            .exists()
+        )
+        query = query.filter(
+            or_(
+                func.lower(func.coalesce(Job.code, "")).like(search_term),
+                func.lower(func.coalesce(Client.full_name, "")).like(search_term),
+                func.lower(func.coalesce(BicycleBrand.name, "")).like(search_term),
+                func.lower(func.coalesce(Bicycle.model, "")).like(search_term),
+                service_match,
+            )
+        )
+    return query
+
+
+def job_rows(rows):
+    """Convierte filas de ``jobs_list_query`` y carga sus services en una consulta."""
+    jobs = []
+    for (
+        job_id,
+        code,
+        status,
+        estimated_delivery_at,
+        created_at,
+        updated_at,
+        bicycle_id,
+        model,
+        bicycle_updated_at,
+        client_id,
+        client_name,
+        client_updated_at,
+        brand_name,
+    ) in rows:
+        bicycle = BicycleRefRow(
+            bicycle_id,
+            model,
+            BrandRow(brand_name) if brand_name is not None else None,
+            ClientRefRow(client_id, client_name, client_updated_at),
+            bicycle_updated_at,
+        )
+        jobs.append(
+            JobRow(
+                job_id,
+                code,
+                status,
+                estimated_delivery_at,
+                created_at,
+                bicycle,
+                updated_at,
+            )
+        )
+
+    if jobs:
+        by_id = {job.id: job for job in jobs}
+        item_rows = (
+            db.session.query(JobItem.job_id, ServiceType.name)
+            .join(ServiceType, JobItem.service_type_id == ServiceType.id)
+            .filter(JobItem.job_id.in_(by_id.keys()))
+            .order_by(JobItem.job_id.asc(), JobItem.id.asc())
+            .all()
+        )
+        for job_id, service_name in item_rows:
+            by_id[job_id].items.append(JobItemRow(ServiceTypeRow(service_name)))
+    return jobs
+
+
+def bicycles_list_query(workshop_id):
+    """Bicicletas del taller con cliente y marca ya unidos."""
+    return (
+        db.session.query(
+            Bicycle.id,
+            Bicycle.model,
+            Bicycle.description,
+            Bicycle.updated_at,
+            Client.id,
+            Client.full_name,
+            Client.updated_at,
+            BicycleBrand.name,
+        )
+        .select_from(Bicycle)
+        .join(Client, Bicycle.client_id == Client.id)
+        .outerjoin(BicycleBrand, Bicycle.brand_id == BicycleBrand.id)
+        .filter(Bicycle.workshop_id == workshop_id)
+    )
+
+
+def filter_bicycles(query, brand, search_query):
+    if brand.lower() != "all":
+        query = query.filter(func.lower(func.coalesce(BicycleBrand.name, "")) == brand.lower())
+
+    if search_query:
+        search_term = f"%{search_query.lower()}%"
+        query = query.filter(
+            or_(
+                func.lower(func.coalesce(BicycleBrand.name, "")).like(search_term),
+                func.lower(func.coalesce(Bicycle.model, "")).like(search_term),
+                func.lower(func.coalesce(Bicycle.description, "")).like(search_term),
+                func.lower(func.coalesce(Client.full_name, "")).like(search_term),
+            )
+        )
+    return query
+
+
+def bicycle_rows(rows):
+    return [
+        BicycleRow(
+            bicycle_id,
+            model,
+            description,
+            BrandRow(brand_name) if brand_name is not None else None,
+            ClientRefRow(client_id, client_name, client_updated_at),
+            updated_at,
+        )
+        for (
+            bicycle_id,
+            model,
+            description,
+            updated_at,
+            client_id,
+            client_name,
+            client_updated_at,
+            brand_name,
+        ) in rows
+    ]
+
+
+def clients_list_query(workshop_id):
+    """Clientes del taller con la cantidad de bicicletas como subconsulta."""
+    bicycle_count = (
+        db.session.query(func.count(Bicycle.id))
+        .filter(Bicycle.client_id == Client.id)
+        .correlate(Client)
+        .scalar_subquery()
+    )
+    return db.session.query(
+        Client.id,
+        Client.client_code,
+        Client.full_name,
+        Client.email,
+        Client.phone,
+        bicycle_count,
+        Client.updated_at,
+    ).filter(Client.workshop_id == workshop_id)
+
+
+def filter_clients(query, search_query):
+    if search_query:
+        search_term = f"%{search_query.lower()}%"
+        query = query.filter(
+            or_(
+                func.lower(Client.client_code).like(search_term),
+                func.lower(Client.full_name).like(search_term),
+                func.lower(func.coalesce(Client.email, "")).like(search_term),
+                func.lower(func.coalesce(Client.phone, "")).like(search_term),
+            )
+        )
+    return query
+
+
+def client_rows(rows):
+    return [ClientRow(*row) for row in rows]
@@ -2,6 +2,7 @@
 from . import (
     dashboard,
     jobs,
+    job_events,
     clients,
     bicycles,
     inventory,
@@ -11,4 +12,6 @@ from . import (
     settings,
     admin,
     tour,
+    reports,
+    exports,
 )
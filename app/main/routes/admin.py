@@ -1,33 +1,30 @@
-from datetime import date, datetime, timezone
+import os
+from datetime import datetime, timezone
 from decimal import Decimal
 
 from flask import render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
-from sqlalchemy import func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload, selectinload
 from app.main import main_bp
+from app.compression import compression_stats
+from app.database import pool_status
 from app.extensions import db
-from app.models import (
-    AuditLog,
-    Bicycle,
-    Client,
-    Job,
-    JobItem,
-    JobPart,
-    ServiceType,
-    Store,
-    User,
-    Workshop,
-    user_workshops,
-)
+from app.models import AuditLog, Store, User, Workshop, user_workshops
 from app.services.audit_service import AuditService
+from app.services.memory_service import MemoryService
+from app.services.stats_service import StatsService
+from app.services.tenant_purge_service import TenantPurgeService
 from app.main.forms import DeleteForm, SuperAdminProfileForm
 from app.main.helpers import (
     super_admin_or_redirect,
-    generate_temp_password
+    generate_temp_password,
+    keyset_paginate,
+    parse_cursor,
+    workshop_storage_bytes,
 )
+from app.date_ranges import current_month_start, parse_month_start, shift_months
 from app.auth.utils import send_approval_notification, send_confirmation_email
-from app.timezone import now_cordoba_naive
 
 
 MONTH_LABELS = {
@@ -45,23 +42,31 @@ MONTH_LABELS = {
     12: "Diciembre",
 }
 
-
-def _parse_month_start(raw_month: str | None) -> date:
-    default_month = now_cordoba_naive().date().replace(day=1)
-    value = (raw_month or "").strip()
-    if not value:
-        return default_month
-    try:
-        parsed = datetime.strptime(value, "%Y-%m").date()
-    except ValueError:
-        return default_month
-    return parsed.replace(day=1)
-
-
-def _next_month(month_start: date) -> date:
-    if month_start.month == 12:
-        return date(month_start.year + 1, 1, 1)
-    return date(month_start.year, month_start.month + 1, 1)
+TREND_MONTHS = 24
+SUPER_ADMIN_PAGE_SIZE = 25
+AUDIT_PAGE_SIZE = 50
+
+
+def _owner_search(query, search_query):
+    if not search_query:
+        return query
+    like_value = f"%{search_query}%"
+    workshop_match = (
+        db.session.query(user_workshops.c.user_id)
+        .join(Workshop, Workshop.id == user_workshops.c.workshop_id)
+        .filter(
+            user_workshops.c.user_id == User.id,
+            Workshop.name.ilike(like_value),
+        )
+        .exists()
+    )
+    return query.filter(
+        or_(
+            User.full_name.ilike(like_value),
+            User.email.ilike(like_value),
+            workshop_match,
+        )
+    )
 
 
 @main_bp.route("/admin/dashboard")
@@ -71,10 +76,7 @@ def super_admin_dashboard():
     if redirect_response:
         return redirect_response
 
-    month_start = _parse_month_start(request.args.get("month"))
-    month_end = _next_month(month_start)
-    month_start_dt = datetime.combine(month_start, datetime.min.time())
-    month_end_dt = datetime.combine(month_end, datetime.min.time())
+    month_start = parse_month_start(request.args.get("month"), current_month_start())
 
     metrics = {
         "owners": User.query.filter_by(role="owner").count(),
@@ -83,32 +85,41 @@ def super_admin_dashboard():
         ).count(),
     }
 
-    month_filters = [Job.created_at >= month_start_dt, Job.created_at < month_end_dt]
-    jobs_month_count = Job.query.filter(*month_filters).count()
+    trend_start = shift_months(month_start, -(TREND_MONTHS - 1))
+    monthly_totals = StatsService.platform_monthly_totals(trend_start, month_start)
+    empty_month = {
+        "jobs_count": 0,
+        "service_revenue": Decimal("0"),
+        "parts_revenue": Decimal("0"),
+        "service_units": 0,
+    }
 
-    service_revenue_month = (
-        db.session.query(func.coalesce(func.sum(JobItem.unit_price * JobItem.quantity), 0))
-        .join(Job, Job.id == JobItem.job_id)
-        .filter(*month_filters)
-        .scalar()
-    )
-    parts_revenue_month = (
-        db.session.query(func.coalesce(func.sum(JobPart.unit_price * JobPart.quantity), 0))
-        .join(Job, Job.id == JobPart.job_id)
-        .filter(*month_filters)
-        .scalar()
-    )
-    service_units_month = (
-        db.session.query(func.coalesce(func.sum(JobItem.quantity), 0))
-        .join(Job, Job.id == JobItem.job_id)
-        .filter(*month_filters)
-        .scalar()
-    )
+    trend = []
+    previous_revenue = None
+    for offset in range(TREND_MONTHS):
+        trend_month = shift_months(trend_start, offset)
+        totals = monthly_totals.get(trend_month, empty_month)
+        revenue = totals["service_revenue"] + totals["parts_revenue"]
+        change_pct = None
+        if previous_revenue:
+            change_pct = round((revenue - previous_revenue) / previous_revenue * 100, 1)
+        trend.append(
+            {
+                "month": trend_month,
+                "label": f"{MONTH_LABELS[trend_month.month]} {trend_month.year}",
+                "jobs_count": totals["jobs_count"],
+                "revenue": revenue,
+                "change_pct": change_pct,
+            }
+        )
+        previous_revenue = revenue
+    trend.reverse()
 
-    service_revenue_month_dec = Decimal(str(service_revenue_month or 0))
-    parts_revenue_month_dec = Decimal(str(parts_revenue_month or 0))
-    revenue_month = service_revenue_month_dec + parts_revenue_month_dec
-    service_units_month_dec = Decimal(str(service_units_month or 0))
+    selected_totals = monthly_totals.get(month_start, empty_month)
+    jobs_month_count = selected_totals["jobs_count"]
+    service_revenue_month_dec = selected_totals["service_revenue"]
+    revenue_month = service_revenue_month_dec + selected_totals["parts_revenue"]
+    service_units_month_dec = Decimal(selected_totals["service_units"])
 
     avg_job_month = Decimal("0")
     if jobs_month_count:
@@ -130,6 +141,7 @@ def super_admin_dashboard():
         revenue_month=revenue_month,
         avg_job_month=avg_job_month,
         avg_service_month=avg_service_month,
+        trend=trend,
     )
 
 
@@ -139,14 +151,28 @@ def super_admin_pending():
     _, redirect_response = super_admin_or_redirect()
     if redirect_response:
         return redirect_response
-    owners = (
-        User.query.options(selectinload(User.workshops))
-        .filter_by(role="owner", is_approved=False, is_active=True)
-        .order_by(User.created_at.desc())
-        .all()
+    search_query = (request.args.get("q") or "").strip()
+    query = _owner_search(
+        User.query.options(selectinload(User.workshops)).filter_by(
+            role="owner", is_approved=False, is_active=True
+        ),
+        search_query,
+    )
+    pagination = keyset_paginate(
+        query,
+        User.id,
+        before=parse_cursor(request.args.get("before")),
+        after=parse_cursor(request.args.get("after")),
+        per_page=SUPER_ADMIN_PAGE_SIZE,
     )
     form = DeleteForm()
-    return render_template("main/super_admin/pending.html", owners=owners, form=form)
+    return render_template(
+        "main/super_admin/pending.html",
+        owners=pagination["items"],
+        pagination=pagination,
+        search_query=search_query,
+        form=form,
+    )
 
 
 @main_bp.route("/admin/pending/<int:user_id>/approve", methods=["POST"])
@@ -217,14 +243,36 @@ def super_admin_owners():
     _, redirect_response = super_admin_or_redirect()
     if redirect_response:
         return redirect_response
-    owners = (
-        User.query.options(selectinload(User.workshops))
-        .filter_by(role="owner")
-        .order_by(User.created_at.desc())
-        .all()
+    search_query = (request.args.get("q") or "").strip()
+    query = _owner_search(
+        User.query.options(selectinload(User.workshops)).filter_by(role="owner"),
+        search_query,
+    )
+    pagination = keyset_paginate(
+        query,
+        User.id,
+        before=parse_cursor(request.args.get("before")),
+        after=parse_cursor(request.args.get("after")),
+        per_page=SUPER_ADMIN_PAGE_SIZE,
     )
+    owners = pagination["items"]
+    usage = StatsService.owner_usage(
+        [owner.id for owner in owners], current_month_start()
+    )
+    storage = {
+        owner.id: sum(workshop_storage_bytes(workshop.id) for workshop in owner.workshops)
+        for owner in owners
+    }
     form = DeleteForm()
-    return render_template("main/super_admin/owners.html", owners=owners, form=form)
+    return render_template(
+        "main/super_admin/owners.html",
+        owners=owners,
+        usage=usage,
+        storage=storage,
+        pagination=pagination,
+        search_query=search_query,
+        form=form,
+    )
 
 
 @main_bp.route("/admin/owners/<int:user_id>/toggle", methods=["POST"])
@@ -275,17 +323,8 @@ def super_admin_owner_delete(user_id):
 
     workshop = owner.workshops[0] if owner.workshops else None
     stores = []
-    store_ids = []
     if workshop:
-        has_business_data = any(
-            (
-                Client.query.filter_by(workshop_id=workshop.id).first(),
-                Bicycle.query.filter_by(workshop_id=workshop.id).first(),
-                ServiceType.query.filter_by(workshop_id=workshop.id).first(),
-                Job.query.filter_by(workshop_id=workshop.id).first(),
-            )
-        )
-        if has_business_data:
+        if TenantPurgeService.has_business_data(workshop.id):
             flash("No se puede eliminar: tiene datos de negocio asociados", "error")
             return redirect(url_for("main.super_admin_owners"))
 
@@ -302,8 +341,10 @@ def super_admin_owner_delete(user_id):
             return redirect(url_for("main.super_admin_owners"))
 
         stores = Store.query.filter_by(workshop_id=workshop.id).all()
-        store_ids = [store.id for store in stores]
 
+    # Sin datos de negocio el taller es chico: todo va en una sola transaccion.
+    # Los UPDATE de audit_logs usan los indices por taller, sucursal y usuario.
+    store_ids = [store.id for store in stores]
     if store_ids:
         AuditLog.query.filter(AuditLog.store_id.in_(store_ids)).update(
             {AuditLog.store_id: None}, synchronize_session=False
@@ -430,5 +471,85 @@ def super_admin_audit():
     _, redirect_response = super_admin_or_redirect()
     if redirect_response:
         return redirect_response
-    logs = AuditLog.query.order_by(AuditLog.created_at.desc()).limit(200).all()
-    return render_template("main/super_admin/audit.html", logs=logs)
+    search_query = (request.args.get("q") or "").strip()
+    query = AuditLog.query.options(
+        joinedload(AuditLog.user),
+        joinedload(AuditLog.workshop),
+        joinedload(AuditLog.store),
+    )
+    if search_query:
+        like_value = f"%{search_query}%"
+        query = query.filter(
+            or_(
+                AuditLog.description.ilike(like_value),
+                AuditLog.entity_type.ilike(like_value),
+                AuditLog.action.ilike(like_value),
+            )
+        )
+    pagination = keyset_paginate(
+        query,
+        AuditLog.id,
+        before=parse_cursor(request.args.get("before")),
+        after=parse_cursor(request.args.get("after")),
+        per_page=AUDIT_PAGE_SIZE,
+    )
+    return render_template(
+        "main/super_admin/audit.html",
+        logs=pagination["items"],
+        pagination=pagination,
+        search_query=search_query,
+    )
+
+
+@main_bp.route("/admin/memory")
+@login_required
+def super_admin_memory():
+    _, redirect_response = super_admin_or_redirect()
+    if redirect_response:
+        return redirect_response
+    return render_template(
+        "main/super_admin/memory.html",
+        status=MemoryService.status(),
+        growth=MemoryService.top_growth(),
+        form=DeleteForm(),
+    )
+
+
+@main_bp.route("/admin/runtime")
+@login_required
+def super_admin_runtime():
+    """Pool de conexiones y compresion del worker que atiende el pedido."""
+    _, redirect_response = super_admin_or_redirect()
+    if redirect_response:
+        return redirect_response
+    return {
+        "pid": os.getpid(),
+        "pool": pool_status(db.engine),
+        "compression": compression_stats(),
+    }
+
+
+@main_bp.route("/admin/memory/<action>", methods=["POST"])
+@login_required
+def super_admin_memory_action(action):
+    _, redirect_response = super_admin_or_redirect()
+    if redirect_response:
+        return redirect_response
+    form = DeleteForm()
+    if not form.validate_on_submit():
+        flash("Solicitud invalida", "error")
+        return redirect(url_for("main.super_admin_memory"))
+    if action == "start":
+        MemoryService.start()
+        flash("Trazado de memoria iniciado en este worker", "success")
+    elif action == "baseline":
+        if MemoryService.take_baseline():
+            flash("Snapshot base guardado", "success")
+        else:
+            flash("Primero inicia el trazado de memoria", "error")
+    elif action == "stop":
+        MemoryService.stop()
+        flash("Trazado de memoria detenido", "success")
+    else:
+        flash("Accion invalida", "error")
+    return redirect(url_for("main.super_admin_memory"))
@@ -1,13 +1,15 @@
 from flask import render_template, request, redirect, url_for, flash
 from flask_login import login_required
-from sqlalchemy import func, or_
 
 from app.main import main_bp
+from app.database import read_only
+from app.http_cache import conditional_get
 from app.extensions import db
-from app.models import Bicycle, BicycleBrand, Client, Job
+from app.models import Bicycle, BicycleBrand, Job
 from app.services.client_service import ClientService
 from app.services.audit_service import AuditService
 from app.main.forms import BicycleForm, DeleteForm
+from app.main.list_queries import bicycles_list_query, bicycle_rows, filter_bicycles
 from app.main.helpers import (
     get_workshop_or_redirect,
     paginate_query,
@@ -19,6 +21,8 @@ from app.main.helpers import (
 
 @main_bp.route("/bicycles")
 @login_required
+@read_only
+@conditional_get
 def bicycles():
     workshop, redirect_response = get_workshop_or_redirect()
     if redirect_response:
@@ -30,24 +34,11 @@ def bicycles():
     if not active_brand:
         active_brand = "all"
 
-    query = Bicycle.query.join(Client).outerjoin(BicycleBrand).filter(Bicycle.workshop_id == workshop.id)
-    if active_brand.lower() != "all":
-        query = query.filter(func.lower(func.coalesce(BicycleBrand.name, "")) == active_brand.lower())
-
-    if search_query:
-        search_term = f"%{search_query.lower()}%"
-        query = query.filter(
-            or_(
-                func.lower(func.coalesce(BicycleBrand.name, "")).like(search_term),
-                func.lower(func.coalesce(Bicycle.model, "")).like(search_term),
-                func.lower(func.coalesce(Bicycle.description, "")).like(search_term),
-                func.lower(func.coalesce(Client.full_name, "")).like(search_term),
-            )
-        )
-
+    query = filter_bicycles(bicycles_list_query(workshop.id), active_brand, search_query)
     query = query.order_by(Bicycle.id.desc())
     pagination = paginate_query(query, page)
-    
+    pagination["items"] = bicycle_rows(pagination["items"])
+
     table_template_data = {
         "bicycles": pagination["items"],
         "pagination": pagination,
@@ -76,8 +67,25 @@ def bicycles():
     )
 
 
+@main_bp.route("/bicycles/<int:bicycle_id>/drawer")
+@login_required
+@read_only
+@conditional_get
+def bicycles_drawer(bicycle_id):
+    workshop, redirect_response = get_workshop_or_redirect()
+    if redirect_response:
+        return redirect_response
+
+    row = bicycles_list_query(workshop.id).filter(Bicycle.id == bicycle_id).first_or_404()
+    return render_template(
+        "main/bicycles/_drawer.html", bicycle=bicycle_rows([row])[0], delete_form=DeleteForm()
+    )
+
+
 @main_bp.route("/bicycles/<int:bicycle_id>")
 @login_required
+@read_only
+@conditional_get
 def bicycles_detail(bicycle_id):
     workshop, redirect_response = get_workshop_or_redirect()
     if redirect_response:
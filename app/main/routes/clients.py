@@ -1,16 +1,20 @@
 from flask import render_template, request, redirect, url_for, flash
 from flask_login import login_required
-from sqlalchemy import func, or_
 
 from app.main import main_bp
+from app.database import read_only
+from app.http_cache import conditional_get
 from app.models import Client
 from app.services.client_service import ClientService
 from app.services.audit_service import AuditService
 from app.main.forms import ClientForm, DeleteForm
+from app.main.list_queries import clients_list_query, client_rows, filter_clients
 from app.main.helpers import get_workshop_or_redirect, paginate_query
 
 @main_bp.route("/clients")
 @login_required
+@read_only
+@conditional_get
 def clients():
     workshop, redirect_response = get_workshop_or_redirect()
     if redirect_response:
@@ -18,20 +22,13 @@ def clients():
 
     page = request.args.get("page", 1, type=int)
     search_query = (request.args.get("q") or "").strip()
-    search_term = f"%{search_query.lower()}%"
-
-    query = Client.query.filter_by(workshop_id=workshop.id).order_by(Client.full_name.asc())
-    if search_query:
-        query = query.filter(
-            or_(
-                func.lower(Client.client_code).like(search_term),
-                func.lower(Client.full_name).like(search_term),
-                func.lower(func.coalesce(Client.email, "")).like(search_term),
-                func.lower(func.coalesce(Client.phone, "")).like(search_term),
-            )
-        )
+
+    query = filter_clients(clients_list_query(workshop.id), search_query).order_by(
+        Client.full_name.asc(), Client.id.asc()
+    )
 
     pagination = paginate_query(query, page)
+    pagination["items"] = client_rows(pagination["items"])
 
     template_data = {
         "clients": pagination["items"],
@@ -49,8 +46,25 @@ def clients():
     )
 
 
+@main_bp.route("/clients/<int:client_id>/drawer")
+@login_required
+@read_only
+@conditional_get
+def clients_drawer(client_id):
+    workshop, redirect_response = get_workshop_or_redirect()
+    if redirect_response:
+        return redirect_response
+
+    row = clients_list_query(workshop.id).filter(Client.id == client_id).first_or_404()
+    return render_template(
+        "main/clients/_drawer.html", client=client_rows([row])[0], delete_form=DeleteForm()
+    )
+
+
 @main_bp.route("/clients/<int:client_id>")
 @login_required
+@read_only
+@conditional_get
 def clients_detail(client_id):
     workshop, redirect_response = get_workshop_or_redirect()
     if redirect_response:
@@ -1,31 +1,19 @@
-import calendar
-from datetime import date, datetime
+from datetime import date
 
 from flask import render_template, redirect, url_for, g, flash, request
 from flask_login import login_required, current_user
 from sqlalchemy import case, func
 from app.main import main_bp
+from app.database import read_only
 from app.extensions import db
 from app.models import Client, Bicycle, ServiceType, Job, JobItem, JobPart, Store
 from app.main.helpers import (
     get_workshop_or_redirect,
     owner_or_redirect
 )
+from app.date_ranges import month_bucket, month_range_filters, parse_month_start
 
 
-def _parse_month_param(value: str | None):
-    """Parse 'YYYY-MM' string into (date_from, date_to) for that month."""
-    raw = (value or "").strip()
-    if not raw:
-        return None, None
-    try:
-        dt = datetime.strptime(raw, "%Y-%m")
-        year, month = dt.year, dt.month
-        last_day = calendar.monthrange(year, month)[1]
-        return date(year, month, 1), date(year, month, last_day)
-    except ValueError:
-        return None, None
-
 @main_bp.route("/")
 def index():
     return redirect(url_for("main.dashboard"))
@@ -33,12 +21,13 @@ def index():
 
 @main_bp.route("/dashboard")
 @login_required
+@read_only
 def dashboard():
     workshop = g.active_workshop
     store = g.active_store
     today = date.today()
     selected_month = (request.args.get("month") or "").strip()
-    date_from, date_to = _parse_month_param(selected_month)
+    month_start = parse_month_start(selected_month)
     counts = {
         "clients": Client.query.filter_by(workshop_id=workshop.id).count()
         if workshop
@@ -75,18 +64,14 @@ def dashboard():
         "closed_pct": 0,
         "cancelled_pct": 0,
         "selected_month": selected_month,
-        "has_active_range": bool(date_from),
+        "has_active_range": bool(month_start),
     }
     if workshop and store:
-        date_filters = []
-        if date_from:
-            date_filters.append(func.date(Job.created_at) >= date_from)
-        if date_to:
-            date_filters.append(func.date(Job.created_at) <= date_to)
+        date_filters = month_range_filters(Job.created_at, month_start)
 
         agenda_jobs = (
             Job.query.filter_by(workshop_id=workshop.id, store_id=store.id)
-            .filter(Job.status.in_(["open", "in_progress", "ready"]))
+            .filter(Job.active_status_clause())
             .order_by(
                 case(
                     (
@@ -163,20 +148,16 @@ def dashboard():
             Job.query.filter(
                 Job.workshop_id == workshop.id,
                 Job.store_id == store.id,
-                Job.status.in_(["open", "in_progress", "ready"]),
+                Job.active_status_clause(),
                 Job.estimated_delivery_at < today,
             ).count()
         )
 
         # Promedio de trabajos por mes (basado en meses con actividad)
-        month_expr = func.concat(
-            func.extract("year", Job.created_at),
-            func.extract("month", Job.created_at),
-        )
         month_counts = (
             db.session.query(func.count(Job.id))
             .filter(Job.workshop_id == workshop.id, Job.store_id == store.id)
-            .group_by(month_expr)
+            .group_by(month_bucket(Job.created_at))
             .all()
         )
         avg_jobs_per_month = (
@@ -225,7 +206,7 @@ def dashboard():
             if total_jobs
             else 0,
             "selected_month": selected_month,
-            "has_active_range": bool(date_from),
+            "has_active_range": bool(month_start),
         }
     elif workshop:
         summary["services_active"] = ServiceType.query.filter_by(
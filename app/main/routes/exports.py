@@ -0,0 +1,208 @@
+from datetime import date
+
+from flask import request
+from flask_login import login_required
+from sqlalchemy import func, select
+
+from app.main import main_bp
+from app.database import read_only
+from app.date_ranges import parse_month_start
+from app.exports import EXPORT_FORMATS, YIELD_PER, export_response, joined_names
+from app.models import Bicycle, BicycleBrand, Client, Job, JobItem, JobPart, ServiceType
+from app.main.list_queries import (
+    JOB_LIST_STATUSES,
+    bicycles_list_query,
+    clients_list_query,
+    filter_bicycles,
+    filter_clients,
+    filter_jobs,
+    jobs_list_query,
+)
+from app.main.helpers import get_store_or_redirect, get_workshop_or_redirect, owner_or_redirect
+from app.timezone import cordoba_month_bounds_utc, utc_to_cordoba_naive
+
+
+JOB_STATUS_LABELS = {
+    "open": "Abierto",
+    "in_progress": "En progreso",
+    "ready": "Listo",
+    "closed": "Cerrado",
+    "cancelled": "Cancelado",
+}
+
+
+def _export_format():
+    value = (request.args.get("format") or "csv").strip().lower()
+    return value if value in EXPORT_FORMATS else "csv"
+
+
+def _export_scope():
+    _, owner_redirect = owner_or_redirect()
+    if owner_redirect:
+        return None, owner_redirect
+    return get_workshop_or_redirect()
+
+
+@main_bp.route("/jobs/export")
+@login_required
+@read_only
+def jobs_export():
+    """Trabajos de la sucursal con los mismos filtros del listado (y ``month``)."""
+    workshop, redirect_response = _export_scope()
+    if redirect_response:
+        return redirect_response
+
+    store, store_redirect = get_store_or_redirect()
+    if store_redirect:
+        return store_redirect
+
+    search_query = (request.args.get("q") or "").strip()
+    requested_status = (request.args.get("status") or "all").strip().lower()
+    status = requested_status if requested_status in JOB_LIST_STATUSES else "all"
+
+    services = (
+        select(joined_names(ServiceType.name))
+        .join(JobItem, JobItem.service_type_id == ServiceType.id)
+        .where(JobItem.job_id == Job.id)
+        .correlate(Job)
+        .scalar_subquery()
+    )
+    service_total = (
+        select(func.coalesce(func.sum(JobItem.unit_price * JobItem.quantity), 0))
+        .where(JobItem.job_id == Job.id)
+        .correlate(Job)
+        .scalar_subquery()
+    )
+    parts_total = (
+        select(func.coalesce(func.sum(JobPart.unit_price * JobPart.quantity), 0))
+        .where(JobPart.job_id == Job.id)
+        .correlate(Job)
+        .scalar_subquery()
+    )
+    query = filter_jobs(jobs_list_query(workshop.id, store.id), status, search_query)
+    month_start = parse_month_start(request.args.get("month"))
+    if month_start:
+        start_utc, end_utc = cordoba_month_bounds_utc(month_start)
+        query = query.filter(Job.created_at >= start_utc, Job.created_at < end_utc)
+    query = query.with_entities(
+        Job.code,
+        Job.status,
+        Client.full_name,
+        Client.phone,
+        BicycleBrand.name,
+        Bicycle.model,
+        services,
+        service_total,
+        parts_total,
+        Job.created_at,
+        Job.estimated_delivery_at,
+    ).order_by(Job.created_at.desc(), Job.id.desc())
+
+    def rows():
+        for (
+            code,
+            job_status,
+            client_name,
+            phone,
+            brand,
+            model,
+            service_names,
+            services_amount,
+            parts_amount,
+            created_at,
+            estimated_delivery_at,
+        ) in query.yield_per(YIELD_PER):
+            yield (
+                code,
+                JOB_STATUS_LABELS.get(job_status, job_status),
+                client_name,
+                phone,
+                brand,
+                model,
+                service_names,
+                services_amount,
+                parts_amount,
+                services_amount + parts_amount,
+                utc_to_cordoba_naive(created_at),
+                estimated_delivery_at,
+            )
+
+    return export_response(
+        _export_format(),
+        f"trabajos_{date.today():%Y%m%d}",
+        "Trabajos",
+        (
+            "codigo",
+            "estado",
+            "cliente",
+            "telefono",
+            "marca",
+            "modelo",
+            "services",
+            "total_services",
+            "total_repuestos",
+            "total",
+            "ingreso",
+            "entrega_estimada",
+        ),
+        rows(),
+    )
+
+
+@main_bp.route("/clients/export")
+@login_required
+@read_only
+def clients_export():
+    workshop, redirect_response = _export_scope()
+    if redirect_response:
+        return redirect_response
+
+    search_query = (request.args.get("q") or "").strip()
+    query = filter_clients(clients_list_query(workshop.id), search_query).order_by(
+        Client.full_name.asc(), Client.id.asc()
+    )
+
+    def rows():
+        for _, client_code, full_name, email, phone, bicycle_count, _ in query.yield_per(
+            YIELD_PER
+        ):
+            yield client_code, full_name, email, phone, bicycle_count
+
+    return export_response(
+        _export_format(),
+        f"clientes_{date.today():%Y%m%d}",
+        "Clientes",
+        ("codigo", "nombre", "correo", "telefono", "bicicletas"),
+        rows(),
+    )
+
+
+@main_bp.route("/bicycles/export")
+@login_required
+@read_only
+def bicycles_export():
+    workshop, redirect_response = _export_scope()
+    if redirect_response:
+        return redirect_response
+
+    search_query = (request.args.get("q") or "").strip()
+    brand = (request.args.get("brand") or "all").strip() or "all"
+    query = (
+        filter_bicycles(bicycles_list_query(workshop.id), brand, search_query)
+        .with_entities(
+            Client.client_code,
+            Client.full_name,
+            BicycleBrand.name,
+            Bicycle.model,
+            Bicycle.description,
+        )
+        .order_by(Bicycle.id.desc())
+    )
+
+    return export_response(
+        _export_format(),
+        f"bicicletas_{date.today():%Y%m%d}",
+        "Bicicletas",
+        ("codigo_cliente", "cliente", "marca", "modelo", "descripcion"),
+        (tuple(row) for row in query.yield_per(YIELD_PER)),
+    )
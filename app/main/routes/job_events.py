@@ -0,0 +1,176 @@
+import time
+from datetime import date
+
+from flask import abort, current_app, jsonify, render_template, request
+from flask_login import login_required
+from sqlalchemy.orm import joinedload
+
+from app.main import main_bp
+from app.database import read_only
+from app.extensions import db
+from app.http_cache import conditional_get
+from app.job_events import format_sse, public_event
+from app.models import Bicycle, Job, JobItem
+from app.services import job_event_service  # noqa: F401  (registra los listeners)
+from app.main.forms import DeleteForm, JobStatusForm
+from app.main.list_queries import jobs_list_query, job_rows
+from app.main.helpers import get_workshop_or_redirect, get_store_or_redirect
+
+
+STREAM_RETRY_MS = 1000
+BUSY_RETRY_MS = 15000
+HEARTBEAT_SECONDS = 10
+
+
+@main_bp.route("/jobs/events")
+@login_required
+def jobs_events():
+    """Eventos de trabajos de la sucursal: SSE o long-poll JSON."""
+    if not current_app.config.get("JOB_EVENTS_ENABLED", True):
+        abort(404)
+
+    workshop, redirect_response = get_workshop_or_redirect()
+    if redirect_response:
+        return redirect_response
+
+    store, store_redirect = get_store_or_redirect()
+    if store_redirect:
+        return store_redirect
+
+    broker = current_app.extensions["job_events"]
+    broker.ensure_listener(current_app)
+    store_id = store.id
+    last_id = _last_event_id()
+    # La espera no consulta la base: la conexion vuelve al pool antes.
+    db.session.close()
+
+    if request.accept_mimetypes.best == "text/event-stream":
+        return _event_stream(broker, store_id, last_id)
+    return _long_poll(broker, store_id, last_id)
+
+
+@main_bp.route("/jobs/<int:job_id>/row")
+@login_required
+@read_only
+@conditional_get
+def jobs_row(job_id):
+    workshop, redirect_response = get_workshop_or_redirect()
+    if redirect_response:
+        return redirect_response
+
+    store, store_redirect = get_store_or_redirect()
+    if store_redirect:
+        return store_redirect
+
+    row = jobs_list_query(workshop.id, store.id).filter(Job.id == job_id).first()
+    if row is None:
+        return "", 204
+    return render_template(
+        "main/jobs/_row.html",
+        job=job_rows([row])[0],
+        delete_form=DeleteForm(),
+        status_form=JobStatusForm(),
+    )
+
+
+@main_bp.route("/jobs/<int:job_id>/agenda-item")
+@login_required
+@read_only
+@conditional_get
+def jobs_agenda_item(job_id):
+    workshop, redirect_response = get_workshop_or_redirect()
+    if redirect_response:
+        return redirect_response
+
+    store, store_redirect = get_store_or_redirect()
+    if store_redirect:
+        return store_redirect
+
+    job = (
+        Job.query.filter_by(id=job_id, workshop_id=workshop.id, store_id=store.id)
+        .filter(Job.active_status_clause())
+        .options(
+            joinedload(Job.bicycle).joinedload(Bicycle.client),
+            joinedload(Job.bicycle).joinedload(Bicycle.brand_rel),
+            joinedload(Job.items).joinedload(JobItem.service_type),
+        )
+        .first()
+    )
+    if job is None:
+        return "", 204
+    return render_template("main/jobs/_agenda_item.html", job=job, today=date.today())
+
+
+def _last_event_id():
+    raw = request.headers.get("Last-Event-ID") or request.args.get("after") or ""
+    try:
+        return max(int(raw), 0)
+    except ValueError:
+        return 0
+
+
+def _event_stream(broker, store_id, last_id):
+    stream_seconds = current_app.config["JOB_EVENTS_STREAM_SECONDS"]
+
+    def generate():
+        # El cupo se toma dentro del generador: si el cliente corta antes de
+        # la primera lectura, el finally no correria y el cupo quedaria tomado.
+        waiter = stream_seconds > 0 and broker.acquire_waiter()
+        try:
+            start_id = last_id or time.time_ns()
+            retry_ms = STREAM_RETRY_MS if waiter else BUSY_RETRY_MS
+            # Un ``id`` sin datos fija Last-Event-ID para la reconexion.
+            yield f"retry: {retry_ms}\nid: {start_id}\n\n"
+            if last_id:
+                events, cursor = broker.since(store_id, last_id)
+            else:
+                events, cursor = [], broker.cursor()
+            for job_event in events:
+                yield format_sse(job_event)
+            if not waiter:
+                return
+            deadline = time.monotonic() + stream_seconds
+            while (remaining := deadline - time.monotonic()) > 0:
+                events, cursor = broker.wait(store_id, cursor, min(remaining, HEARTBEAT_SECONDS))
+                if not events:
+                    yield ": ping\n\n"
+                for job_event in events:
+                    yield format_sse(job_event)
+        finally:
+            if waiter:
+                broker.release_waiter()
+
+    response = current_app.response_class(generate(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _long_poll(broker, store_id, last_id):
+    # Sin ventana: el cliente vuelve a preguntar enseguida y reenviar lo ya
+    # visto lo haria girar sin esperar.
+    if last_id:
+        events, cursor = broker.since(store_id, last_id, window=False)
+    else:
+        events, cursor = [], broker.cursor()
+
+    waited = False
+    if not events and broker.acquire_waiter():
+        waited = True
+        try:
+            events, cursor = broker.wait(
+                store_id, cursor, current_app.config["JOB_EVENTS_POLL_SECONDS"]
+            )
+        finally:
+            broker.release_waiter()
+
+    next_id = max((job_event["id"] for job_event in events), default=last_id or time.time_ns())
+    response = jsonify(
+        {
+            "events": [public_event(job_event) for job_event in events],
+            "last_id": str(next_id),
+            "retry_ms": 0 if waited or events else BUSY_RETRY_MS,
+        }
+    )
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -1,17 +1,27 @@
 from datetime import date
 
-from flask import render_template, request, redirect, url_for, flash, g, send_file
+from flask import render_template, request, redirect, url_for, flash, g, jsonify, send_file
 from flask_login import login_required, current_user
-from sqlalchemy import func, or_
+from flask_wtf.csrf import generate_csrf
 from sqlalchemy.orm import joinedload
 
 from app.main import main_bp
+from app.database import read_only
+from app.http_cache import conditional_get
 from app.extensions import db
-from app.models import Bicycle, BicycleBrand, Client, Job, JobItem, ServiceType
+from app.models import Bicycle, Job, JobItem
+from app.services.job_bulk_service import JobBulkService
 from app.services.job_service import JobService
 from app.services.audit_service import AuditService
-from app.services.pdf_service import generate_job_pdf, build_pdf_filename
-from app.main.forms import JobForm, JobStatusForm, DeleteForm
+from app.services.offline_mutation_service import OfflineMutationService, version_token
+from app.services.pdf_service import (
+    build_pdf_filename,
+    generate_job_pdf,
+    generate_jobs_zip,
+    job_totals,
+)
+from app.main.forms import JobBulkForm, JobForm, JobNotesForm, JobStatusForm, DeleteForm
+from app.main.list_queries import JOB_LIST_STATUSES, filter_jobs, jobs_list_query, job_rows
 from app.main.helpers import (
     build_job_whatsapp_message,
     get_workshop_or_redirect,
@@ -26,6 +36,8 @@ from app.main.helpers import (
 
 @main_bp.route("/jobs")
 @login_required
+@read_only
+@conditional_get
 def jobs():
     workshop, redirect_response = get_workshop_or_redirect()
     if redirect_response:
@@ -38,54 +50,19 @@ def jobs():
     page = request.args.get("page", 1, type=int)
     search_query = (request.args.get("q") or "").strip()
     requested_status = (request.args.get("status") or "all").strip().lower()
-    allowed_statuses = {
-        "all",
-        "open",
-        "in_progress",
-        "ready",
-        "closed",
-        "cancelled",
-        "overdue",
-    }
-    active_status = requested_status if requested_status in allowed_statuses else "all"
-
-    query = Job.query.filter_by(workshop_id=workshop.id, store_id=store.id)
-    if active_status == "overdue":
-        query = query.filter(
-            Job.status.in_(["open", "in_progress", "ready"]),
-            Job.estimated_delivery_at < date.today(),
-        )
-    elif active_status != "all":
-        query = query.filter(Job.status == active_status)
-
-    if search_query:
-        search_term = f"%{search_query.lower()}%"
-        query = (
-            query.join(Bicycle, Job.bicycle_id == Bicycle.id)
-            .join(Client, Bicycle.client_id == Client.id)
-            .outerjoin(BicycleBrand, Bicycle.brand_id == BicycleBrand.id)
-            .outerjoin(JobItem, JobItem.job_id == Job.id)
-            .outerjoin(ServiceType, JobItem.service_type_id == ServiceType.id)
-            .filter(
-                or_(
-                    func.lower(func.coalesce(Job.code, "")).like(search_term),
-                    func.lower(func.coalesce(Client.full_name, "")).like(search_term),
-                    func.lower(func.coalesce(BicycleBrand.name, "")).like(search_term),
-                    func.lower(func.coalesce(Bicycle.model, "")).like(search_term),
-                    func.lower(func.coalesce(ServiceType.name, "")).like(search_term),
-                )
-            )
-            .distinct()
-        )
+    active_status = requested_status if requested_status in JOB_LIST_STATUSES else "all"
 
-    query = query.order_by(Job.created_at.desc())
+    query = filter_jobs(jobs_list_query(workshop.id, store.id), active_status, search_query)
+    query = query.order_by(Job.created_at.desc(), Job.id.desc())
     pagination = paginate_query(query, page)
+    pagination["items"] = job_rows(pagination["items"])
 
     table_template_data = {
         "jobs": pagination["items"],
         "pagination": pagination,
         "delete_form": DeleteForm(),
         "status_form": JobStatusForm(),
+        "bulk_form": JobBulkForm(),
         "active_status": active_status,
         "search_query": search_query,
     }
@@ -99,8 +76,35 @@ def jobs():
     )
 
 
+@main_bp.route("/jobs/<int:job_id>/drawer")
+@login_required
+@read_only
+@conditional_get
+def jobs_drawer(job_id):
+    workshop, redirect_response = get_workshop_or_redirect()
+    if redirect_response:
+        return redirect_response
+
+    store, store_redirect = get_store_or_redirect()
+    if store_redirect:
+        return store_redirect
+
+    job = (
+        Job.query.filter_by(id=job_id, workshop_id=workshop.id, store_id=store.id)
+        .options(
+            joinedload(Job.bicycle).joinedload(Bicycle.client),
+            joinedload(Job.bicycle).joinedload(Bicycle.brand_rel),
+            joinedload(Job.items).joinedload(JobItem.service_type),
+        )
+        .first_or_404()
+    )
+    return render_template("main/jobs/_drawer.html", job=job, delete_form=DeleteForm())
+
+
 @main_bp.route("/jobs/<int:job_id>")
 @login_required
+@read_only
+@conditional_get
 def jobs_detail(job_id):
     workshop, redirect_response = get_workshop_or_redirect()
     if redirect_response:
@@ -378,28 +382,102 @@ def jobs_status(job_id):
 
     form = JobStatusForm()
     if not form.validate_on_submit():
+        if _wants_json():
+            return jsonify({"result": "rejected", "errors": form.errors}), 400
         return redirect(url_for("main.jobs"))
 
     job = Job.query.filter_by(
         id=job_id, workshop_id=workshop.id, store_id=store.id
     ).first_or_404()
-    
-    job.status = form.status.data
-    AuditService.log_action(
-        "update",
-        "job",
-        job.id,
-        f"Trabajo {job.code} -> {job.status}",
-        workshop_id=workshop.id,
-        store_id=store.id,
+
+    result, duplicate = OfflineMutationService.apply_job_change(
+        job,
+        "status",
+        form.status.data,
+        "status",
+        f"Trabajo {job.code} -> {form.status.data}",
+        store.id,
     )
-    db.session.commit()
-    flash("Estado actualizado correctamente", "success")
-    return redirect(url_for("main.jobs"))
+    return _job_change_response(
+        job, result, duplicate, "Estado actualizado correctamente", url_for("main.jobs")
+    )
+
+
+@main_bp.route("/jobs/<int:job_id>/notes", methods=["POST"])
+@login_required
+def jobs_notes(job_id):
+    workshop, redirect_response = get_workshop_or_redirect()
+    if redirect_response:
+        return redirect_response
+
+    store, store_redirect = get_store_or_redirect()
+    if store_redirect:
+        return store_redirect
+
+    detail_url = url_for("main.jobs_detail", job_id=job_id)
+    form = JobNotesForm()
+    if not form.validate_on_submit():
+        if _wants_json():
+            return jsonify({"result": "rejected", "errors": form.errors}), 400
+        flash("Las notas no pueden superar los 1000 caracteres", "error")
+        return redirect(detail_url)
+
+    job = Job.query.filter_by(
+        id=job_id, workshop_id=workshop.id, store_id=store.id
+    ).first_or_404()
+
+    result, duplicate = OfflineMutationService.apply_job_change(
+        job,
+        "notes",
+        (form.notes.data or "").strip() or None,
+        "notes",
+        f"Trabajo {job.code}: notas actualizadas",
+        store.id,
+    )
+    return _job_change_response(job, result, duplicate, "Notas actualizadas", detail_url)
+
+
+@main_bp.route("/csrf-token")
+@login_required
+def csrf_token():
+    """Token fresco para que el service worker reenvie la cola offline."""
+    response = jsonify({"csrf_token": generate_csrf()})
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def _wants_json():
+    return request.accept_mimetypes.best == "application/json"
+
+
+def _job_change_response(job, result, duplicate, success_message, next_url):
+    if _wants_json():
+        payload = {
+            "result": result,
+            "duplicate": duplicate,
+            "job": {
+                "id": job.id,
+                "code": job.code,
+                "status": job.status,
+                "notes": job.notes,
+                "version": version_token(job.updated_at),
+            },
+        }
+        return jsonify(payload), 409 if result == "conflict" else 200
+
+    if result == "conflict":
+        flash(
+            f"El trabajo {job.code} cambio mientras tanto; revisa los datos actuales",
+            "warning",
+        )
+    elif not duplicate:
+        flash(success_message, "success")
+    return redirect(next_url)
 
 
 @main_bp.route("/jobs/<int:job_id>/pdf")
 @login_required
+@read_only
 def jobs_pdf(job_id):
     workshop, redirect_response = get_workshop_or_redirect()
     if redirect_response:
@@ -417,15 +495,7 @@ def jobs_pdf(job_id):
         flash("Solo se puede generar PDF para trabajos listos o cerrados", "error")
         return redirect(url_for("main.jobs_detail", job_id=job.id))
 
-    service_total = sum(
-        (item.unit_price or 0) * (item.quantity or 0) for item in job.items
-    )
-    parts_total = sum(
-        (part.unit_price or 0) * (part.quantity or 0) for part in job.parts
-    )
-    total = service_total + parts_total
-
-    buf = generate_job_pdf(job, service_total, parts_total, total)
+    buf = generate_job_pdf(job, *job_totals(job))
     filename = build_pdf_filename(job)
 
     return send_file(
@@ -436,6 +506,66 @@ def jobs_pdf(job_id):
     )
 
 
+@main_bp.route("/jobs/bulk", methods=["POST"])
+@login_required
+def jobs_bulk():
+    workshop, redirect_response = get_workshop_or_redirect()
+    if redirect_response:
+        return redirect_response
+
+    store, store_redirect = get_store_or_redirect()
+    if store_redirect:
+        return store_redirect
+
+    jobs_url = url_for("main.jobs")
+    form = JobBulkForm()
+    if not form.validate_on_submit():
+        for errors in form.errors.values():
+            flash(errors[0], "error")
+            break
+        return redirect(jobs_url)
+
+    job_ids = form.job_ids.data
+    if form.action.data == "pdf":
+        jobs_to_print = [
+            job
+            for job in JobBulkService.printable_jobs(workshop.id, store.id, job_ids)
+            if job.status in ("ready", "closed")
+        ]
+        if not jobs_to_print:
+            flash("Solo se puede generar PDF para trabajos listos o cerrados", "error")
+            return redirect(jobs_url)
+        return send_file(
+            generate_jobs_zip(jobs_to_print),
+            mimetype="application/zip",
+            as_attachment=True,
+            download_name=f"trabajos_{date.today():%Y%m%d}.zip",
+        )
+
+    rows = JobBulkService.load(workshop.id, store.id, job_ids, lock=True)
+    if rows is None:
+        db.session.rollback()
+        flash("Algunos trabajos ya no existen; actualiza el listado", "error")
+        return redirect(jobs_url)
+
+    if form.action.data == "delete":
+        in_progress = [row.code for row in rows if row.status == "in_progress"]
+        if in_progress:
+            db.session.rollback()
+            flash(
+                f"No puedes eliminar trabajos en proceso: {', '.join(in_progress)}",
+                "error",
+            )
+            return redirect(jobs_url)
+        deleted = JobBulkService.delete(workshop.id, store.id, rows)
+        flash(f"{deleted} trabajos eliminados", "success")
+        return redirect(jobs_url)
+
+    changed = JobBulkService.change_status(workshop.id, store.id, rows, form.status.data)
+    flash(f"Estado actualizado en {changed} trabajos", "success")
+    return redirect(jobs_url)
+
+
 @main_bp.route("/jobs/<int:job_id>/delete", methods=["POST"])
 @login_required
 def jobs_delete(job_id):
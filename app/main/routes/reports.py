@@ -0,0 +1,43 @@
+from flask import render_template, request
+from flask_login import login_required
+
+from app.main import main_bp
+from app.database import read_only
+from app.date_ranges import current_month_start, parse_month_start
+from app.main.helpers import get_workshop_or_redirect, owner_or_redirect
+from app.services.status_history_service import StatusHistoryService
+from app.timezone import cordoba_month_bounds_utc
+
+
+TURNAROUND_TARGETS = {
+    "ready": "Listo",
+    "closed": "Cerrado",
+}
+
+
+@main_bp.route("/reports/turnaround")
+@login_required
+@read_only
+def reports_turnaround():
+    _, owner_redirect = owner_or_redirect()
+    if owner_redirect:
+        return owner_redirect
+
+    workshop, redirect_response = get_workshop_or_redirect()
+    if redirect_response:
+        return redirect_response
+
+    month_start = parse_month_start(request.args.get("month"), current_month_start())
+    target = request.args.get("target", "ready")
+    if target not in TURNAROUND_TARGETS:
+        target = "ready"
+
+    start_utc, end_utc = cordoba_month_bounds_utc(month_start)
+    rows = StatusHistoryService.turnaround(workshop.id, start_utc, end_utc, target)
+    return render_template(
+        "main/reports/turnaround.html",
+        rows=rows,
+        month_value=month_start.strftime("%Y-%m"),
+        target=target,
+        targets=TURNAROUND_TARGETS,
+    )
@@ -1,4 +1,3 @@
-import pyotp
 from flask import render_template, request, redirect, url_for, flash, session, current_app
 from flask_login import login_required, current_user
 from app.main import main_bp
@@ -86,6 +85,8 @@ def settings():
 @main_bp.route("/security", methods=["GET", "POST"])
 @login_required
 def security():
+    import pyotp
+
     setup_form = TwoFactorSetupForm()
     disable_form = TwoFactorDisableForm()
     pending_secret = session.get("two_factor_pending_secret")
@@ -44,6 +44,10 @@ class User(UserMixin, db.Model):
 
     store_id = db.Column(db.Integer, db.ForeignKey("stores.id"), nullable=True)
 
+    __table_args__ = (
+        db.Index("ix_users_role_id", "role", "id"),
+    )
+
     workshops = db.relationship(
         "Workshop", secondary=user_workshops, back_populates="users"
     )
@@ -94,6 +98,8 @@ class Workshop(db.Model):
     background_color = db.Column(db.String(20), default="#f6f7fb")
     whatsapp_message_template = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    # Se incrementa en cada commit que toca datos del taller (ver version_service).
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     users = db.relationship(
         "User", secondary=user_workshops, back_populates="workshops"
@@ -127,10 +133,11 @@ class Client(db.Model):
     email = db.Column(db.String(255))
     phone = db.Column(db.String(40))
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     __table_args__ = (
         db.UniqueConstraint("workshop_id", "client_code", name="uq_client_workshop_code"),
-        db.Index("ix_clients_workshop_id", "workshop_id"),
+        db.Index("ix_clients_workshop_full_name", "workshop_id", "full_name", "id"),
     )
 
     bicycles = db.relationship("Bicycle", backref="client", lazy=True)
@@ -173,10 +180,11 @@ class Bicycle(db.Model):
     model = db.Column(db.String(80))
     description = db.Column(db.String(300))
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     __table_args__ = (
-        db.Index("ix_bicycles_workshop_id", "workshop_id"),
         db.Index("ix_bicycles_client_id", "client_id"),
+        db.Index("ix_bicycles_workshop_id_desc", "workshop_id", db.text("id DESC")),
     )
 
     brand_rel = db.relationship("BicycleBrand", backref="bicycles")
@@ -201,6 +209,10 @@ class ServiceType(db.Model):
     job_items = db.relationship("JobItem", backref="service_type", lazy=True)
 
 
+JOB_ACTIVE_STATUSES = ("open", "in_progress", "ready")
+JOB_ACTIVE_STATUSES_SQL = "status IN ('open', 'in_progress', 'ready')"
+
+
 class Job(db.Model):
     __tablename__ = "jobs"
 
@@ -218,6 +230,21 @@ class Job(db.Model):
     __table_args__ = (
         db.Index("ix_jobs_workshop_store_status", "workshop_id", "store_id", "status"),
         db.Index("ix_jobs_estimated_delivery", "estimated_delivery_at"),
+        db.Index(
+            "ix_jobs_workshop_store_created",
+            "workshop_id",
+            "store_id",
+            db.text("created_at DESC"),
+            db.text("id DESC"),
+        ),
+        db.Index(
+            "ix_jobs_active_delivery",
+            "workshop_id",
+            "store_id",
+            "estimated_delivery_at",
+            postgresql_where=db.text(JOB_ACTIVE_STATUSES_SQL),
+            sqlite_where=db.text(JOB_ACTIVE_STATUSES_SQL),
+        ),
     )
 
     items = db.relationship(
@@ -228,6 +255,37 @@ class Job(db.Model):
     )
     store = db.relationship("Store", backref="jobs", lazy=True)
 
+    @classmethod
+    def active_status_clause(cls):
+        """Filtro de estados activos renderizado con literales.
+
+        Con literales el planner puede probar que la consulta cae dentro del
+        indice parcial ``ix_jobs_active_delivery``; con parametros no.
+        """
+        return cls.status.in_(
+            [db.literal(status, literal_execute=True) for status in JOB_ACTIVE_STATUSES]
+        )
+
+
+class WorkshopMonthlyStat(db.Model):
+    """Rollup mensual por taller que alimenta el panel global del super admin."""
+
+    __tablename__ = "workshop_monthly_stats"
+
+    workshop_id = db.Column(
+        db.Integer, db.ForeignKey("workshops.id"), primary_key=True
+    )
+    month = db.Column(db.Date, primary_key=True)
+    jobs_count = db.Column(db.Integer, default=0, nullable=False)
+    service_revenue = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    parts_revenue = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    service_units = db.Column(db.Integer, default=0, nullable=False)
+    refreshed_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.Index("ix_workshop_monthly_stats_month", "month"),
+    )
+
 
 class AuditLog(db.Model):
     __tablename__ = "audit_logs"
@@ -246,6 +304,9 @@ class AuditLog(db.Model):
 
     __table_args__ = (
         db.Index("ix_audit_entity", "entity_type", "entity_id", "action"),
+        db.Index("ix_audit_logs_workshop_created", "workshop_id", "created_at"),
+        db.Index("ix_audit_logs_store_id", "store_id"),
+        db.Index("ix_audit_logs_user_id", "user_id"),
     )
 
     user = db.relationship("User", backref="audit_logs", lazy=True)
@@ -253,6 +314,55 @@ class AuditLog(db.Model):
     store = db.relationship("Store", backref="audit_logs", lazy=True)
 
 
+class JobStatusEvent(db.Model):
+    """Transicion de estado de un trabajo; ``from_status`` es None en el alta."""
+
+    __tablename__ = "job_status_events"
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(
+        db.Integer, db.ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False
+    )
+    workshop_id = db.Column(db.Integer, db.ForeignKey("workshops.id"), nullable=False)
+    store_id = db.Column(db.Integer, db.ForeignKey("stores.id"), nullable=False)
+    from_status = db.Column(db.String(40))
+    to_status = db.Column(db.String(40), nullable=False)
+    at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    # Borrar un usuario conserva el historial sin autor.
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"))
+
+    __table_args__ = (
+        db.Index("ix_job_status_events_store_status_at", "store_id", "to_status", "at"),
+        db.Index("ix_job_status_events_workshop_at", "workshop_id", "at"),
+        db.Index("ix_job_status_events_job_at", "job_id", "at"),
+        db.Index("ix_job_status_events_user_id", "user_id"),
+    )
+
+
+class OfflineMutation(db.Model):
+    """Clave de idempotencia de un cambio enviado desde la cola offline."""
+
+    __tablename__ = "offline_mutations"
+
+    id = db.Column(db.Integer, primary_key=True)
+    workshop_id = db.Column(db.Integer, db.ForeignKey("workshops.id"), nullable=False)
+    # La clave sigue valiendo aunque se borre el usuario que la envio.
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="SET NULL"))
+    job_id = db.Column(db.Integer, nullable=False)
+    idempotency_key = db.Column(db.String(64), nullable=False)
+    action = db.Column(db.String(20), nullable=False)
+    result = db.Column(db.String(20), nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "workshop_id", "idempotency_key", name="uq_offline_mutations_workshop_key"
+        ),
+        db.Index("ix_offline_mutations_created", "created_at"),
+        db.Index("ix_offline_mutations_user_id", "user_id"),
+    )
+
+
 
 
 class JobPart(db.Model):
@@ -1,32 +1,36 @@
 from flask import request
 from flask_login import current_user
+from sqlalchemy import insert
 from sqlalchemy.orm import joinedload
 
 from ..extensions import db
 from ..models import AuditLog
 from ..timezone import now_cordoba_naive, utc_to_cordoba_naive
 
+def _request_fields():
+    ip_value = request.headers.get("X-Forwarded-For", request.remote_addr) or ""
+    ip_address = ip_value.split(",")[0].strip() if ip_value else None
+    user_agent = request.headers.get("User-Agent")
+    return {
+        "user_id": current_user.id if current_user and current_user.is_authenticated else None,
+        "ip_address": ip_address,
+        "user_agent": user_agent[:255] if user_agent else None,
+        "created_at": now_cordoba_naive(),
+    }
+
+
 class AuditService:
     @staticmethod
     def log_action(action, entity_type, entity_id=None, description=None, workshop_id=None, store_id=None):
         """Logs an action to the audit log."""
-        ip_value = request.headers.get("X-Forwarded-For", request.remote_addr) or ""
-        ip_address = ip_value.split(",")[0].strip() if ip_value else None
-        user_agent = request.headers.get("User-Agent")
-        
-        user_id = current_user.id if current_user and current_user.is_authenticated else None
-
         log_entry = AuditLog(
-            user_id=user_id,
             workshop_id=workshop_id,
             store_id=store_id,
             action=action,
             entity_type=entity_type,
             entity_id=entity_id,
             description=description,
-            ip_address=ip_address,
-            user_agent=user_agent[:255] if user_agent else None,
-            created_at=now_cordoba_naive(),
+            **_request_fields(),
         )
         db.session.add(log_entry)
         # Note: We rely on the caller to commit the session, or we could commit here.
@@ -34,6 +38,25 @@ class AuditService:
         # But for an audit log, it might be safer to flush or let the main transaction handle it.
         # We will follow the pattern of adding to session.
 
+    @staticmethod
+    def log_actions(action, entity_type, entries, workshop_id=None, store_id=None):
+        """Logs several ``(entity_id, description)`` entries with one multi-row insert."""
+        shared = _request_fields()
+        rows = [
+            {
+                **shared,
+                "workshop_id": workshop_id,
+                "store_id": store_id,
+                "action": action,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "description": description,
+            }
+            for entity_id, description in entries
+        ]
+        if rows:
+            db.session.execute(insert(AuditLog), rows)
+
     @staticmethod
     def get_audit_info(entity_type, entity_id, fallback_created_at=None, update_entity_types=None):
         """Retrieves creation and update info for an entity from the audit log."""
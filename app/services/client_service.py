@@ -131,12 +131,12 @@ class ClientService:
     def import_clients_csv(workshop_id, file_storage):
         data = file_storage.read()
         try:
-            content = data.decode("utf-8")
+            content = data.decode("utf-8-sig")
         except UnicodeDecodeError:
             logger.warning(
                 "CSV clientes: encoding no valido, usando fallback con errors=ignore"
             )
-            content = data.decode("utf-8", errors="ignore")
+            content = data.decode("utf-8-sig", errors="ignore")
 
         reader = csv.DictReader(StringIO(content))
         if not reader.fieldnames:
@@ -195,12 +195,12 @@ class ClientService:
     def import_bicycles_csv(workshop_id, file_storage):
         data = file_storage.read()
         try:
-            content = data.decode("utf-8")
+            content = data.decode("utf-8-sig")
         except UnicodeDecodeError:
             logger.warning(
                 "CSV bicicletas: encoding no valido, usando fallback con errors=ignore"
             )
-            content = data.decode("utf-8", errors="ignore")
+            content = data.decode("utf-8-sig", errors="ignore")
 
         reader = csv.DictReader(StringIO(content))
         if not reader.fieldnames:
@@ -0,0 +1,143 @@
+"""Acciones sobre varios trabajos en una sola transaccion.
+
+Los ids se validan con una consulta acotada al taller y la sucursal; los
+cambios van como UPDATE/DELETE por conjunto y la auditoria como un insert
+multi-fila. Como esas sentencias no pasan por el flush de la sesion, los
+efectos que normalmente arman los listeners (version del taller, rollup
+mensual, historial de estados y eventos en vivo) se encolan a mano.
+"""
+
+from datetime import datetime, timezone
+
+from flask_login import current_user
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import joinedload, selectinload
+
+from ..extensions import db
+from ..models import Bicycle, Job, JobItem, JobPart
+from .audit_service import AuditService
+from .job_event_service import JobEventService
+from .stats_service import StatsService
+from .status_history_service import StatusHistoryService
+from .version_service import VersionService
+
+
+class JobBulkService:
+    @staticmethod
+    def load(workshop_id, store_id, job_ids, lock=False):
+        """Filas ``(id, code, status, created_at)`` de los trabajos pedidos.
+
+        Devuelve ``None`` si algun id no existe en la sucursal: la accion se
+        aplica a todos o a ninguno.
+        """
+        job_ids = set(job_ids)
+        query = (
+            select(Job.id, Job.code, Job.status, Job.created_at)
+            .where(
+                Job.id.in_(job_ids),
+                Job.workshop_id == workshop_id,
+                Job.store_id == store_id,
+            )
+            .order_by(Job.id)
+        )
+        if lock:
+            query = query.with_for_update()
+        rows = db.session.execute(query).all()
+        if len(rows) != len(job_ids):
+            return None
+        return rows
+
+    @staticmethod
+    def change_status(workshop_id, store_id, rows, status):
+        """Pasa los trabajos a ``status``; devuelve cuantos cambiaron."""
+        changed = [row for row in rows if row.status != status]
+        if not changed:
+            return 0
+
+        session = db.session()
+        changed_ids = [row.id for row in changed]
+        db.session.execute(
+            update(Job)
+            .where(Job.id.in_(changed_ids))
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        AuditService.log_actions(
+            "update",
+            "job",
+            [(row.id, f"Trabajo {row.code} -> {status}") for row in changed],
+            workshop_id=workshop_id,
+            store_id=store_id,
+        )
+        now = datetime.now(timezone.utc)
+        StatusHistoryService.record(
+            [(row.id, workshop_id, store_id, row.status, status, now) for row in changed],
+            user_id=_user_id(),
+        )
+        JobEventService.mark_pending(
+            session,
+            [
+                JobEventService.build_event("status", row.id, workshop_id, store_id, status, row.code)
+                for row in changed
+            ],
+        )
+        VersionService.mark_pending(session, [workshop_id])
+        db.session.commit()
+        return len(changed)
+
+    @staticmethod
+    def delete(workshop_id, store_id, rows):
+        """Elimina los trabajos con sus items y repuestos."""
+        session = db.session()
+        job_ids = [row.id for row in rows]
+        StatsService.mark_deleted_jobs(session, workshop_id, rows)
+        db.session.execute(delete(JobItem).where(JobItem.job_id.in_(job_ids)))
+        db.session.execute(delete(JobPart).where(JobPart.job_id.in_(job_ids)))
+        db.session.execute(
+            delete(Job)
+            .where(Job.id.in_(job_ids))
+            .execution_options(synchronize_session=False)
+        )
+        AuditService.log_actions(
+            "delete",
+            "job",
+            [(row.id, f"Trabajo {row.code}") for row in rows],
+            workshop_id=workshop_id,
+            store_id=store_id,
+        )
+        JobEventService.mark_pending(
+            session,
+            [
+                JobEventService.build_event(
+                    "deleted", row.id, workshop_id, store_id, row.status, row.code
+                )
+                for row in rows
+            ],
+        )
+        VersionService.mark_pending(session, [workshop_id])
+        db.session.commit()
+        return len(rows)
+
+    @staticmethod
+    def printable_jobs(workshop_id, store_id, job_ids):
+        """Trabajos con todo lo que usa el PDF, sin consultas por trabajo."""
+        return (
+            Job.query.filter(
+                Job.id.in_(job_ids),
+                Job.workshop_id == workshop_id,
+                Job.store_id == store_id,
+            )
+            .options(
+                joinedload(Job.workshop),
+                joinedload(Job.bicycle).joinedload(Bicycle.client),
+                joinedload(Job.bicycle).joinedload(Bicycle.brand_rel),
+                selectinload(Job.items).joinedload(JobItem.service_type),
+                selectinload(Job.parts),
+            )
+            .order_by(Job.id)
+            .all()
+        )
+
+
+def _user_id():
+    return current_user.id if current_user.is_authenticated else None
@@ -0,0 +1,123 @@
+import json
+import time
+from itertools import chain
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect, select
+
+from ..extensions import db
+from ..job_events import NOTIFY_CHANNEL
+from ..models import Job, JobItem, JobPart
+
+
+_PENDING_EVENTS_KEY = "job_events_pending"
+_PENDING_ITEM_JOBS_KEY = "job_events_pending_item_jobs"
+_PUBLISH_KEY = "job_events_publish"
+
+
+class JobEventService:
+    """Eventos ``created``/``updated``/``status``/``deleted`` de trabajos.
+
+    Se arman a partir de las escrituras de la sesion, asi cubren JobService,
+    ``jobs_status`` y la cola offline sin llamadas explicitas. Solo llevan
+    ids y estado: el cliente pide el HTML de la fila afectada.
+    """
+
+    @staticmethod
+    def build_event(kind, job_id, workshop_id, store_id, status, code):
+        return {
+            "id": time.time_ns(),
+            "type": kind,
+            "job_id": job_id,
+            "workshop_id": workshop_id,
+            "store_id": store_id,
+            "status": status,
+            "code": code,
+        }
+
+    @staticmethod
+    def mark_pending(session, events):
+        """Encola eventos de escrituras en bloque, que no pasan por el flush."""
+        pending = session.info.setdefault(_PENDING_EVENTS_KEY, {})
+        for job_event in events:
+            pending[job_event["job_id"]] = job_event
+
+    @staticmethod
+    def publish_local(events):
+        if not events or not has_app_context():
+            return
+        broker = current_app.extensions.get("job_events")
+        if broker is None:
+            return
+        for job_event in events:
+            broker.publish(job_event)
+
+
+def _job_event(kind, job):
+    return JobEventService.build_event(
+        kind, job.id, job.workshop_id, job.store_id, job.status, job.code
+    )
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_job_events(session, flush_context):
+    pending = session.info.setdefault(_PENDING_EVENTS_KEY, {})
+    item_jobs = session.info.setdefault(_PENDING_ITEM_JOBS_KEY, set())
+    for obj in session.new:
+        if isinstance(obj, Job):
+            pending[obj.id] = _job_event("created", obj)
+    for obj in session.deleted:
+        if isinstance(obj, Job):
+            pending[obj.id] = _job_event("deleted", obj)
+    for obj in session.dirty:
+        if not isinstance(obj, Job) or not session.is_modified(obj, include_collections=False):
+            continue
+        previous = pending.get(obj.id)
+        if previous and previous["type"] in ("created", "deleted", "status"):
+            continue
+        kind = "status" if inspect(obj).attrs.status.history.has_changes() else "updated"
+        pending[obj.id] = _job_event(kind, obj)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (JobItem, JobPart)) and obj.job_id is not None:
+            item_jobs.add(obj.job_id)
+
+
+@event.listens_for(db.session, "before_commit")
+def _notify_job_events(session):
+    session.flush()
+    pending = session.info.pop(_PENDING_EVENTS_KEY, {})
+    item_jobs = session.info.pop(_PENDING_ITEM_JOBS_KEY, set()) - set(pending)
+    if item_jobs:
+        rows = session.execute(
+            select(Job.id, Job.workshop_id, Job.store_id, Job.status, Job.code).where(
+                Job.id.in_(item_jobs)
+            )
+        )
+        for job_id, workshop_id, store_id, status, code in rows:
+            pending[job_id] = JobEventService.build_event(
+                "updated", job_id, workshop_id, store_id, status, code
+            )
+    if not pending:
+        return
+
+    events = list(pending.values())
+    if session.get_bind(mapper=inspect(Job)).dialect.name == "postgresql":
+        # NOTIFY se entrega al confirmar la transaccion, tambien a este worker.
+        for job_event in events:
+            session.execute(
+                select(func.pg_notify(NOTIFY_CHANNEL, json.dumps(job_event, separators=(",", ":"))))
+            )
+    else:
+        session.info[_PUBLISH_KEY] = events
+
+
+@event.listens_for(db.session, "after_commit")
+def _publish_job_events(session):
+    JobEventService.publish_local(session.info.pop(_PUBLISH_KEY, None))
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_job_events(session):
+    session.info.pop(_PENDING_EVENTS_KEY, None)
+    session.info.pop(_PENDING_ITEM_JOBS_KEY, None)
+    session.info.pop(_PUBLISH_KEY, None)
@@ -0,0 +1,105 @@
+import logging
+import os
+import resource
+import threading
+import tracemalloc
+
+
+logger = logging.getLogger("memory")
+
+TRACE_FRAMES = 15
+_IGNORED_FILES = (
+    tracemalloc.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+    "<unknown>",
+)
+
+
+def current_rss_bytes() -> int:
+    """RSS actual del proceso; cae al pico (ru_maxrss) si no hay /proc."""
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryService:
+    """Snapshots de tracemalloc por proceso para encontrar allocations que crecen.
+
+    Cada worker de gunicorn tiene su propio estado: la base y la comparacion
+    tienen que tomarse en el mismo pid.
+    """
+
+    _lock = threading.Lock()
+    _baseline = None
+
+    @staticmethod
+    def status():
+        traced, peak = tracemalloc.get_traced_memory()
+        return {
+            "pid": os.getpid(),
+            "rss_bytes": current_rss_bytes(),
+            "tracing": tracemalloc.is_tracing(),
+            "traced_bytes": traced,
+            "peak_bytes": peak,
+            "has_baseline": MemoryService._baseline is not None,
+        }
+
+    @staticmethod
+    def start():
+        with MemoryService._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACE_FRAMES)
+            MemoryService._baseline = None
+        logger.info("tracemalloc iniciado en pid %s", os.getpid())
+
+    @staticmethod
+    def stop():
+        with MemoryService._lock:
+            MemoryService._baseline = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+        logger.info("tracemalloc detenido en pid %s", os.getpid())
+
+    @staticmethod
+    def take_baseline():
+        if not tracemalloc.is_tracing():
+            return False
+        with MemoryService._lock:
+            MemoryService._baseline = MemoryService._snapshot()
+        return True
+
+    @staticmethod
+    def top_growth(limit=20):
+        """Sitios de allocation que mas crecieron desde la base, con su traza."""
+        if not tracemalloc.is_tracing() or MemoryService._baseline is None:
+            return []
+        current = MemoryService._snapshot()
+        stats = current.compare_to(MemoryService._baseline, "traceback")
+        growth = []
+        for stat in stats:
+            if stat.size_diff <= 0:
+                continue
+            growth.append(
+                {
+                    "size_diff": stat.size_diff,
+                    "size": stat.size,
+                    "count_diff": stat.count_diff,
+                    "traceback": [
+                        f"{frame.filename}:{frame.lineno}"
+                        for frame in reversed(stat.traceback)
+                    ],
+                }
+            )
+            if len(growth) >= limit:
+                break
+        return growth
+
+    @staticmethod
+    def _snapshot():
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES]
+        )
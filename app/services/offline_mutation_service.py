@@ -0,0 +1,109 @@
+"""Cambios de trabajos que pueden llegar repetidos desde la cola offline.
+
+El service worker reenvia los POST encolados con la misma ``idempotency_key``
+hasta recibir respuesta; cada clave se aplica (y se audita) una sola vez por
+taller. ``base_version`` es el ``updated_at`` que tenia el trabajo cuando se
+hizo el cambio: si el servidor ya tiene una version posterior con otro valor,
+el cambio no se aplica y se informa como conflicto.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from flask import request
+from flask_login import current_user
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models import OfflineMutation
+from .audit_service import AuditService
+
+
+KEY_MAX_LENGTH = 64
+
+
+def version_token(updated_at):
+    """``updated_at`` serializado igual en formularios y en la comparacion."""
+    if updated_at is None:
+        return ""
+    return updated_at.replace(tzinfo=None).isoformat(timespec="microseconds")
+
+
+class OfflineMutationService:
+    @staticmethod
+    def request_key():
+        raw = request.headers.get("Idempotency-Key") or request.form.get("idempotency_key")
+        key = (raw or "").strip()
+        if not key or len(key) > KEY_MAX_LENGTH:
+            return None
+        return key
+
+    @staticmethod
+    def prune(days):
+        """Borra claves viejas: la cola offline no reenvia despues de tantos dias."""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        deleted = OfflineMutation.query.filter(OfflineMutation.created_at < cutoff).delete(
+            synchronize_session=False
+        )
+        db.session.commit()
+        return deleted
+
+    @staticmethod
+    def find(workshop_id, key):
+        return OfflineMutation.query.filter_by(
+            workshop_id=workshop_id, idempotency_key=key
+        ).first()
+
+    @staticmethod
+    def is_conflict(job, field, value, base_version):
+        if not base_version or getattr(job, field) == value:
+            return False
+        return base_version != version_token(job.updated_at)
+
+    @staticmethod
+    def apply_job_change(job, field, value, action, description, store_id):
+        """Aplica ``job.<field> = value`` una vez por clave.
+
+        Devuelve ``(result, duplicate)`` con result ``applied`` o ``conflict``.
+        """
+        key = OfflineMutationService.request_key()
+        if key:
+            previous = OfflineMutationService.find(job.workshop_id, key)
+            if previous is not None:
+                return previous.result, True
+
+        base_version = (request.form.get("base_version") or "").strip()
+        if OfflineMutationService.is_conflict(job, field, value, base_version):
+            result = "conflict"
+        else:
+            result = "applied"
+            setattr(job, field, value)
+            AuditService.log_action(
+                "update",
+                "job",
+                job.id,
+                description,
+                workshop_id=job.workshop_id,
+                store_id=store_id,
+            )
+
+        if key:
+            db.session.add(
+                OfflineMutation(
+                    workshop_id=job.workshop_id,
+                    user_id=current_user.id if current_user.is_authenticated else None,
+                    job_id=job.id,
+                    idempotency_key=key,
+                    action=action,
+                    result=result,
+                )
+            )
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Dos reenvios simultaneos de la misma clave: gana el primero.
+            db.session.rollback()
+            previous = OfflineMutationService.find(job.workshop_id, key) if key else None
+            if previous is None:
+                raise
+            return previous.result, True
+        return result, False
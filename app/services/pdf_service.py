@@ -1,22 +1,11 @@
+from functools import lru_cache
 from io import BytesIO
 from decimal import Decimal
 import logging
+import zipfile
 from typing import Optional
 from xml.sax.saxutils import escape
 
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.lib import colors
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Table,
-    TableStyle,
-    Paragraph,
-    Spacer,
-)
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_RIGHT, TA_CENTER
-
 from app.timezone import now_cordoba_naive
 
 
@@ -65,64 +54,87 @@ def _safe_paragraph_text(value: object) -> str:
     return escape(str(value))
 
 
-def generate_job_pdf(job, service_total, parts_total, total):
-    """Genera un PDF con el detalle del trabajo y lo retorna como BytesIO."""
-    try:
-        buf = BytesIO()
-        pdf_title = build_pdf_filename(job).replace(".pdf", "")
-        doc = SimpleDocTemplate(
-            buf,
-            pagesize=A4,
-            topMargin=20 * mm,
-            bottomMargin=15 * mm,
-            leftMargin=18 * mm,
-            rightMargin=18 * mm,
-            title=pdf_title,
-            author=job.workshop.name if job.workshop else "Taller",
-        )
+PDF_FONTS = ("Helvetica", "Helvetica-Bold")
+
 
-        styles = getSampleStyleSheet()
-        style_title = ParagraphStyle(
+@lru_cache(maxsize=1)
+def pdf_styles():
+    """Estilos de parrafo del PDF; se arman una vez por proceso y se reutilizan."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import mm
+
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
             "PDFTitle",
             parent=styles["Heading1"],
             fontSize=18,
             spaceAfter=2 * mm,
             textColor=colors.HexColor("#1f4cff"),
-        )
-        style_subtitle = ParagraphStyle(
+        ),
+        "subtitle": ParagraphStyle(
             "PDFSubtitle",
             parent=styles["Normal"],
             fontSize=10,
             textColor=colors.HexColor("#6b7280"),
             spaceAfter=6 * mm,
-        )
-        style_section = ParagraphStyle(
+        ),
+        "section": ParagraphStyle(
             "PDFSection",
             parent=styles["Heading2"],
             fontSize=12,
             spaceBefore=6 * mm,
             spaceAfter=3 * mm,
             textColor=colors.HexColor("#10162f"),
+        ),
+        "normal": styles["Normal"],
+    }
+
+
+def preload_pdf_resources():
+    """Carga reportlab, los estilos y las metricas de fuentes antes del primer PDF."""
+    from reportlab.pdfbase import pdfmetrics
+
+    pdf_styles()
+    for font_name in PDF_FONTS:
+        pdfmetrics.getFont(font_name)
+
+
+def generate_job_pdf(job, service_total, parts_total, total):
+    """Genera un PDF con el detalle del trabajo y lo retorna como BytesIO."""
+    # reportlab.platypus es la dependencia mas pesada del arranque; se carga
+    # recien cuando se pide el primer PDF.
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.lib import colors
+    from reportlab.platypus import (
+        SimpleDocTemplate,
+        Table,
+        TableStyle,
+        Paragraph,
+        Spacer,
+    )
+
+    try:
+        buf = BytesIO()
+        pdf_title = build_pdf_filename(job).replace(".pdf", "")
+        doc = SimpleDocTemplate(
+            buf,
+            pagesize=A4,
+            topMargin=20 * mm,
+            bottomMargin=15 * mm,
+            leftMargin=18 * mm,
+            rightMargin=18 * mm,
+            title=pdf_title,
+            author=job.workshop.name if job.workshop else "Taller",
         )
-        style_normal = styles["Normal"]
-        style_right = ParagraphStyle(
-            "RightAligned", parent=styles["Normal"], alignment=TA_RIGHT
-        )
-        style_total_label = ParagraphStyle(
-            "TotalLabel",
-            parent=styles["Normal"],
-            fontSize=11,
-            fontName="Helvetica-Bold",
-            alignment=TA_RIGHT,
-        )
-        style_total_value = ParagraphStyle(
-            "TotalValue",
-            parent=styles["Normal"],
-            fontSize=11,
-            fontName="Helvetica-Bold",
-            alignment=TA_RIGHT,
-            textColor=colors.HexColor("#1f4cff"),
-        )
+
+        styles = pdf_styles()
+        style_title = styles["title"]
+        style_subtitle = styles["subtitle"]
+        style_section = styles["section"]
+        style_normal = styles["normal"]
 
         elements = []
 
@@ -280,6 +292,28 @@ def generate_job_pdf(job, service_total, parts_total, total):
         raise
 
 
+def job_totals(job):
+    """Totales de services, repuestos y general de un trabajo."""
+    service_total = sum(
+        (item.unit_price or 0) * (item.quantity or 0) for item in job.items
+    )
+    parts_total = sum(
+        (part.unit_price or 0) * (part.quantity or 0) for part in job.parts
+    )
+    return service_total, parts_total, service_total + parts_total
+
+
+def generate_jobs_zip(jobs):
+    """Genera un ZIP con el PDF de cada trabajo y lo retorna como BytesIO."""
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        for job in jobs:
+            pdf = generate_job_pdf(job, *job_totals(job))
+            archive.writestr(build_pdf_filename(job), pdf.getvalue())
+    buf.seek(0)
+    return buf
+
+
 def build_pdf_filename(job):
     """Construye el nombre de archivo: Codigo_MesDD_nombre_cliente.pdf"""
     month_names = {
@@ -0,0 +1,523 @@
+import logging
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from itertools import chain
+
+from sqlalchemy import and_, delete, event, func, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..extensions import db
+from ..date_ranges import month_bucket
+from ..models import (
+    AuditLog,
+    Job,
+    JobItem,
+    JobPart,
+    Store,
+    WorkshopMonthlyStat,
+    user_workshops,
+)
+from ..timezone import cordoba_month_bounds_utc, utc_to_cordoba_naive
+
+
+logger = logging.getLogger("stats_service")
+
+# (taller, mes) que se recalculan completos (trabajos que cambian de mes).
+_PENDING_MONTHS_KEY = "monthly_stats_pending_months"
+# (taller, mes) -> [trabajos, services, repuestos, unidades] a sumar al commit.
+_PENDING_DELTAS_KEY = "monthly_stats_pending_deltas"
+# id de trabajo -> [services, repuestos, unidades] de items y repuestos tocados.
+_PENDING_JOB_DELTAS_KEY = "monthly_stats_pending_job_deltas"
+# id de trabajo borrado -> (taller, mes), para ubicar a sus items borrados.
+_DELETED_JOB_MONTHS_KEY = "monthly_stats_deleted_job_months"
+
+_STAT_COLUMNS = ("jobs_count", "service_revenue", "parts_revenue", "service_units")
+
+
+def job_month(created_at: datetime | None) -> date | None:
+    """Mes (hora de Cordoba) al que pertenece un trabajo segun su alta."""
+    local_value = utc_to_cordoba_naive(created_at)
+    if local_value is None:
+        return None
+    return local_value.date().replace(day=1)
+
+
+def _as_month(value) -> date:
+    if isinstance(value, datetime):
+        return value.date().replace(day=1)
+    return value.replace(day=1)
+
+
+def _decimal(value):
+    return Decimal(str(value or 0))
+
+
+def _add(totals, key, values):
+    current = totals.setdefault(key, [0] * len(values))
+    for index, value in enumerate(values):
+        current[index] += value
+
+
+def _upsert(values, on_conflict):
+    """INSERT de la fila del rollup; si ya existe aplica ``on_conflict(excluded)``."""
+    dialect = db.session.get_bind().dialect.name
+    insert_for = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    statement = insert_for(WorkshopMonthlyStat).values(**values)
+    return statement.on_conflict_do_update(
+        index_elements=[WorkshopMonthlyStat.workshop_id, WorkshopMonthlyStat.month],
+        set_=on_conflict(statement.excluded),
+    )
+
+
+def _month_row(workshop_id, month_value):
+    return and_(
+        WorkshopMonthlyStat.workshop_id == workshop_id,
+        WorkshopMonthlyStat.month == month_value,
+    )
+
+
+class StatsService:
+    @staticmethod
+    def mark_deleted_jobs(session, workshop_id, rows):
+        """Descuenta del rollup trabajos que se borran por conjunto (sin flush).
+
+        ``rows`` tiene ``id`` y ``created_at``; hay que llamarlo antes del DELETE
+        porque suma los items y repuestos que todavia existen.
+        """
+        job_ids = [row.id for row in rows]
+        if not job_ids:
+            return
+        services = {
+            job_id: (_decimal(revenue), int(units or 0))
+            for job_id, revenue, units in session.query(
+                JobItem.job_id,
+                func.sum(JobItem.unit_price * JobItem.quantity),
+                func.sum(JobItem.quantity),
+            )
+            .filter(JobItem.job_id.in_(job_ids))
+            .group_by(JobItem.job_id)
+        }
+        parts = dict(
+            session.query(JobPart.job_id, func.sum(JobPart.unit_price * JobPart.quantity))
+            .filter(JobPart.job_id.in_(job_ids))
+            .group_by(JobPart.job_id)
+            .all()
+        )
+        deltas = session.info.setdefault(_PENDING_DELTAS_KEY, {})
+        for row in rows:
+            service_revenue, service_units = services.get(row.id, (Decimal("0"), 0))
+            _add(
+                deltas,
+                (workshop_id, job_month(row.created_at)),
+                (-1, -service_revenue, -_decimal(parts.get(row.id)), -service_units),
+            )
+
+    @staticmethod
+    def apply_month_delta(workshop_id, month_start, delta):
+        """Suma ``delta`` (trabajos, services, repuestos, unidades) a la fila del mes.
+
+        Es un UPDATE de incremento, asi que dos commits concurrentes del mismo
+        mes no se pisan. Si la fila no existe todavia se arma con el recalculo
+        completo del mes; si otro commit la crea en paralelo, el conflicto suma
+        el delta propio en lugar de fallar.
+        """
+        month_value = month_start.replace(day=1)
+        increments = {
+            column: getattr(WorkshopMonthlyStat, column) + value
+            for column, value in zip(_STAT_COLUMNS, delta)
+        }
+        refreshed_at = datetime.now(timezone.utc)
+        updated = db.session.execute(
+            update(WorkshopMonthlyStat)
+            .where(_month_row(workshop_id, month_value))
+            .values(refreshed_at=refreshed_at, **increments)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not updated:
+            totals = StatsService._month_totals(workshop_id, month_value)
+            if totals["jobs_count"]:
+                db.session.execute(
+                    _upsert(
+                        {
+                            "workshop_id": workshop_id,
+                            "month": month_value,
+                            "refreshed_at": refreshed_at,
+                            **totals,
+                        },
+                        lambda excluded: {
+                            "refreshed_at": excluded.refreshed_at,
+                            **increments,
+                        },
+                    )
+                )
+        elif delta[0] < 0:
+            db.session.execute(
+                delete(WorkshopMonthlyStat).where(
+                    _month_row(workshop_id, month_value),
+                    WorkshopMonthlyStat.jobs_count <= 0,
+                )
+            )
+
+    @staticmethod
+    def refresh_workshop_month(workshop_id, month_start):
+        """Recalcula la fila del rollup de un taller para un mes."""
+        month_value = month_start.replace(day=1)
+        totals = StatsService._month_totals(workshop_id, month_value)
+        if not totals["jobs_count"]:
+            db.session.execute(
+                delete(WorkshopMonthlyStat).where(_month_row(workshop_id, month_value))
+            )
+            return
+        db.session.execute(
+            _upsert(
+                {
+                    "workshop_id": workshop_id,
+                    "month": month_value,
+                    "refreshed_at": datetime.now(timezone.utc),
+                    **totals,
+                },
+                lambda excluded: {
+                    column: getattr(excluded, column)
+                    for column in _STAT_COLUMNS + ("refreshed_at",)
+                },
+            )
+        )
+
+    @staticmethod
+    def _month_totals(workshop_id, month_start):
+        start_utc, end_utc = cordoba_month_bounds_utc(month_start)
+        job_filters = (
+            Job.workshop_id == workshop_id,
+            Job.created_at >= start_utc,
+            Job.created_at < end_utc,
+        )
+        jobs_count = db.session.query(func.count(Job.id)).filter(*job_filters).scalar() or 0
+        service_revenue, service_units = (
+            db.session.query(
+                func.coalesce(func.sum(JobItem.unit_price * JobItem.quantity), 0),
+                func.coalesce(func.sum(JobItem.quantity), 0),
+            )
+            .join(Job, Job.id == JobItem.job_id)
+            .filter(*job_filters)
+            .one()
+        )
+        parts_revenue = (
+            db.session.query(
+                func.coalesce(func.sum(JobPart.unit_price * JobPart.quantity), 0)
+            )
+            .join(Job, Job.id == JobPart.job_id)
+            .filter(*job_filters)
+            .scalar()
+        )
+        return {
+            "jobs_count": jobs_count,
+            "service_revenue": _decimal(service_revenue),
+            "parts_revenue": _decimal(parts_revenue),
+            "service_units": int(service_units or 0),
+        }
+
+    @staticmethod
+    def refresh_range(first_month, last_month, workshop_id=None):
+        """Reconstruye el rollup de todos los talleres (o de uno) entre dos meses.
+
+        Usa tres consultas agrupadas por taller y mes, sin importar cuantos
+        talleres o meses abarque el rango. Devuelve la cantidad de filas escritas.
+        """
+        start_utc, _ = cordoba_month_bounds_utc(first_month)
+        _, end_utc = cordoba_month_bounds_utc(last_month)
+        bucket = month_bucket(Job.created_at)
+        job_filters = [Job.created_at >= start_utc, Job.created_at < end_utc]
+        if workshop_id is not None:
+            job_filters.append(Job.workshop_id == workshop_id)
+
+        totals = {}
+
+        def _row(key):
+            return totals.setdefault(
+                key,
+                {
+                    "jobs_count": 0,
+                    "service_revenue": Decimal("0"),
+                    "parts_revenue": Decimal("0"),
+                    "service_units": 0,
+                },
+            )
+
+        for row_workshop_id, month_value, jobs_count in (
+            db.session.query(Job.workshop_id, bucket, func.count(Job.id))
+            .filter(*job_filters)
+            .group_by(Job.workshop_id, bucket)
+            .all()
+        ):
+            _row((row_workshop_id, _as_month(month_value)))["jobs_count"] = jobs_count
+
+        for row_workshop_id, month_value, revenue, units in (
+            db.session.query(
+                Job.workshop_id,
+                bucket,
+                func.coalesce(func.sum(JobItem.unit_price * JobItem.quantity), 0),
+                func.coalesce(func.sum(JobItem.quantity), 0),
+            )
+            .join(Job, Job.id == JobItem.job_id)
+            .filter(*job_filters)
+            .group_by(Job.workshop_id, bucket)
+            .all()
+        ):
+            row = _row((row_workshop_id, _as_month(month_value)))
+            row["service_revenue"] = Decimal(str(revenue or 0))
+            row["service_units"] = int(units or 0)
+
+        for row_workshop_id, month_value, revenue in (
+            db.session.query(
+                Job.workshop_id,
+                bucket,
+                func.coalesce(func.sum(JobPart.unit_price * JobPart.quantity), 0),
+            )
+            .join(Job, Job.id == JobPart.job_id)
+            .filter(*job_filters)
+            .group_by(Job.workshop_id, bucket)
+            .all()
+        ):
+            _row((row_workshop_id, _as_month(month_value)))["parts_revenue"] = Decimal(
+                str(revenue or 0)
+            )
+
+        stale_rows = delete(WorkshopMonthlyStat).where(
+            WorkshopMonthlyStat.month >= first_month.replace(day=1),
+            WorkshopMonthlyStat.month <= last_month.replace(day=1),
+        )
+        if workshop_id is not None:
+            stale_rows = stale_rows.where(WorkshopMonthlyStat.workshop_id == workshop_id)
+        db.session.execute(stale_rows)
+
+        refreshed_at = datetime.now(timezone.utc)
+        values = [
+            {
+                "workshop_id": row_workshop_id,
+                "month": month_value,
+                "refreshed_at": refreshed_at,
+                **row,
+            }
+            for (row_workshop_id, month_value), row in totals.items()
+            if row["jobs_count"]
+        ]
+        if values:
+            db.session.execute(insert(WorkshopMonthlyStat), values)
+        db.session.commit()
+        logger.info(
+            "refresh_range: %s fila(s) entre %s y %s", len(values), first_month, last_month
+        )
+        return len(values)
+
+    @staticmethod
+    def platform_monthly_totals(first_month, last_month):
+        """Totales de la plataforma por mes, leidos del rollup en una consulta."""
+        rows = (
+            db.session.query(
+                WorkshopMonthlyStat.month,
+                func.sum(WorkshopMonthlyStat.jobs_count),
+                func.sum(WorkshopMonthlyStat.service_revenue),
+                func.sum(WorkshopMonthlyStat.parts_revenue),
+                func.sum(WorkshopMonthlyStat.service_units),
+            )
+            .filter(
+                WorkshopMonthlyStat.month >= first_month,
+                WorkshopMonthlyStat.month <= last_month,
+            )
+            .group_by(WorkshopMonthlyStat.month)
+            .all()
+        )
+        return {
+            month_value: {
+                "jobs_count": int(jobs_count or 0),
+                "service_revenue": Decimal(str(service_revenue or 0)),
+                "parts_revenue": Decimal(str(parts_revenue or 0)),
+                "service_units": int(service_units or 0),
+            }
+            for month_value, jobs_count, service_revenue, parts_revenue, service_units in rows
+        }
+
+    @staticmethod
+    def owner_usage(owner_ids, month_start):
+        """Uso por owner (talleres, sucursales, trabajos del mes, ultima actividad).
+
+        Una sola consulta agrupada por owner para los ids de la pagina actual;
+        los trabajos del mes salen del rollup mensual.
+        """
+        if not owner_ids:
+            return {}
+        page_workshops = select(user_workshops.c.workshop_id).where(
+            user_workshops.c.user_id.in_(owner_ids)
+        )
+        stores = (
+            select(Store.workshop_id, func.count(Store.id).label("stores_count"))
+            .where(Store.workshop_id.in_(page_workshops))
+            .group_by(Store.workshop_id)
+            .subquery()
+        )
+        activity = (
+            select(
+                AuditLog.workshop_id,
+                func.max(AuditLog.created_at).label("last_activity_at"),
+            )
+            .where(AuditLog.workshop_id.in_(page_workshops))
+            .group_by(AuditLog.workshop_id)
+            .subquery()
+        )
+        rows = (
+            db.session.query(
+                user_workshops.c.user_id,
+                func.count(user_workshops.c.workshop_id),
+                func.coalesce(func.sum(stores.c.stores_count), 0),
+                func.coalesce(func.sum(WorkshopMonthlyStat.jobs_count), 0),
+                func.max(activity.c.last_activity_at),
+            )
+            .outerjoin(stores, stores.c.workshop_id == user_workshops.c.workshop_id)
+            .outerjoin(
+                WorkshopMonthlyStat,
+                and_(
+                    WorkshopMonthlyStat.workshop_id == user_workshops.c.workshop_id,
+                    WorkshopMonthlyStat.month == month_start,
+                ),
+            )
+            .outerjoin(activity, activity.c.workshop_id == user_workshops.c.workshop_id)
+            .filter(user_workshops.c.user_id.in_(owner_ids))
+            .group_by(user_workshops.c.user_id)
+            .all()
+        )
+        return {
+            user_id: {
+                "workshops_count": int(workshops_count or 0),
+                "stores_count": int(stores_count or 0),
+                "jobs_month": int(jobs_month or 0),
+                "last_activity_at": last_activity_at,
+            }
+            for user_id, workshops_count, stores_count, jobs_month, last_activity_at in rows
+        }
+
+
+def _previous(state, name):
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.obj(), name)
+
+
+def _changed(state, names):
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+
+def _line_amounts(obj, values):
+    quantity, unit_price, _ = values
+    amount = _decimal(unit_price) * int(quantity or 0)
+    if isinstance(obj, JobItem):
+        return (amount, Decimal("0"), int(quantity or 0))
+    return (Decimal("0"), amount, 0)
+
+
+@event.listens_for(db.session, "after_flush")
+def _track_job_changes(session, flush_context):
+    # Cada flush acumula deltas por (taller, mes) y por trabajo; al confirmar
+    # se aplican como UPDATE de incremento. Los cambios de estado no afectan
+    # el rollup. Un trabajo que cambia de taller o de mes recalcula ambos meses.
+    months = session.info.setdefault(_PENDING_MONTHS_KEY, set())
+    deltas = session.info.setdefault(_PENDING_DELTAS_KEY, {})
+    job_deltas = session.info.setdefault(_PENDING_JOB_DELTAS_KEY, {})
+    deleted_jobs = session.info.setdefault(_DELETED_JOB_MONTHS_KEY, {})
+    new = session.new
+    dirty = session.dirty
+    deleted = session.deleted
+    for obj in chain(new, dirty, deleted):
+        if isinstance(obj, Job):
+            if obj in new:
+                _add(deltas, (obj.workshop_id, job_month(obj.created_at)), (1, 0, 0, 0))
+                continue
+            state = inspect(obj)
+            if obj in dirty and not _changed(state, ("workshop_id", "created_at")):
+                continue
+            previous = (
+                _previous(state, "workshop_id"),
+                job_month(_previous(state, "created_at")),
+            )
+            if obj in deleted:
+                _add(deltas, previous, (-1, 0, 0, 0))
+                deleted_jobs[obj.id] = previous
+            else:
+                current = (obj.workshop_id, job_month(obj.created_at))
+                if current != previous:
+                    months.update((current, previous))
+        elif isinstance(obj, (JobItem, JobPart)):
+            state = inspect(obj)
+            names = ("quantity", "unit_price", "job_id")
+            if obj in dirty and not _changed(state, names):
+                continue
+            current = tuple(getattr(obj, name) for name in names)
+            if obj not in new:
+                previous = tuple(_previous(state, name) for name in names)
+                if previous[2] is not None:
+                    _add(
+                        job_deltas,
+                        previous[2],
+                        tuple(-value for value in _line_amounts(obj, previous)),
+                    )
+            if obj not in deleted and current[2] is not None:
+                _add(job_deltas, current[2], _line_amounts(obj, current))
+
+
+@event.listens_for(Job.workshop_id, "set", active_history=True)
+@event.listens_for(Job.created_at, "set", active_history=True)
+@event.listens_for(JobItem.quantity, "set", active_history=True)
+@event.listens_for(JobItem.unit_price, "set", active_history=True)
+@event.listens_for(JobItem.job_id, "set", active_history=True)
+@event.listens_for(JobPart.quantity, "set", active_history=True)
+@event.listens_for(JobPart.unit_price, "set", active_history=True)
+@event.listens_for(JobPart.job_id, "set", active_history=True)
+def _load_previous_value(target, value, oldvalue, initiator):
+    # active_history carga el valor previo aunque el atributo este expirado
+    # (tras un commit), para poder descontarlo del rollup.
+    return value
+
+
+@event.listens_for(db.session, "before_commit")
+def _refresh_pending_months(session):
+    session.flush()
+    months = session.info.pop(_PENDING_MONTHS_KEY, set())
+    deltas = session.info.pop(_PENDING_DELTAS_KEY, {})
+    job_deltas = session.info.pop(_PENDING_JOB_DELTAS_KEY, {})
+    deleted_jobs = session.info.pop(_DELETED_JOB_MONTHS_KEY, {})
+    if not months and not deltas and not job_deltas:
+        return
+
+    job_months = dict(deleted_jobs)
+    missing = [job_id for job_id in job_deltas if job_id not in job_months]
+    if missing:
+        for job_id, workshop_id, created_at in session.query(
+            Job.id, Job.workshop_id, Job.created_at
+        ).filter(Job.id.in_(missing)):
+            job_months[job_id] = (workshop_id, job_month(created_at))
+    for job_id, (service_revenue, parts_revenue, service_units) in job_deltas.items():
+        key = job_months.get(job_id)
+        if key is not None:
+            _add(deltas, key, (0, service_revenue, parts_revenue, service_units))
+
+    for workshop_id, month_start in months:
+        if workshop_id is None or month_start is None:
+            continue
+        StatsService.refresh_workshop_month(workshop_id, month_start)
+    # Los meses recalculados ya incluyen los cambios de esta transaccion.
+    for (workshop_id, month_start), delta in sorted(deltas.items()):
+        if workshop_id is None or month_start is None or (workshop_id, month_start) in months:
+            continue
+        if any(delta):
+            StatsService.apply_month_delta(workshop_id, month_start, delta)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_pending_months(session):
+    for key in (
+        _PENDING_MONTHS_KEY,
+        _PENDING_DELTAS_KEY,
+        _PENDING_JOB_DELTAS_KEY,
+        _DELETED_JOB_MONTHS_KEY,
+    ):
+        session.info.pop(key, None)
@@ -0,0 +1,213 @@
+import math
+from datetime import datetime, timezone
+from itertools import groupby
+
+from flask import has_request_context
+from flask_login import current_user
+from sqlalchemy import event, func, insert, inspect, select
+
+from ..date_ranges import elapsed_seconds
+from ..extensions import db
+from ..models import Job, JobItem, JobStatusEvent, ServiceType, Store
+
+
+_PENDING_TRANSITIONS_KEY = "job_status_events_pending"
+
+PERCENTILES = (0.5, 0.9)
+
+
+def _percentile_cont(sorted_values, fraction):
+    """Interpolacion lineal, igual que ``percentile_cont`` de PostgreSQL."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (
+        position - lower
+    )
+
+
+class StatusHistoryService:
+    """Historial de estados de trabajos y tiempos de ciclo.
+
+    Las transiciones se registran desde la sesion (alta y cada cambio de
+    ``Job.status``), asi JobService, ``jobs_status`` y la cola offline quedan
+    cubiertos sin llamadas explicitas.
+    """
+
+    @staticmethod
+    def turnaround(workshop_id, start_utc, end_utc, target_status="ready"):
+        """Tiempo desde el ingreso hasta ``target_status`` por sucursal y service.
+
+        Cuenta los trabajos que llegaron por primera vez al estado dentro de
+        ``[start_utc, end_utc)``. En PostgreSQL percentiles y promedio salen de
+        una sola consulta agrupada; en otros motores se agrupa la misma
+        consulta en Python.
+        """
+        reached = (
+            select(
+                JobStatusEvent.job_id,
+                func.min(JobStatusEvent.at).label("reached_at"),
+            )
+            .where(
+                JobStatusEvent.workshop_id == workshop_id,
+                JobStatusEvent.to_status == target_status,
+                JobStatusEvent.at >= start_utc,
+                JobStatusEvent.at < end_utc,
+            )
+            .group_by(JobStatusEvent.job_id)
+            .subquery()
+        )
+        samples = (
+            select(
+                Store.id.label("store_id"),
+                Store.name.label("store_name"),
+                ServiceType.id.label("service_id"),
+                ServiceType.name.label("service_name"),
+                Job.id.label("job_id"),
+                elapsed_seconds(Job.created_at, reached.c.reached_at).label("seconds"),
+            )
+            .select_from(reached)
+            .join(Job, Job.id == reached.c.job_id)
+            .join(Store, Store.id == Job.store_id)
+            .join(JobItem, JobItem.job_id == Job.id)
+            .join(ServiceType, ServiceType.id == JobItem.service_type_id)
+            .distinct()
+            .subquery()
+        )
+        group_columns = (
+            samples.c.store_id,
+            samples.c.store_name,
+            samples.c.service_id,
+            samples.c.service_name,
+        )
+
+        if db.session.get_bind(mapper=inspect(Job)).dialect.name == "postgresql":
+            rows = db.session.execute(
+                select(
+                    *group_columns,
+                    func.count().label("jobs"),
+                    func.avg(samples.c.seconds).label("avg_seconds"),
+                    *(
+                        func.percentile_cont(fraction).within_group(samples.c.seconds)
+                        for fraction in PERCENTILES
+                    ),
+                )
+                .group_by(*group_columns)
+                .order_by(samples.c.store_name, samples.c.service_name)
+            ).all()
+            return [
+                _report_row(store_id, store_name, service_id, service_name, jobs, avg, percentiles)
+                for store_id, store_name, service_id, service_name, jobs, avg, *percentiles in rows
+            ]
+
+        rows = db.session.execute(
+            select(*group_columns, samples.c.seconds).order_by(
+                samples.c.store_name, samples.c.service_name, samples.c.service_id
+            )
+        ).all()
+        report = []
+        for (store_id, store_name, service_id, service_name), group in groupby(
+            rows, key=lambda row: tuple(row[:4])
+        ):
+            values = sorted(max(row.seconds or 0.0, 0.0) for row in group)
+            report.append(
+                _report_row(
+                    store_id,
+                    store_name,
+                    service_id,
+                    service_name,
+                    len(values),
+                    sum(values) / len(values),
+                    [_percentile_cont(values, fraction) for fraction in PERCENTILES],
+                )
+            )
+        return report
+
+    @staticmethod
+    def record(transitions, user_id=None):
+        """Inserta transiciones ``(job_id, workshop_id, store_id, from, to, at)``.
+
+        Una sola sentencia multi-fila; la usan los listeners y los cambios en
+        bloque, que actualizan ``jobs`` sin pasar por el flush.
+        """
+        rows = [
+            {
+                "job_id": job_id,
+                "workshop_id": workshop_id,
+                "store_id": store_id,
+                "from_status": from_status,
+                "to_status": to_status,
+                "at": at,
+                "user_id": user_id,
+            }
+            for job_id, workshop_id, store_id, from_status, to_status, at in transitions
+        ]
+        if rows:
+            db.session.execute(insert(JobStatusEvent), rows)
+
+
+def _report_row(store_id, store_name, service_id, service_name, jobs, avg_seconds, percentiles):
+    return {
+        "store_id": store_id,
+        "store_name": store_name,
+        "service_id": service_id,
+        "service_name": service_name,
+        "jobs": jobs,
+        "avg_seconds": float(avg_seconds) if avg_seconds is not None else None,
+        "p50_seconds": float(percentiles[0]) if percentiles[0] is not None else None,
+        "p90_seconds": float(percentiles[1]) if percentiles[1] is not None else None,
+    }
+
+
+def _acting_user_id():
+    if has_request_context() and current_user.is_authenticated:
+        return current_user.id
+    return None
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_status_transitions(session, flush_context):
+    pending = session.info.setdefault(_PENDING_TRANSITIONS_KEY, [])
+    now = datetime.now(timezone.utc)
+    for obj in session.new:
+        if isinstance(obj, Job):
+            pending.append((obj, None, obj.status, now))
+    for obj in session.dirty:
+        if not isinstance(obj, Job):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.has_changes():
+            continue
+        previous = history.deleted[0] if history.deleted else None
+        if previous != obj.status:
+            pending.append((obj, previous, obj.status, now))
+
+
+@event.listens_for(Job.status, "set", active_history=True)
+def _load_previous_status(target, value, oldvalue, initiator):
+    # Con el atributo expirado (tras un commit) el estado previo se carga
+    # igual, para registrar ``from_status``.
+    return value
+
+
+@event.listens_for(db.session, "before_commit")
+def _write_status_transitions(session):
+    session.flush()
+    pending = session.info.pop(_PENDING_TRANSITIONS_KEY, [])
+    if not pending:
+        return
+    StatusHistoryService.record(
+        [
+            (job.id, job.workshop_id, job.store_id, from_status, to_status, at)
+            for job, from_status, to_status, at in pending
+            if not inspect(job).was_deleted and to_status
+        ],
+        user_id=_acting_user_id(),
+    )
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_status_transitions(session):
+    session.info.pop(_PENDING_TRANSITIONS_KEY, None)
@@ -0,0 +1,145 @@
+"""Borrado de un taller completo por tandas.
+
+Cada tabla se vacia con ``DELETE ... WHERE id IN (SELECT id ... LIMIT n)`` y
+cada tanda es su propia transaccion: ningun lock dura mas que una tanda, el
+worker de la base no acumula un DELETE de millones de filas y, si el proceso
+se corta, se puede volver a correr y sigue desde donde quedo.
+
+El orden es el inverso de ``TABLES`` del snapshot (cada tabla se vacia antes
+que las tablas a las que referencia). ``audit_logs`` es compartida con el
+resto de la instancia: no se borra, se anonimiza por tandas usando los
+indices por taller y sucursal.
+
+Lo usa el comando ``flask tenant-purge``; la baja de owners desde el panel
+sigue siendo una sola transaccion porque solo admite talleres sin datos.
+"""
+
+from sqlalchemy import delete, exists, or_, select, update
+
+from ..extensions import db
+from ..models import Bicycle, Client, Job, ServiceType
+from .tenant_snapshot_service import JOB_CHILD_TABLES, TABLES
+
+
+PURGE_BATCH_SIZE = 1000
+
+# Tablas del taller que el snapshot no exporta: van primero.
+EXTRA_TABLES = ("offline_mutations", "workshop_monthly_stats")
+
+
+def _table(table_name):
+    return db.metadata.tables[table_name]
+
+
+def _scope(table, workshop_id):
+    if table.name == "workshops":
+        return table.c.id == workshop_id
+    if table.name in JOB_CHILD_TABLES:
+        jobs = _table("jobs")
+        return table.c.job_id.in_(select(jobs.c.id).where(jobs.c.workshop_id == workshop_id))
+    return table.c.workshop_id == workshop_id
+
+
+def _in_batches(step, statement_for, batch_size, progress, done=0):
+    """Ejecuta ``statement_for(limite)`` una vez por transaccion hasta agotar filas.
+
+    ``done`` permite seguir el conteo de un paso anterior sobre la misma tabla.
+    """
+    total = done
+    while True:
+        affected = db.session.execute(statement_for(batch_size)).rowcount
+        db.session.commit()
+        if not affected:
+            return total
+        total += affected
+        if progress:
+            progress(step, total)
+        if affected < batch_size:
+            return total
+
+
+def _delete_batches(table, condition, batch_size, progress):
+    if "id" not in table.c:
+        # Sin id propio (rollup mensual): son pocas filas por taller.
+        deleted = db.session.execute(delete(table).where(condition)).rowcount
+        db.session.commit()
+        if progress and deleted:
+            progress(table.name, deleted)
+        return deleted
+
+    def statement(limit):
+        ids = select(table.c.id).where(condition).limit(limit)
+        return delete(table).where(table.c.id.in_(ids))
+
+    return _in_batches(table.name, statement, batch_size, progress)
+
+
+def _anonymize_batches(condition, values, batch_size, progress, done=0):
+    audit_logs = _table("audit_logs")
+
+    def statement(limit):
+        ids = select(audit_logs.c.id).where(condition).limit(limit)
+        return update(audit_logs).where(audit_logs.c.id.in_(ids)).values(**values)
+
+    return _in_batches("audit_logs", statement, batch_size, progress, done)
+
+
+class TenantPurgeService:
+    @staticmethod
+    def has_business_data(workshop_id):
+        """Una sola consulta: ``True`` si el taller tiene clientes, bicis, services o trabajos."""
+        checks = [
+            exists().where(model.workshop_id == workshop_id)
+            for model in (Client, Bicycle, ServiceType, Job)
+        ]
+        return bool(db.session.execute(select(or_(*checks))).scalar())
+
+    @staticmethod
+    def purge(workshop_id, batch_size=PURGE_BATCH_SIZE, progress=None):
+        """Borra el taller y todos sus datos; devuelve ``{tabla: filas}``.
+
+        ``progress(tabla, filas_hasta_ahora)`` se llama despues de cada tanda.
+        Los usuarios no se borran: quedan sin sucursal y sin el taller.
+        """
+        counts = {}
+        stores = _table("stores")
+        store_ids = select(stores.c.id).where(stores.c.workshop_id == workshop_id)
+
+        for table_name in EXTRA_TABLES:
+            table = _table(table_name)
+            counts[table_name] = _delete_batches(
+                table, _scope(table, workshop_id), batch_size, progress
+            )
+
+        for table_name in reversed(TABLES):
+            table = _table(table_name)
+            if table_name == "audit_logs":
+                anonymized = _anonymize_batches(
+                    table.c.workshop_id == workshop_id,
+                    {"workshop_id": None, "store_id": None},
+                    batch_size,
+                    progress,
+                )
+                counts[table_name] = _anonymize_batches(
+                    table.c.store_id.in_(store_ids),
+                    {"store_id": None},
+                    batch_size,
+                    progress,
+                    done=anonymized,
+                )
+                continue
+            if table_name == "stores":
+                users = _table("users")
+                db.session.execute(
+                    update(users).where(users.c.store_id.in_(store_ids)).values(store_id=None)
+                )
+                user_workshops = _table("user_workshops")
+                db.session.execute(
+                    delete(user_workshops).where(user_workshops.c.workshop_id == workshop_id)
+                )
+                db.session.commit()
+            counts[table_name] = _delete_batches(
+                table, _scope(table, workshop_id), batch_size, progress
+            )
+        return counts
+
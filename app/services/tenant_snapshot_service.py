@@ -0,0 +1,437 @@
+"""Snapshot de un taller completo con ``COPY`` (exportar e importar).
+
+El archivo es un ``.tar`` con ``manifest.json`` y un ``<tabla>.csv.gz`` por
+tabla. La exportacion corre ``COPY (SELECT ...) TO STDOUT`` dentro de una
+transaccion REPEATABLE READ, asi todas las tablas salen del mismo instante.
+
+La importacion carga cada tabla con ``COPY ... FROM STDIN`` a una tabla
+temporal cuya columna ``new_id`` toma ``nextval`` de la secuencia real, y
+despues inserta con un solo ``INSERT ... SELECT`` por tabla remapeando las
+referencias contra las tablas temporales. Nada pasa por el ORM, asi que un
+taller con millones de filas se mueve en minutos. Los usuarios no se copian:
+``user_id`` se resuelve por email contra los usuarios de la instancia destino.
+"""
+
+import gzip
+import json
+import os
+import string
+import tarfile
+import tempfile
+from datetime import datetime, timezone
+
+from sqlalchemy import func
+
+from ..extensions import db
+from ..models import Job
+from .stats_service import StatsService, job_month
+
+
+SNAPSHOT_FORMAT = 1
+COPY_CHUNK_BYTES = 1024 * 1024
+
+# Orden de carga: cada tabla solo referencia a tablas anteriores (o a users).
+TABLES = (
+    "workshops",
+    "stores",
+    "bicycle_brands",
+    "clients",
+    "service_types",
+    "bicycles",
+    "jobs",
+    "job_items",
+    "job_parts",
+    "job_status_events",
+    "audit_logs",
+)
+# Tablas sin workshop_id: se filtran por el trabajo al que pertenecen.
+JOB_CHILD_TABLES = ("job_items", "job_parts")
+
+# ``audit_logs.entity_id`` apunta a distintas tablas segun ``entity_type``.
+AUDIT_ENTITY_TABLES = {
+    "workshop": "workshops",
+    "store": "stores",
+    "bicycle_brand": "bicycle_brands",
+    "client": "clients",
+    "service": "service_types",
+    "bicycle": "bicycles",
+    "job": "jobs",
+}
+AUDIT_USER_ENTITIES = (
+    "user",
+    "owner",
+    "owner_approval",
+    "owner_email",
+    "owner_password",
+    "owner_reject",
+    "owner_status",
+    "super_admin",
+)
+
+
+def _columns(table_name):
+    return [column.name for column in db.metadata.tables[table_name].columns]
+
+
+def _references(table_name):
+    """``{columna: tabla_referenciada}`` segun las foreign keys del modelo."""
+    references = {}
+    for column in db.metadata.tables[table_name].columns:
+        for foreign_key in column.foreign_keys:
+            references[column.name] = foreign_key.column.table.name
+    return references
+
+
+def _postgres_connection():
+    if db.engine.dialect.name != "postgresql":
+        raise ValueError("El snapshot de talleres usa COPY y requiere PostgreSQL")
+    return db.engine.raw_connection()
+
+
+def _alembic_revision(cursor):
+    cursor.execute("SELECT version_num FROM alembic_version")
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class TenantSnapshotService:
+    @staticmethod
+    def export_workshop(workshop_id, output_path):
+        """Escribe el snapshot del taller en ``output_path``; devuelve el manifest."""
+        from psycopg import IsolationLevel, sql
+
+        raw_connection = _postgres_connection()
+        connection = raw_connection.driver_connection
+        try:
+            connection.rollback()
+            connection.isolation_level = IsolationLevel.REPEATABLE_READ
+            connection.read_only = True
+            with connection.cursor() as cursor, tempfile.TemporaryDirectory() as workdir:
+                cursor.execute("SET LOCAL statement_timeout = 0")
+                cursor.execute("SELECT 1 FROM workshops WHERE id = %s", (workshop_id,))
+                if cursor.fetchone() is None:
+                    raise ValueError(f"No existe el taller {workshop_id}")
+
+                manifest = {
+                    "format": SNAPSHOT_FORMAT,
+                    "source_workshop_id": workshop_id,
+                    "alembic_revision": _alembic_revision(cursor),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "tables": {},
+                }
+                for table_name in TABLES + ("users",):
+                    columns = ["id", "email"] if table_name == "users" else _columns(table_name)
+                    query = _export_select(sql, table_name, columns, workshop_id)
+                    path = os.path.join(workdir, f"{table_name}.csv.gz")
+                    with gzip.open(path, "wb", compresslevel=6) as output:
+                        with cursor.copy(
+                            sql.SQL("COPY ({}) TO STDOUT (FORMAT csv)").format(query)
+                        ) as copy:
+                            for data in copy:
+                                output.write(data)
+                    manifest["tables"][table_name] = {
+                        "columns": columns,
+                        "rows": cursor.rowcount,
+                    }
+
+                manifest_path = os.path.join(workdir, "manifest.json")
+                with open(manifest_path, "w", encoding="utf-8") as handle:
+                    json.dump(manifest, handle, indent=2)
+                with tarfile.open(output_path, "w") as archive:
+                    archive.add(manifest_path, arcname="manifest.json")
+                    for table_name in manifest["tables"]:
+                        archive.add(
+                            os.path.join(workdir, f"{table_name}.csv.gz"),
+                            arcname=f"{table_name}.csv.gz",
+                        )
+            return manifest
+        finally:
+            connection.rollback()
+            connection.isolation_level = None
+            connection.read_only = None
+            raw_connection.close()
+
+    @staticmethod
+    def import_archive(archive_path, name=None, owner_email=None):
+        """Crea un taller nuevo con el contenido del snapshot; devuelve su id y conteos."""
+        from psycopg import sql
+
+        raw_connection = _postgres_connection()
+        connection = raw_connection.driver_connection
+        try:
+            with tarfile.open(archive_path, "r") as archive, connection.cursor() as cursor:
+                manifest = json.load(archive.extractfile("manifest.json"))
+                _check_manifest(manifest, _alembic_revision(cursor))
+                cursor.execute("SET LOCAL statement_timeout = 0")
+
+                _stage_users(sql, cursor, archive)
+                counts = {}
+                for table_name in TABLES:
+                    _stage_table(sql, cursor, archive, table_name, manifest)
+                _renumber_colliding_job_codes(sql, cursor)
+
+                workshop_id = _insert_workshop(sql, cursor, name)
+                for table_name in TABLES[1:]:
+                    counts[table_name] = _insert_table(sql, cursor, table_name, workshop_id)
+
+                if owner_email:
+                    cursor.execute(
+                        "INSERT INTO user_workshops (user_id, workshop_id) "
+                        "SELECT id, %s FROM users WHERE lower(email) = lower(%s)",
+                        (workshop_id, owner_email),
+                    )
+                    if cursor.rowcount == 0:
+                        raise ValueError(f"No existe el usuario {owner_email}")
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            raw_connection.close()
+
+        _refresh_monthly_stats(workshop_id)
+        return workshop_id, counts
+
+
+def _export_select(sql, table_name, columns, workshop_id):
+    column_list = sql.SQL(", ").join(sql.Identifier(column) for column in columns)
+    workshop = sql.Literal(workshop_id)
+    if table_name == "workshops":
+        condition = sql.SQL("id = {}").format(workshop)
+    elif table_name == "users":
+        # Solo los usuarios referenciados, para resolverlos por email al importar.
+        condition = sql.SQL(
+            "id IN (SELECT user_id FROM user_workshops WHERE workshop_id = {w}"
+            " UNION SELECT user_id FROM audit_logs WHERE workshop_id = {w}"
+            " UNION SELECT user_id FROM job_status_events WHERE workshop_id = {w})"
+        ).format(w=workshop)
+    elif table_name in JOB_CHILD_TABLES:
+        condition = sql.SQL("job_id IN (SELECT id FROM jobs WHERE workshop_id = {})").format(
+            workshop
+        )
+    else:
+        condition = sql.SQL("workshop_id = {}").format(workshop)
+    return sql.SQL("SELECT {} FROM {} WHERE {}").format(
+        column_list, sql.Identifier(table_name), condition
+    )
+
+
+def _check_manifest(manifest, revision):
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError("Formato de snapshot no soportado")
+    if manifest.get("alembic_revision") != revision:
+        raise ValueError(
+            f"El snapshot es de la migracion {manifest.get('alembic_revision')} y la base "
+            f"esta en {revision}; actualiza ambas a la misma version"
+        )
+    for table_name in TABLES:
+        if manifest["tables"][table_name]["columns"] != _columns(table_name):
+            raise ValueError(f"Las columnas de {table_name} no coinciden con el modelo")
+
+
+def _stage_name(table_name):
+    return f"snapshot_{table_name}"
+
+
+def _copy_member(sql, cursor, archive, table_name, stage, columns):
+    member = archive.extractfile(f"{table_name}.csv.gz")
+    statement = sql.SQL("COPY {} ({}) FROM STDIN (FORMAT csv)").format(
+        sql.Identifier(stage),
+        sql.SQL(", ").join(sql.Identifier(column) for column in columns),
+    )
+    with gzip.GzipFile(fileobj=member) as data, cursor.copy(statement) as copy:
+        while chunk := data.read(COPY_CHUNK_BYTES):
+            copy.write(chunk)
+
+
+def _stage_users(sql, cursor, archive):
+    cursor.execute(
+        "CREATE TEMP TABLE snapshot_users (id integer PRIMARY KEY, email text) ON COMMIT DROP"
+    )
+    _copy_member(sql, cursor, archive, "users", "snapshot_users", ["id", "email"])
+    cursor.execute(
+        "CREATE TEMP TABLE snapshot_users_map ON COMMIT DROP AS "
+        "SELECT s.id, u.id AS new_id FROM snapshot_users s "
+        "JOIN users u ON lower(u.email) = lower(s.email)"
+    )
+    cursor.execute("CREATE INDEX ON snapshot_users_map (id)")
+
+
+def _stage_table(sql, cursor, archive, table_name, manifest):
+    """Carga la tabla en una temporal; ``new_id`` sale de la secuencia real."""
+    stage = _stage_name(table_name)
+    columns = manifest["tables"][table_name]["columns"]
+    cursor.execute(
+        sql.SQL("CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA").format(
+            sql.Identifier(stage),
+            sql.SQL(", ").join(sql.Identifier(column) for column in columns),
+            sql.Identifier(table_name),
+        )
+    )
+    cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", (table_name,))
+    (sequence,) = cursor.fetchone()
+    cursor.execute(
+        sql.SQL("ALTER TABLE {} ADD COLUMN new_id integer DEFAULT nextval({}::regclass)").format(
+            sql.Identifier(stage), sql.Literal(sequence)
+        )
+    )
+    _copy_member(sql, cursor, archive, table_name, stage, columns)
+    cursor.execute(sql.SQL("CREATE INDEX ON {} (id)").format(sql.Identifier(stage)))
+    cursor.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(stage)))
+
+
+JOB_CODE_ALPHABET = string.ascii_uppercase + string.digits
+
+
+def _job_code_expression(sql, length):
+    """Codigo de ``length`` caracteres a partir del entero ``n`` (base 36)."""
+    base = len(JOB_CODE_ALPHABET)
+    digits = [
+        sql.SQL("substr({}, n / {} % {} + 1, 1)").format(
+            sql.Literal(JOB_CODE_ALPHABET), sql.Literal(base**position), sql.Literal(base)
+        )
+        for position in reversed(range(length))
+    ]
+    return sql.SQL(" || ").join(digits)
+
+
+def _job_code_statements(sql, length):
+    """Mapa ``snapshot_jobs.id -> codigo libre`` y el UPDATE que lo aplica.
+
+    Los codigos libres salen del espacio completo de codigos (``generate_series``)
+    menos los usados en la instancia y en el snapshot, en orden aleatorio, y se
+    asignan a los repetidos con ``row_number``: todo en dos sentencias.
+    """
+    space = len(JOB_CODE_ALPHABET) ** length
+    build_map = sql.SQL(
+        "CREATE TEMP TABLE snapshot_job_codes ON COMMIT DROP AS "
+        "WITH colliding AS ("
+        "SELECT s.id, row_number() OVER (ORDER BY s.id) AS position "
+        "FROM snapshot_jobs s JOIN jobs j ON j.code = s.code"
+        "), free AS ("
+        "SELECT code, row_number() OVER (ORDER BY random()) AS position FROM ("
+        "SELECT {code} AS code FROM generate_series(0, {last}) AS n "
+        "EXCEPT SELECT code FROM jobs "
+        "EXCEPT SELECT code FROM snapshot_jobs"
+        ") AS candidates"
+        ") "
+        "SELECT colliding.id, free.code FROM colliding JOIN free USING (position)"
+    ).format(code=_job_code_expression(sql, length), last=sql.Literal(space - 1))
+    apply_map = sql.SQL(
+        "UPDATE snapshot_jobs s SET code = m.code FROM snapshot_job_codes m WHERE m.id = s.id"
+    )
+    return build_map, apply_map
+
+
+def _renumber_colliding_job_codes(sql, cursor):
+    """``jobs.code`` es unico en toda la instancia: se regeneran los repetidos."""
+    length = Job.__table__.c.code.type.length
+    cursor.execute(
+        "SELECT "
+        "(SELECT count(*) FROM snapshot_jobs s JOIN jobs j ON j.code = s.code), "
+        "(SELECT count(*) FROM (SELECT code FROM jobs UNION SELECT code FROM snapshot_jobs) c)"
+    )
+    colliding, taken = cursor.fetchone()
+    if not colliding:
+        return
+    free = len(JOB_CODE_ALPHABET) ** length - taken
+    if colliding > free:
+        raise ValueError(
+            f"El snapshot tiene {colliding} codigos de trabajo repetidos y solo quedan "
+            f"{free} libres en la instancia"
+        )
+    for statement in _job_code_statements(sql, length):
+        cursor.execute(statement)
+
+
+def _insert_workshop(sql, cursor, name):
+    columns = [column for column in _columns("workshops") if column != "id"]
+    values = []
+    for column in columns:
+        if column == "name" and name:
+            values.append(sql.Literal(name))
+        elif column == "data_version":
+            values.append(sql.SQL("0"))
+        else:
+            values.append(sql.Identifier(column))
+    cursor.execute(
+        sql.SQL("INSERT INTO workshops (id, {}) SELECT new_id, {} FROM snapshot_workshops RETURNING id").format(
+            sql.SQL(", ").join(sql.Identifier(column) for column in columns),
+            sql.SQL(", ").join(values),
+        )
+    )
+    return cursor.fetchone()[0]
+
+
+def _audit_entity_expression(sql):
+    branches = [
+        sql.SQL("WHEN {} THEN (SELECT x.new_id FROM {} x WHERE x.id = s.entity_id)").format(
+            sql.Literal(entity_type), sql.Identifier(_stage_name(table_name))
+        )
+        for entity_type, table_name in AUDIT_ENTITY_TABLES.items()
+    ]
+    branches.extend(
+        sql.SQL(
+            "WHEN {} THEN (SELECT x.new_id FROM snapshot_users_map x WHERE x.id = s.entity_id)"
+        ).format(sql.Literal(entity_type))
+        for entity_type in AUDIT_USER_ENTITIES
+    )
+    return sql.SQL("CASE s.entity_type {} END").format(sql.SQL(" ").join(branches))
+
+
+def _insert_statement(sql, table_name, workshop_id):
+    """``INSERT ... SELECT`` desde la temporal, con las referencias remapeadas."""
+    references = _references(table_name)
+    columns = [column for column in _columns(table_name) if column != "id"]
+    values = []
+    joins = []
+    for column in columns:
+        target = references.get(column)
+        if target == "workshops":
+            values.append(sql.Literal(workshop_id))
+        elif target == "users":
+            alias = sql.Identifier(f"ref_{column}")
+            joins.append(
+                sql.SQL("LEFT JOIN snapshot_users_map {a} ON {a}.id = s.{c}").format(
+                    a=alias, c=sql.Identifier(column)
+                )
+            )
+            values.append(sql.SQL("{}.new_id").format(alias))
+        elif target is not None:
+            alias = sql.Identifier(f"ref_{column}")
+            joins.append(
+                sql.SQL("LEFT JOIN {t} {a} ON {a}.id = s.{c}").format(
+                    t=sql.Identifier(_stage_name(target)), a=alias, c=sql.Identifier(column)
+                )
+            )
+            values.append(sql.SQL("{}.new_id").format(alias))
+        elif table_name == "audit_logs" and column == "entity_id":
+            values.append(_audit_entity_expression(sql))
+        else:
+            values.append(sql.SQL("s.{}").format(sql.Identifier(column)))
+
+    return sql.SQL(
+        "INSERT INTO {t} (id, {cols}) SELECT s.new_id, {vals} FROM {stage} s {joins}"
+    ).format(
+        t=sql.Identifier(table_name),
+        cols=sql.SQL(", ").join(sql.Identifier(column) for column in columns),
+        vals=sql.SQL(", ").join(values),
+        stage=sql.Identifier(_stage_name(table_name)),
+        joins=sql.SQL(" ").join(joins),
+    )
+
+
+def _insert_table(sql, cursor, table_name, workshop_id):
+    cursor.execute(_insert_statement(sql, table_name, workshop_id))
+    return cursor.rowcount
+
+
+def _refresh_monthly_stats(workshop_id):
+    first_created, last_created = (
+        db.session.query(func.min(Job.created_at), func.max(Job.created_at))
+        .filter(Job.workshop_id == workshop_id)
+        .one()
+    )
+    if first_created is None:
+        return
+    StatsService.refresh_range(job_month(first_created), job_month(last_created), workshop_id)
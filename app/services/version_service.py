@@ -0,0 +1,86 @@
+from itertools import chain
+
+from sqlalchemy import event, update
+
+from ..extensions import db
+from ..models import (
+    Bicycle,
+    BicycleBrand,
+    Client,
+    Job,
+    JobItem,
+    JobPart,
+    ServiceType,
+    Store,
+    Workshop,
+)
+
+
+_PENDING_WORKSHOPS_KEY = "data_version_pending_workshops"
+_PENDING_JOBS_KEY = "data_version_pending_jobs"
+
+# Entidades que se muestran en listados y detalles del taller.
+_WORKSHOP_SCOPED = (Bicycle, BicycleBrand, Client, Job, ServiceType, Store)
+
+
+class VersionService:
+    """Contador por taller que cambia con cada escritura de sus datos.
+
+    Sirve de token barato para los ETags: leerlo no requiere consultar las
+    tablas del listado, alcanza con el taller activo ya cargado.
+    """
+
+    @staticmethod
+    def current(workshop):
+        return workshop.data_version or 0
+
+    @staticmethod
+    def bump(workshop_ids):
+        workshop_ids = {workshop_id for workshop_id in workshop_ids if workshop_id is not None}
+        if not workshop_ids:
+            return
+        db.session.execute(
+            update(Workshop)
+            .where(Workshop.id.in_(workshop_ids))
+            .values(data_version=Workshop.data_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def mark_pending(session, workshop_ids):
+        """Para escrituras en bloque (UPDATE/DELETE directos) que no pasan por el flush."""
+        session.info.setdefault(_PENDING_WORKSHOPS_KEY, set()).update(workshop_ids)
+
+
+@event.listens_for(db.session, "after_flush")
+def _track_workshop_writes(session, flush_context):
+    workshop_ids = session.info.setdefault(_PENDING_WORKSHOPS_KEY, set())
+    job_ids = session.info.setdefault(_PENDING_JOBS_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Workshop):
+            workshop_ids.add(obj.id)
+        elif isinstance(obj, _WORKSHOP_SCOPED):
+            workshop_ids.add(obj.workshop_id)
+        elif isinstance(obj, (JobItem, JobPart)) and obj.job_id is not None:
+            job_ids.add(obj.job_id)
+
+
+@event.listens_for(db.session, "before_commit")
+def _bump_pending_versions(session):
+    session.flush()
+    workshop_ids = session.info.pop(_PENDING_WORKSHOPS_KEY, set())
+    job_ids = session.info.pop(_PENDING_JOBS_KEY, set())
+    if job_ids:
+        workshop_ids.update(
+            workshop_id
+            for (workshop_id,) in session.query(Job.workshop_id)
+            .filter(Job.id.in_(job_ids))
+            .distinct()
+        )
+    VersionService.bump(workshop_ids)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_pending_versions(session):
+    session.info.pop(_PENDING_WORKSHOPS_KEY, None)
+    session.info.pop(_PENDING_JOBS_KEY, None)
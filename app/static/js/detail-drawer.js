@@ -7,23 +7,105 @@
   const footerEl = overlay.querySelector(".drawer-footer");
   const closeBtn = overlay.querySelector(".modal-close");
 
+  const CACHE_LIMIT = 20;
+  const CACHE_TTL_MS = 30000;
+  const PREFETCH_DELAY_MS = 120;
+  // url -> { promise, expires }; Map conserva el orden de insercion y sirve de LRU.
+  // job-events.js borra la entrada de un trabajo cuando llega un evento suyo.
+  const fragments = new Map();
+  let activeUrl = null;
+
   const close = () => {
+    activeUrl = null;
     overlay.classList.remove("is-open");
     overlay.setAttribute("aria-hidden", "true");
     document.body.style.overflow = "";
   };
 
-  const open = (title, bodyContent, footerContent) => {
-    titleEl.textContent = title;
+  const fill = (bodyContent, footerContent) => {
     bodyEl.replaceChildren();
     footerEl.replaceChildren();
     if (bodyContent) bodyEl.appendChild(bodyContent);
     if (footerContent) footerEl.appendChild(footerContent);
+  };
+
+  const open = (title, bodyContent, footerContent) => {
+    titleEl.textContent = title;
+    fill(bodyContent, footerContent);
     overlay.classList.add("is-open");
     overlay.setAttribute("aria-hidden", "false");
     document.body.style.overflow = "hidden";
   };
 
+  const message = (text) => {
+    const el = document.createElement("p");
+    el.className = "muted";
+    el.textContent = text;
+    return el;
+  };
+
+  const remember = (url, entry) => {
+    fragments.delete(url);
+    fragments.set(url, entry);
+    while (fragments.size > CACHE_LIMIT) {
+      fragments.delete(fragments.keys().next().value);
+    }
+  };
+
+  const evict = (url) => {
+    fragments.delete(url);
+  };
+
+  const loadFragment = (url) => {
+    const cached = fragments.get(url);
+    if (cached && cached.expires > Date.now()) {
+      remember(url, cached);
+      return cached.promise;
+    }
+    const entry = { expires: Infinity };
+    entry.promise = fetch(url, {
+      credentials: "same-origin",
+      headers: { "X-Requested-With": "fetch" },
+    })
+      .then((response) => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        return response.text();
+      })
+      .then((html) => {
+        entry.expires = Date.now() + CACHE_TTL_MS;
+        return html;
+      });
+    entry.promise.catch(() => {
+      if (fragments.get(url) === entry) fragments.delete(url);
+    });
+    remember(url, entry);
+    return entry.promise;
+  };
+
+  const parseFragment = (html) => {
+    const template = document.createElement("template");
+    template.innerHTML = html;
+    return template.content;
+  };
+
+  const openRemote = (title, url) => {
+    activeUrl = url;
+    open(title, message("Cargando..."), null);
+    loadFragment(url)
+      .then((html) => {
+        if (activeUrl !== url) return;
+        const content = parseFragment(html);
+        fill(
+          content.querySelector(".drawer-detail-body"),
+          content.querySelector(".drawer-detail-footer")
+        );
+      })
+      .catch(() => {
+        if (activeUrl !== url) return;
+        fill(message("No se pudo cargar el detalle."), null);
+      });
+  };
+
   closeBtn?.addEventListener("click", close);
   overlay.addEventListener("click", (e) => {
     if (e.target === overlay) close();
@@ -33,16 +115,36 @@
   });
 
   document.addEventListener("click", (e) => {
-    if (e.target.closest(".js-confirm") || e.target.closest("a.button") || e.target.closest("button")) return;
-    const card = e.target.closest("[data-drawer]");
+    if (e.target.closest(".js-confirm") || e.target.closest("a.button") || e.target.closest("button") || e.target.closest(".col-jobs-select")) return;
+    const card = e.target.closest("[data-drawer-url], [data-drawer]");
     if (!card) return;
-    const templateId = card.dataset.drawer;
-    const template = document.getElementById(templateId);
+    const drawerTitle = card.dataset.drawerTitle || "Detalle";
+    if (card.dataset.drawerUrl) {
+      openRemote(drawerTitle, card.dataset.drawerUrl);
+      return;
+    }
+    const template = document.getElementById(card.dataset.drawer);
     if (!template) return;
     const content = template.content.cloneNode(true);
-    const drawerTitle = card.dataset.drawerTitle || "Detalle";
     const bodyDiv = content.querySelector(".drawer-detail-body");
     const footerDiv = content.querySelector(".drawer-detail-footer");
     open(drawerTitle, bodyDiv, footerDiv);
   });
+
+  // Prefetch al pasar el mouse: cuando llega el click el fragmento suele estar listo.
+  let hoverCard = null;
+  let prefetchTimer = null;
+  document.addEventListener("pointerover", (e) => {
+    if (e.pointerType !== "mouse") return;
+    const card = e.target.closest("[data-drawer-url]");
+    if (card === hoverCard) return;
+    hoverCard = card;
+    clearTimeout(prefetchTimer);
+    if (!card) return;
+    prefetchTimer = setTimeout(() => {
+      loadFragment(card.dataset.drawerUrl).catch(() => {});
+    }, PREFETCH_DELAY_MS);
+  });
+
+  window.DetailDrawer = { evict };
 })();
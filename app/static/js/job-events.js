@@ -0,0 +1,145 @@
+(() => {
+  const host = document.querySelector("[data-job-events-url]");
+  if (!host) return;
+
+  const eventsUrl = host.dataset.jobEventsUrl;
+  const SEEN_LIMIT = 200;
+  // Los ids se repiten al reconectar (ventana de reenvio): se descartan.
+  // Llegan como texto porque superan Number.MAX_SAFE_INTEGER.
+  const seen = new Set();
+  let lastId = "";
+  let source = null;
+  let pollController = null;
+  let pollTimer = null;
+  let stopped = false;
+
+  const parseFragment = (html) => {
+    const template = document.createElement("template");
+    template.innerHTML = html.trim();
+    return template.content.firstElementChild;
+  };
+
+  const fetchFragment = async (url) => {
+    const response = await fetch(url, { credentials: "same-origin" });
+    if (response.status === 204) return null;
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    return parseFragment(await response.text());
+  };
+
+  const showNotice = () => {
+    if (host.querySelector(".job-events-notice")) return;
+    const notice = document.createElement("button");
+    notice.type = "button";
+    notice.className = "button button-ghost button-compact job-events-notice";
+    notice.textContent = "Hay trabajos nuevos · Actualizar";
+    notice.addEventListener("click", async () => {
+      notice.remove();
+      window.TableSearch?.clearCache?.();
+      const ok = await window.TableSearch?.fetchAndReplace?.(window.location.href, {
+        historyMode: "none",
+      });
+      if (!ok) window.location.reload();
+    });
+    host.prepend(notice);
+  };
+
+  const patch = async (selector, url, jobEvent) => {
+    const current = host.querySelector(`${selector}[data-job-id="${jobEvent.job_id}"]`);
+    // El detalle cacheado del trabajo ya no vale.
+    window.DetailDrawer?.evict?.(current?.dataset.drawerUrl || `/jobs/${jobEvent.job_id}/drawer`);
+    if (!current) {
+      if (jobEvent.type === "created") showNotice();
+      return;
+    }
+    if (jobEvent.type === "deleted") {
+      current.remove();
+      return;
+    }
+    const fresh = await fetchFragment(url);
+    if (fresh) {
+      current.replaceWith(fresh);
+    } else {
+      current.remove();
+    }
+  };
+
+  const newest = (current, candidate) => {
+    if (!candidate) return current;
+    if (!current) return candidate;
+    return BigInt(candidate) > BigInt(current) ? candidate : current;
+  };
+
+  const handle = async (jobEvent) => {
+    if (!jobEvent || seen.has(jobEvent.id)) return;
+    seen.add(jobEvent.id);
+    if (seen.size > SEEN_LIMIT) seen.delete(seen.values().next().value);
+    lastId = newest(lastId, jobEvent.id);
+
+    try {
+      if (host.querySelector("#table-content")) {
+        window.TableSearch?.clearCache?.();
+        await patch("tr", `/jobs/${jobEvent.job_id}/row`, jobEvent);
+        document.dispatchEvent(new CustomEvent("table:updated"));
+      } else {
+        await patch(".timeline-item", `/jobs/${jobEvent.job_id}/agenda-item`, jobEvent);
+      }
+    } catch (error) {
+      console.warn("No se pudo actualizar el trabajo", error);
+    }
+  };
+
+  const poll = async () => {
+    if (stopped) return;
+    pollController = new AbortController();
+    let retryMs = 15000;
+    try {
+      const url = lastId ? `${eventsUrl}?after=${lastId}` : eventsUrl;
+      const response = await fetch(url, {
+        credentials: "same-origin",
+        headers: { Accept: "application/json" },
+        signal: pollController.signal,
+      });
+      if (response.ok) {
+        const data = await response.json();
+        for (const jobEvent of data.events) await handle(jobEvent);
+        lastId = newest(lastId, data.last_id);
+        retryMs = data.retry_ms;
+      }
+    } catch (error) {
+      if (error.name === "AbortError") return;
+    }
+    pollTimer = setTimeout(poll, retryMs);
+  };
+
+  const start = () => {
+    stopped = false;
+    if (window.EventSource) {
+      source = new EventSource(lastId ? `${eventsUrl}?after=${lastId}` : eventsUrl);
+      source.addEventListener("job", (event) => {
+        handle(JSON.parse(event.data));
+      });
+      return;
+    }
+    poll();
+  };
+
+  // En segundo plano no se ocupa un hilo del servidor: se corta y al volver
+  // se reconecta (con Last-Event-ID / after se reciben los eventos perdidos).
+  const stop = () => {
+    stopped = true;
+    source?.close();
+    source = null;
+    pollController?.abort();
+    clearTimeout(pollTimer);
+  };
+
+  document.addEventListener("visibilitychange", () => {
+    if (document.hidden) {
+      stop();
+    } else if (stopped) {
+      start();
+    }
+  });
+
+  start();
+})();
@@ -17,7 +17,9 @@
       return;
     }
     const keys = await caches.keys();
-    const targets = keys.filter((key) => key.startsWith("service-bicycle-static-"));
+    const targets = keys.filter(
+      (key) => key.startsWith("service-bicycle-static-") || key.startsWith("service-bicycle-private-")
+    );
     await Promise.all(targets.map((key) => caches.delete(key)));
   };
 
@@ -26,6 +28,79 @@
     await Promise.all(registrations.map((registration) => registration.unregister()));
   };
 
+  const newIdempotencyKey = () =>
+    window.crypto?.randomUUID
+      ? window.crypto.randomUUID()
+      : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 12)}`;
+
+  // Cada envio lleva su clave: si el service worker lo encola y lo reenvia,
+  // el servidor lo aplica una sola vez.
+  document.addEventListener("submit", (event) => {
+    const form = event.target.closest("form[data-offline-queue]");
+    if (!form) {
+      return;
+    }
+    let input = form.querySelector('input[name="idempotency_key"]');
+    if (!input) {
+      input = document.createElement("input");
+      input.type = "hidden";
+      input.name = "idempotency_key";
+      form.appendChild(input);
+    }
+    input.value = newIdempotencyKey();
+  });
+
+  const showQueueNotice = (category, message) => {
+    let stack = document.querySelector(".flash-stack");
+    if (!stack) {
+      stack = document.createElement("div");
+      stack.className = "flash-stack flash-stack-page";
+      document.body.appendChild(stack);
+    }
+    const notice = document.createElement("div");
+    notice.className = `flash ${category}`;
+    notice.setAttribute("role", "status");
+    notice.setAttribute("aria-live", "polite");
+    const text = document.createElement("span");
+    text.className = "flash-msg";
+    text.textContent = message;
+    notice.appendChild(text);
+    stack.appendChild(notice);
+    setTimeout(() => notice.remove(), 6000);
+  };
+
+  const handleQueueReport = ({ pending = 0, results = [] }) => {
+    const applied = results.filter((item) => item.result === "applied").length;
+    const conflicts = results.filter((item) => item.result === "conflict");
+    const rejected = results.filter((item) => item.result === "rejected").length;
+    const discarded = results
+      .filter((item) => item.result === "discarded")
+      .reduce((total, item) => total + (item.count || 0), 0);
+
+    if (applied) {
+      showQueueNotice("success", `Se sincronizaron ${applied} cambio(s) hechos sin conexion`);
+    }
+    conflicts.forEach((item) => {
+      const code = item.job?.code || "";
+      showQueueNotice(
+        "warning",
+        `El trabajo ${code} cambio en el servidor; tu cambio sin conexion no se aplico`
+      );
+    });
+    if (rejected) {
+      showQueueNotice("error", `${rejected} cambio(s) sin conexion fueron rechazados`);
+    }
+    if (discarded) {
+      showQueueNotice("warning", `Se descartaron ${discarded} cambio(s) de una sesion anterior`);
+    }
+    if (pending && !results.length) {
+      showQueueNotice("info", `${pending} cambio(s) pendientes; se enviaran al volver la conexion`);
+    }
+    if (applied || conflicts.length) {
+      window.TableSearch?.clearCache?.();
+    }
+  };
+
   window.addEventListener("load", () => {
     const swEnabled = Boolean(window.__SERVICE_WORKER_ENABLED__);
     const assetVersion = window.__ASSET_VERSION__ || "dev";
@@ -38,8 +113,27 @@
       return;
     }
     const swUrl = `/sw.js?v=${encodeURIComponent(assetVersion)}`;
-    navigator.serviceWorker.register(swUrl, { scope: "/" }).catch((error) => {
-      console.warn("No se pudo registrar el service worker", error);
+    navigator.serviceWorker.addEventListener("message", (event) => {
+      if (event.data?.type === "offline-queue") {
+        handleQueueReport(event.data);
+      }
     });
+    window.addEventListener("online", () => {
+      navigator.serviceWorker.controller?.postMessage({ type: "offline-queue-flush" });
+    });
+    navigator.serviceWorker
+      .register(swUrl, { scope: "/" })
+      .then(() => navigator.serviceWorker.ready)
+      .then((registration) => {
+        // Sin clave (login, sesion cerrada o cache desactivado) el SW borra
+        // las copias offline de trabajos.
+        registration.active?.postMessage({
+          type: "offline-cache",
+          key: window.__OFFLINE_CACHE_KEY__ || null
+        });
+      })
+      .catch((error) => {
+        console.warn("No se pudo registrar el service worker", error);
+      });
   });
 })();
@@ -31,31 +31,136 @@
 
   const toAbsoluteUrl = (targetUrl) => new URL(targetUrl, window.location.origin);
 
-  const fetchAndReplace = async (targetUrl, options = {}) => {
-    const { historyMode = "replace", signal } = options;
+  const toPartialUrl = (targetUrl) => {
     const requestUrl = toAbsoluteUrl(targetUrl);
     requestUrl.searchParams.set("partial", "1");
-    const pageUrl = toAbsoluteUrl(targetUrl);
+    return requestUrl.toString();
+  };
 
-    const paginationContainer = document.getElementById(PAGINATION_ID);
-    const tableContainer = document.getElementById(TABLE_ID);
-    setLoadingState(paginationContainer, true);
-    setLoadingState(tableContainer, true);
+  // Respuestas parciales recientes por URL. Cada entrada guarda la promesa del
+  // fetch, asi dos pedidos de la misma URL comparten una sola request.
+  const partialCache = (() => {
+    const TTL_MS = 30000;
+    const LIMIT = 30;
+    const entries = new Map();
 
-    try {
-      const response = await fetch(requestUrl.toString(), {
+    const remember = (url, entry) => {
+      entries.delete(url);
+      entries.set(url, entry);
+      while (entries.size > LIMIT) {
+        entries.delete(entries.keys().next().value);
+      }
+    };
+
+    const start = (url) => {
+      const controller = new AbortController();
+      const entry = { controller, waiters: 0, expires: Infinity };
+      entry.promise = fetch(url, {
         headers: {
           "X-Requested-With": "XMLHttpRequest",
         },
         credentials: "same-origin",
-        signal,
+        signal: controller.signal,
+      })
+        .then((response) => {
+          if (!response.ok) {
+            throw new Error("No se pudo cargar la pagina");
+          }
+          return response.text();
+        })
+        .then((html) => {
+          entry.expires = Date.now() + TTL_MS;
+          return html;
+        });
+      entry.promise.catch(() => {
+        if (entries.get(url) === entry) {
+          entries.delete(url);
+        }
       });
+      remember(url, entry);
+      return entry;
+    };
+
+    const lookup = (url) => {
+      const entry = entries.get(url);
+      if (entry && entry.expires > Date.now()) {
+        remember(url, entry);
+        return entry;
+      }
+      return start(url);
+    };
 
-      if (!response.ok) {
-        throw new Error("No se pudo cargar la pagina");
+    // Si se cancela el ultimo interesado y la respuesta no llego, se aborta
+    // la request real para no cargar al servidor con busquedas descartadas.
+    const get = (url, signal) => {
+      const entry = lookup(url);
+      if (!signal) {
+        return entry.promise;
       }
+      entry.waiters += 1;
+      return new Promise((resolve, reject) => {
+        const onAbort = () => {
+          entry.waiters -= 1;
+          if (entry.waiters === 0 && entry.expires === Infinity) {
+            entry.controller.abort();
+          }
+          reject(new DOMException("Aborted", "AbortError"));
+        };
+        if (signal.aborted) {
+          onAbort();
+          return;
+        }
+        signal.addEventListener("abort", onAbort, { once: true });
+        entry.promise.then(
+          (html) => {
+            signal.removeEventListener("abort", onAbort);
+            entry.waiters -= 1;
+            resolve(html);
+          },
+          (error) => {
+            signal.removeEventListener("abort", onAbort);
+            entry.waiters -= 1;
+            reject(error);
+          }
+        );
+      });
+    };
+
+    const prefetch = (targetUrl) => {
+      lookup(toPartialUrl(targetUrl)).promise.catch(() => {});
+    };
+
+    return { get, prefetch, clear: () => entries.clear() };
+  })();
 
-      const html = await response.text();
+  const whenIdle = (callback) => {
+    if ("requestIdleCallback" in window) {
+      window.requestIdleCallback(callback, { timeout: 2000 });
+    } else {
+      window.setTimeout(callback, 300);
+    }
+  };
+
+  const prefetchNextPage = () => {
+    const next = document.querySelector(`#${PAGINATION_ID} a.pagination-btn[rel="next"]`);
+    if (!next || navigator.connection?.saveData) {
+      return;
+    }
+    whenIdle(() => partialCache.prefetch(next.href));
+  };
+
+  const fetchAndReplace = async (targetUrl, options = {}) => {
+    const { historyMode = "replace", signal } = options;
+    const requestUrl = toPartialUrl(targetUrl);
+    const pageUrl = toAbsoluteUrl(targetUrl);
+
+    const paginationContainer = document.getElementById(PAGINATION_ID);
+    const tableContainer = document.getElementById(TABLE_ID);
+    setLoadingState(paginationContainer, true);
+    setLoadingState(tableContainer, true);
+
+    try {
+      const html = await partialCache.get(requestUrl, signal);
       const replaced = replacePartialContent(html);
       if (!replaced) {
         throw new Error("Respuesta parcial invalida");
@@ -69,11 +174,10 @@
 
       document.dispatchEvent(new CustomEvent("table:updated"));
       document.dispatchEvent(new CustomEvent("pagination:updated"));
+      prefetchNextPage();
       return true;
-    } catch (error) {
-      if (error?.name === "AbortError") {
-        return false;
-      }
+    } catch (_error) {
+      // Abortado o fallido: quien llama decide (la paginacion navega, la busqueda espera al proximo tipeo).
       return false;
     } finally {
       const currentPagination = document.getElementById(PAGINATION_ID);
@@ -134,7 +238,13 @@
 
       if (activeController) {
         activeController.abort();
+        activeController = null;
+      }
+      // La tabla ya muestra esa URL (p. ej. se borro lo tipeado): no hace falta pedirla.
+      if (target === `${window.location.pathname}${window.location.search}`) {
+        return;
       }
+
       activeController = new AbortController();
       requestSeq += 1;
       const seq = requestSeq;
@@ -185,8 +295,16 @@
     };
   };
 
+  if (document.readyState === "loading") {
+    document.addEventListener("DOMContentLoaded", prefetchNextPage, { once: true });
+  } else {
+    prefetchNextPage();
+  }
+
   window.TableSearch = {
     fetchAndReplace,
     createTableSearch,
+    prefetch: partialCache.prefetch,
+    clearCache: partialCache.clear,
   };
 })();
@@ -1,4 +1,4 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timezone
 from zoneinfo import ZoneInfo
 
 
@@ -30,3 +30,18 @@ def format_cordoba_datetime(value: datetime | None, fmt: str = "%d/%m/%Y %H:%M")
     if local_value is None:
         return "-"
     return local_value.strftime(fmt)
+
+
+def cordoba_month_bounds_utc(month_start: date) -> tuple[datetime, datetime]:
+    """Limites [inicio, fin) en UTC naive de un mes calendario de Cordoba."""
+    first_day = month_start.replace(day=1)
+    if first_day.month == 12:
+        next_first_day = date(first_day.year + 1, 1, 1)
+    else:
+        next_first_day = date(first_day.year, first_day.month + 1, 1)
+    start_local = datetime.combine(first_day, time.min, tzinfo=CORDOBA_TZ)
+    end_local = datetime.combine(next_first_day, time.min, tzinfo=CORDOBA_TZ)
+    return (
+        start_local.astimezone(timezone.utc).replace(tzinfo=None),
+        end_local.astimezone(timezone.utc).replace(tzinfo=None),
+    )
@@ -0,0 +1,117 @@
+"""Calentamiento de caches de proceso antes de atender trafico.
+
+Tras un deploy o el reciclado de un worker las primeras requests pagan la
+compilacion de templates Jinja, la compilacion de sentencias SQLAlchemy y la
+carga de reportlab. ``warm_up`` hace ese trabajo por adelantado.
+"""
+
+import logging
+import time
+
+from sqlalchemy import func
+
+from .extensions import db
+from .models import Bicycle, Client, Job, ServiceType, Store, User, Workshop
+
+
+logger = logging.getLogger("warmup")
+
+# Ningun registro tiene id 0: las consultas compilan y ejecutan sin traer filas.
+_NO_ID = 0
+
+
+def warm_templates(app):
+    names = [
+        name
+        for name in app.jinja_env.list_templates()
+        if name.endswith((".html", ".j2"))
+    ]
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
+
+
+def _hot_queries():
+    from .main.helpers import paginate_query
+    from .main.list_queries import (
+        bicycles_list_query,
+        clients_list_query,
+        jobs_list_query,
+    )
+
+    yield lambda: db.session.get(User, _NO_ID)
+    yield lambda: db.session.get(Workshop, _NO_ID)
+    yield lambda: Store.query.filter_by(workshop_id=_NO_ID).order_by(Store.name.asc()).all()
+    yield lambda: paginate_query(
+        jobs_list_query(_NO_ID, _NO_ID).order_by(Job.created_at.desc(), Job.id.desc()), 1
+    )
+    yield lambda: paginate_query(
+        clients_list_query(_NO_ID).order_by(Client.full_name.asc(), Client.id.asc()), 1
+    )
+    yield lambda: paginate_query(
+        bicycles_list_query(_NO_ID).order_by(Bicycle.id.desc()), 1
+    )
+    yield lambda: Client.query.filter_by(workshop_id=_NO_ID).count()
+    yield lambda: Bicycle.query.filter_by(workshop_id=_NO_ID).count()
+    yield lambda: ServiceType.query.filter_by(workshop_id=_NO_ID).count()
+    yield lambda: Job.query.filter_by(workshop_id=_NO_ID, store_id=_NO_ID).count()
+    yield lambda: (
+        db.session.query(Job.status, func.count(Job.id))
+        .filter(Job.workshop_id == _NO_ID, Job.store_id == _NO_ID)
+        .group_by(Job.status)
+        .all()
+    )
+    yield lambda: Job.query.filter(
+        Job.workshop_id == _NO_ID,
+        Job.store_id == _NO_ID,
+        Job.active_status_clause(),
+    ).count()
+
+
+def warm_queries():
+    """Ejecuta las consultas calientes para llenar el compiled cache del engine."""
+    count = 0
+    try:
+        for run_query in _hot_queries():
+            run_query()
+            count += 1
+    finally:
+        db.session.rollback()
+        db.session.remove()
+    return count
+
+
+def warm_pdf():
+    from .services.pdf_service import preload_pdf_resources
+
+    preload_pdf_resources()
+
+
+def warm_up(app):
+    """Precompila templates, consultas calientes y recursos del PDF.
+
+    Cada paso es independiente: si la base no esta disponible se registra el
+    error y se sigue con el resto.
+    """
+    started = time.perf_counter()
+    summary = {"templates": 0, "queries": 0, "pdf": False}
+    summary["templates"] = warm_templates(app)
+    with app.app_context():
+        try:
+            summary["queries"] = warm_queries()
+        except Exception:
+            logger.warning("warmup: no se pudieron precompilar consultas", exc_info=True)
+    try:
+        warm_pdf()
+        summary["pdf"] = True
+    except Exception:
+        logger.warning("warmup: no se pudo precargar reportlab", exc_info=True)
+    summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000)
+    logger.info(
+        "warmup: %s template(s), %s consulta(s), pdf=%s en %s ms",
+        summary["templates"],
+        summary["queries"],
+        summary["pdf"],
+        summary["elapsed_ms"],
+    )
+    return summary
@@ -1,15 +1,27 @@
 import multiprocessing
+import os
 
 # Worker config
 worker_class = "gthread"
-workers = multiprocessing.cpu_count() * 2 + 1
-threads = 2
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# Una instancia dedicada a /jobs/events puede subir los hilos (y
+# JOB_EVENTS_MAX_WAITERS): cada cliente en espera ocupa un hilo, no CPU.
+threads = int(os.environ.get("GUNICORN_THREADS", "2"))
 timeout = 30
 preload_app = True
 
-# Reciclado de workers (evita memory leaks)
-max_requests = 500
-max_requests_jitter = 50
+# Reciclado de workers por memoria: en lugar de reiniciar cada N requests
+# (y perder caches en memoria), se recicla solo el worker que supera el
+# presupuesto de RSS. 0 desactiva el chequeo.
+worker_max_rss_mb = int(os.environ.get("WORKER_MAX_RSS_MB", "512"))
+
+# Warm-up de templates, consultas y PDF antes de atender trafico.
+warmup_on_boot = os.environ.get("WARMUP_ON_BOOT", "true").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
 
 # Logging
 accesslog = "-"
@@ -19,3 +31,51 @@ loglevel = "info"
 
 # Bind
 bind = "0.0.0.0:5000"
+
+
+def when_ready(server):
+    # Con preload_app el warm-up corre una sola vez en el master y los
+    # workers heredan templates compilados, compiled cache y estilos del PDF.
+    if not (warmup_on_boot and server.cfg.preload_app):
+        return
+    from app.database import dispose_engines
+    from app.warmup import warm_up
+    from wsgi import app
+
+    warm_up(app)
+    dispose_engines(app, close=True)
+
+
+def post_worker_init(worker):
+    if not warmup_on_boot or worker.cfg.preload_app:
+        return
+    from app.warmup import warm_up
+
+    warm_up(worker.wsgi)
+
+
+def post_fork(server, worker):
+    # Con preload_app el engine se crea en el master; cada worker debe
+    # arrancar con su propio pool en lugar de compartir sockets heredados.
+    from app.database import dispose_engines
+    from wsgi import app
+
+    dispose_engines(app)
+
+
+def post_request(worker, req, environ, resp):
+    if worker_max_rss_mb <= 0:
+        return
+    from app.services.memory_service import current_rss_bytes
+
+    rss_mb = current_rss_bytes() / (1024 * 1024)
+    if rss_mb > worker_max_rss_mb and worker.alive:
+        worker.log.warning(
+            "Worker %s usa %.0f MB (limite %s MB); se recicla al terminar",
+            worker.pid,
+            rss_mb,
+            worker_max_rss_mb,
+        )
+        # Cierre ordenado: termina las requests en curso y el arbiter
+        # levanta un worker nuevo.
+        worker.alive = False
@@ -0,0 +1,23 @@
+"""Instancia dedicada a ``/jobs/events`` (SSE y long-poll).
+
+Cada cliente conectado ocupa un hilo esperando eventos, no CPU: pocos
+workers con muchos hilos. La app principal (``gunicorn.conf.py``) corre con
+``JOB_EVENTS_MAX_WAITERS=0`` y nunca bloquea un hilo; el proxy manda
+``/jobs/events`` a esta instancia.
+"""
+
+import os
+import runpy
+
+os.environ.setdefault("GUNICORN_WORKERS", "2")
+os.environ.setdefault("GUNICORN_THREADS", "64")
+# Un hilo por worker queda libre para responder sin esperar.
+os.environ.setdefault(
+    "JOB_EVENTS_MAX_WAITERS", str(int(os.environ["GUNICORN_THREADS"]) - 1)
+)
+# Solo sirve eventos: no hace falta precalentar templates ni PDF.
+os.environ.setdefault("WARMUP_ON_BOOT", "false")
+
+_base = runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), "gunicorn.conf.py"))
+globals().update({name: value for name, value in _base.items() if not name.startswith("__")})
+del _base
@@ -0,0 +1,48 @@
+"""add offline_mutations idempotency keys
+
+Revision ID: a7d3e9b1c5f8
+Revises: f5c9a3e7b2d4
+Create Date: 2026-04-07 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a7d3e9b1c5f8"
+down_revision = "f5c9a3e7b2d4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "offline_mutations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("workshop_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("idempotency_key", sa.String(length=64), nullable=False),
+        sa.Column("action", sa.String(length=20), nullable=False),
+        sa.Column("result", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["workshop_id"], ["workshops.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "workshop_id", "idempotency_key", name="uq_offline_mutations_workshop_key"
+        ),
+    )
+    op.create_index(
+        "ix_offline_mutations_created", "offline_mutations", ["created_at"], unique=False
+    )
+    op.create_index(
+        "ix_offline_mutations_user_id", "offline_mutations", ["user_id"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_offline_mutations_user_id", table_name="offline_mutations")
+    op.drop_index("ix_offline_mutations_created", table_name="offline_mutations")
+    op.drop_table("offline_mutations")
@@ -0,0 +1,118 @@
+"""add composite indexes for list and dashboard access paths
+
+Revision ID: b4d7e2f1a9c3
+Revises: a2b3c4d5e6f7
+Create Date: 2026-03-20 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b4d7e2f1a9c3"
+down_revision = "a2b3c4d5e6f7"
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATUSES_SQL = "status IN ('open', 'in_progress', 'ready')"
+
+INDEXES = [
+    (
+        "ix_jobs_workshop_store_created",
+        "jobs",
+        ["workshop_id", "store_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        None,
+    ),
+    (
+        "ix_jobs_active_delivery",
+        "jobs",
+        ["workshop_id", "store_id", "estimated_delivery_at"],
+        ACTIVE_STATUSES_SQL,
+    ),
+    (
+        "ix_clients_workshop_full_name",
+        "clients",
+        ["workshop_id", "full_name", "id"],
+        None,
+    ),
+    (
+        "ix_bicycles_workshop_id_desc",
+        "bicycles",
+        ["workshop_id", sa.text("id DESC")],
+        None,
+    ),
+]
+
+# Quedan cubiertos por el prefijo de los indices compuestos nuevos.
+REDUNDANT_INDEXES = [
+    ("ix_clients_workshop_id", "clients", ["workshop_id"]),
+    ("ix_bicycles_workshop_id", "bicycles", ["workshop_id"]),
+]
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transaccion,
+    # asi que en PostgreSQL salimos del bloque transaccional de Alembic.
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, columns, where in INDEXES:
+                op.create_index(
+                    name,
+                    table,
+                    columns,
+                    unique=False,
+                    postgresql_concurrently=True,
+                    postgresql_where=sa.text(where) if where else None,
+                    if_not_exists=True,
+                )
+            for name, table, _ in REDUNDANT_INDEXES:
+                op.drop_index(
+                    name,
+                    table_name=table,
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+        return
+
+    for name, table, columns, where in INDEXES:
+        op.create_index(
+            name,
+            table,
+            columns,
+            unique=False,
+            sqlite_where=sa.text(where) if where else None,
+        )
+    for name, table, _ in REDUNDANT_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, columns in REDUNDANT_INDEXES:
+                op.create_index(
+                    name,
+                    table,
+                    columns,
+                    unique=False,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+            for name, table, _, _ in reversed(INDEXES):
+                op.drop_index(
+                    name,
+                    table_name=table,
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+        return
+
+    for name, table, columns in REDUNDANT_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,72 @@
+"""add job_status_events
+
+Revision ID: b8e4f0c2d6a9
+Revises: a7d3e9b1c5f8
+Create Date: 2026-04-08 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b8e4f0c2d6a9"
+down_revision = "a7d3e9b1c5f8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "job_status_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("workshop_id", sa.Integer(), nullable=False),
+        sa.Column("store_id", sa.Integer(), nullable=False),
+        sa.Column("from_status", sa.String(length=40), nullable=True),
+        sa.Column("to_status", sa.String(length=40), nullable=False),
+        sa.Column("at", sa.DateTime(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["workshop_id"], ["workshops.id"]),
+        sa.ForeignKeyConstraint(["store_id"], ["stores.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_job_status_events_store_status_at",
+        "job_status_events",
+        ["store_id", "to_status", "at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_job_status_events_workshop_at",
+        "job_status_events",
+        ["workshop_id", "at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_job_status_events_job_at", "job_status_events", ["job_id", "at"], unique=False
+    )
+    # Para el ON DELETE SET NULL al borrar un usuario.
+    op.create_index(
+        "ix_job_status_events_user_id", "job_status_events", ["user_id"], unique=False
+    )
+    # El historial previo solo existe como texto en audit_logs: se registra
+    # el alta de cada trabajo para que los abiertos midan desde su ingreso.
+    op.execute(
+        """
+        INSERT INTO job_status_events (job_id, workshop_id, store_id, from_status, to_status, at)
+        SELECT id, workshop_id, store_id, NULL, 'open', created_at
+        FROM jobs
+        WHERE created_at IS NOT NULL
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_job_status_events_user_id", table_name="job_status_events")
+    op.drop_index("ix_job_status_events_job_at", table_name="job_status_events")
+    op.drop_index("ix_job_status_events_workshop_at", table_name="job_status_events")
+    op.drop_index("ix_job_status_events_store_status_at", table_name="job_status_events")
+    op.drop_table("job_status_events")
@@ -0,0 +1,60 @@
+"""add audit_logs indexes for tenant purge
+
+Revision ID: c2f6a8d4e1b7
+Revises: b8e4f0c2d6a9
+Create Date: 2026-04-12 00:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c2f6a8d4e1b7"
+down_revision = "b8e4f0c2d6a9"
+branch_labels = None
+depends_on = None
+
+# Cada tanda de anonimizacion busca filas por sucursal o por usuario; sin
+# estos indices cada tanda recorreria audit_logs completa.
+INDEXES = [
+    ("ix_audit_logs_store_id", "audit_logs", ["store_id"]),
+    ("ix_audit_logs_user_id", "audit_logs", ["user_id"]),
+]
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(
+                    name,
+                    table,
+                    columns,
+                    unique=False,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+        return
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, _ in reversed(INDEXES):
+                op.drop_index(
+                    name,
+                    table_name=table,
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+        return
+
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
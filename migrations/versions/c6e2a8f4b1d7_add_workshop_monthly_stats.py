@@ -0,0 +1,90 @@
+"""add workshop monthly stats rollup
+
+Revision ID: c6e2a8f4b1d7
+Revises: b4d7e2f1a9c3
+Create Date: 2026-03-24 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c6e2a8f4b1d7"
+down_revision = "b4d7e2f1a9c3"
+branch_labels = None
+depends_on = None
+
+# Mismo bucket que app.date_ranges.month_bucket en PostgreSQL.
+MONTH_BUCKET_SQL = (
+    "date_trunc('month', timezone('America/Argentina/Cordoba', "
+    "timezone('UTC', j.created_at)))::date"
+)
+
+
+def upgrade():
+    op.create_table(
+        "workshop_monthly_stats",
+        sa.Column(
+            "workshop_id",
+            sa.Integer(),
+            sa.ForeignKey("workshops.id"),
+            primary_key=True,
+        ),
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("jobs_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "service_revenue", sa.Numeric(14, 2), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "parts_revenue", sa.Numeric(14, 2), nullable=False, server_default="0"
+        ),
+        sa.Column("service_units", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("refreshed_at", sa.DateTime()),
+    )
+    op.create_index(
+        "ix_workshop_monthly_stats_month",
+        "workshop_monthly_stats",
+        ["month"],
+        unique=False,
+    )
+
+    # Carga inicial en PostgreSQL; en otros motores usar `flask refresh-monthly-stats`.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(
+        f"""
+        INSERT INTO workshop_monthly_stats (
+            workshop_id, month, jobs_count, service_revenue, parts_revenue,
+            service_units, refreshed_at
+        )
+        SELECT
+            j.workshop_id,
+            {MONTH_BUCKET_SQL} AS month,
+            count(*),
+            coalesce(sum(items.revenue), 0),
+            coalesce(sum(parts.revenue), 0),
+            coalesce(sum(items.units), 0),
+            now() AT TIME ZONE 'UTC'
+        FROM jobs j
+        LEFT JOIN (
+            SELECT job_id, sum(unit_price * quantity) AS revenue, sum(quantity) AS units
+            FROM job_items
+            GROUP BY job_id
+        ) items ON items.job_id = j.id
+        LEFT JOIN (
+            SELECT job_id, sum(unit_price * quantity) AS revenue
+            FROM job_parts
+            GROUP BY job_id
+        ) parts ON parts.job_id = j.id
+        WHERE j.created_at IS NOT NULL
+        GROUP BY j.workshop_id, {MONTH_BUCKET_SQL}
+        """
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_workshop_monthly_stats_month", table_name="workshop_monthly_stats"
+    )
+    op.drop_table("workshop_monthly_stats")
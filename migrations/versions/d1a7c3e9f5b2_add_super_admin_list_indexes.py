@@ -0,0 +1,58 @@
+"""add indexes for super admin keyset lists
+
+Revision ID: d1a7c3e9f5b2
+Revises: c6e2a8f4b1d7
+Create Date: 2026-03-26 00:00:00.000000
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d1a7c3e9f5b2"
+down_revision = "c6e2a8f4b1d7"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_users_role_id", "users", ["role", "id"]),
+    ("ix_audit_logs_workshop_created", "audit_logs", ["workshop_id", "created_at"]),
+]
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(
+                    name,
+                    table,
+                    columns,
+                    unique=False,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+        return
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, _ in reversed(INDEXES):
+                op.drop_index(
+                    name,
+                    table_name=table,
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+        return
+
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
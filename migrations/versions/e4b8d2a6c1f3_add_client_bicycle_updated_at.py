@@ -0,0 +1,29 @@
+"""add updated_at to clients and bicycles
+
+Revision ID: e4b8d2a6c1f3
+Revises: d1a7c3e9f5b2
+Create Date: 2026-04-02 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e4b8d2a6c1f3"
+down_revision = "d1a7c3e9f5b2"
+branch_labels = None
+depends_on = None
+
+TABLES = ("clients", "bicycles")
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column("updated_at", sa.DateTime(), nullable=True))
+        op.execute(f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL")
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,27 @@
+"""add data_version to workshops
+
+Revision ID: f5c9a3e7b2d4
+Revises: e4b8d2a6c1f3
+Create Date: 2026-04-06 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f5c9a3e7b2d4"
+down_revision = "e4b8d2a6c1f3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "workshops",
+        sa.Column("data_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade():
+    op.drop_column("workshops", "data_version")
@@ -8,6 +8,7 @@ COMPOSE_FILE="docker-compose.prod.yml"
 COMPOSE="docker compose -f ${COMPOSE_FILE}"
 DB_SERVICE="db"
 WEB_SERVICE="web"
+EVENTS_SERVICE="events"
 DB_NAME="biciservice_cc"
 DB_USER="postgres"
 MAX_BACKUPS=10
@@ -41,7 +42,7 @@ rollback() {
     # Rebuild con codigo anterior
     if [[ -n "${PREV_SHA}" ]]; then
         echo ">>> Rebuilding containers con codigo anterior..."
-        ${COMPOSE} up --build -d ${WEB_SERVICE} 2>/dev/null || true
+        ${COMPOSE} up --build -d ${WEB_SERVICE} ${EVENTS_SERVICE} 2>/dev/null || true
     fi
 
     echo ">>> ROLLBACK COMPLETADO (verificacion manual recomendada)"
@@ -130,7 +131,7 @@ echo ">>> ASSET_VERSION=${SHORT_SHA}"
 DEPLOY_PHASE="build"
 echo ">>> [4/6] Build y restart de contenedores..."
 
-${COMPOSE} up --build -d ${WEB_SERVICE}
+${COMPOSE} up --build -d ${WEB_SERVICE} ${EVENTS_SERVICE}
 
 # ─── Phase 5: Migrations ─────────────────────────────────────────────────────
 DEPLOY_PHASE="migrate"
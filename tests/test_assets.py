@@ -0,0 +1,83 @@
+import gzip
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.assets import build_assets, load_manifest, minify_js
+
+
+STATIC = Path(__file__).resolve().parents[1] / "app" / "static"
+
+
+@pytest.fixture
+def built_static(tmp_path):
+    for folder in ("css", "js"):
+        shutil.copytree(STATIC / folder, tmp_path / folder)
+    manifest = build_assets(str(tmp_path))
+    return tmp_path, manifest
+
+
+def test_build_writes_hashed_bundles_with_gzip_siblings(built_static):
+    static_folder, manifest = built_static
+
+    assert load_manifest(str(static_folder)) == manifest
+    css_path = static_folder / manifest["css/app.css"]
+    assert css_path.name.startswith("app.") and css_path.suffix == ".css"
+    css = css_path.read_text()
+    assert "@import" not in css
+    assert 'url("/static/fonts/SpaceGrotesk-Regular.woff2")' in css
+    assert gzip.decompress((static_folder / (manifest["css/app.css"] + ".gz")).read_bytes()) == css.encode()
+
+    bundle = (static_folder / manifest["js/app.js"]).read_text()
+    assert "window.TableSearch" in bundle
+    assert bundle.index("window.TableSearch =") < bundle.index("window.TableSearch.fetchAndReplace")
+    assert "js/pwa-register.js" in manifest
+
+
+def test_dist_files_are_served_precompressed_and_immutable(app, client, built_static):
+    static_folder, manifest = built_static
+    app.static_folder = str(static_folder)
+    app.extensions["asset_manifest"] = manifest
+
+    response = client.get(
+        f"/static/{manifest['css/app.css']}", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.mimetype == "text/css"
+    assert "immutable" in response.headers["Cache-Control"]
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+    plain = client.get(f"/static/{manifest['css/app.css']}")
+    assert "Content-Encoding" not in plain.headers
+
+    login_html = client.get("/login").get_data(as_text=True)
+    assert f"/static/{manifest['css/app.css']}" in login_html
+    sw = client.get("/sw.js").get_data(as_text=True)
+    assert f"/static/{manifest['js/app.js']}" in sw
+
+
+def test_minify_js_keeps_multiline_template_literals_intact():
+    source = (
+        "function row(job) {\n"
+        "    // comentario\n"
+        "    const url = 'http://example.com'; // fin\n"
+        "    return `\n"
+        "      <tr>\n"
+        "// no es un comentario\n"
+        "\n"
+        "      </tr>`;\n"
+        "}\n"
+    )
+
+    assert minify_js(source) == (
+        "function row(job) {\n"
+        "const url = 'http://example.com'; // fin\n"
+        "return `\n"
+        "      <tr>\n"
+        "// no es un comentario\n"
+        "\n"
+        "      </tr>`;\n"
+        "}\n"
+    )
@@ -18,6 +18,8 @@ def test_clients_search_finds_records_beyond_current_page(client, owner_user, lo
     page_one = client.get("/clients?page=1")
     assert page_one.status_code == 200
     assert "Cliente 12" not in page_one.get_data(as_text=True)
+    # pagination.js precarga en idle el link rel="next".
+    assert 'rel="next"' in page_one.get_data(as_text=True)
 
     response = client.get("/clients?q=Cliente 12")
     assert response.status_code == 200
@@ -0,0 +1,59 @@
+import gzip
+import zlib
+
+from flask import Response, stream_with_context
+
+from app.compression import compression_stats
+
+
+def test_html_is_gzipped_when_accepted_and_large_enough(app, client):
+    plain = client.get("/login")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    before = compression_stats()["responses"]
+    response = client.get("/login", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.get_data()) == plain.get_data()
+    assert int(response.headers["Content-Length"]) == len(response.get_data())
+    assert compression_stats()["responses"] == before + 1
+
+
+def test_small_and_binary_responses_are_not_compressed(app, client):
+    @app.get("/_tiny")
+    def tiny():
+        return "ok"
+
+    @app.get("/_pdf")
+    def pdf():
+        return Response(b"%PDF-" + b"x" * 5000, mimetype="application/pdf")
+
+    assert "Content-Encoding" not in client.get("/_tiny", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/_pdf", headers={"Accept-Encoding": "gzip"}).headers
+
+
+def test_streamed_responses_are_compressed_per_chunk(app, client):
+    @app.get("/_stream")
+    def stream():
+        def rows():
+            for index in range(200):
+                yield f"fila {index}\n"
+
+        return Response(stream_with_context(rows()), mimetype="text/csv")
+
+    response = client.get("/_stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    body = zlib.decompress(response.get_data(), zlib.MAX_WBITS | 16).decode()
+    assert body.splitlines()[-1] == "fila 199"
+
+
+def test_runtime_reports_compression_metrics(client, create_super_admin_user, login):
+    create_super_admin_user(email="root-compression@example.com")
+    login("root-compression@example.com", "Password1")
+    client.get("/login", headers={"Accept-Encoding": "gzip"})
+    stats = client.get("/admin/runtime").json["compression"]
+    assert stats["bytes_out"] < stats["bytes_in"]
+    assert 0 < stats["ratio"] < 1
@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import Client, JobItem, Workshop
+from tests.test_list_queries import _seed_job
+
+
+def _login_seeded(owner_user, login):
+    email = owner_user.email
+    workshop_id, _ = _seed_job(owner_user)
+    login(email, "Password1")
+    return workshop_id
+
+
+def test_unchanged_list_partial_returns_304_without_querying(client, owner_user, login):
+    _login_seeded(owner_user, login)
+
+    first = client.get("/clients?partial=1")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    statements = []
+
+    def _collect(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _collect)
+    try:
+        second = client.get("/clients?partial=1", headers={"If-None-Match": etag})
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _collect)
+
+    assert second.status_code == 304
+    assert second.get_data() == b""
+    assert not any("FROM clients" in statement for statement in statements)
+
+
+def test_writes_bump_workshop_version_and_etag(client, owner_user, login):
+    workshop_id = _login_seeded(owner_user, login)
+    etag = client.get("/clients?partial=1").headers["ETag"]
+    version = db.session.get(Workshop, workshop_id).data_version
+
+    db.session.add(
+        Client(workshop_id=workshop_id, client_code="200", full_name="Nuevo Cliente")
+    )
+    db.session.commit()
+
+    assert db.session.get(Workshop, workshop_id).data_version == version + 1
+    response = client.get("/clients?partial=1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Nuevo Cliente" in response.get_data(as_text=True)
+    assert response.headers["ETag"] != etag
+
+
+def test_job_item_changes_bump_version_through_the_job(app, owner_user):
+    workshop_id, _ = _seed_job(owner_user)
+    version = db.session.get(Workshop, workshop_id).data_version
+    item = JobItem.query.first()
+
+    item.unit_price = Decimal("99")
+    db.session.commit()
+
+    assert db.session.get(Workshop, workshop_id).data_version == version + 1
+
+
+def test_detail_page_uses_conditional_get(client, owner_user, login):
+    _login_seeded(owner_user, login)
+    customer = Client.query.first()
+
+    first = client.get(f"/clients/{customer.id}")
+    etag = first.headers["ETag"]
+    again = client.get(f"/clients/{customer.id}", headers={"If-None-Match": etag})
+
+    assert again.status_code == 304
+    assert again.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_etag_changes_when_the_day_changes(client, owner_user, login, monkeypatch):
+    import app.http_cache as http_cache
+
+    _login_seeded(owner_user, login)
+    etag = client.get("/jobs?status=overdue").headers["ETag"]
+
+    class _Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=1)
+
+    monkeypatch.setattr(http_cache, "date", _Tomorrow)
+    response = client.get("/jobs?status=overdue", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
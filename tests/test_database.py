@@ -0,0 +1,57 @@
+from app.config import _engine_options
+from app.database import dispose_engines, pool_status
+from app.extensions import db
+
+
+def test_engine_options_are_read_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "8")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+
+    options = _engine_options("postgresql+psycopg://u:p@db:5432/app")
+
+    assert options["pool_size"] == 8
+    assert options["max_overflow"] == 2
+    assert options["pool_pre_ping"] is False
+    assert options["pool_recycle"] == 1800
+    assert options["connect_args"]["options"] == "-c statement_timeout=5000"
+    assert _engine_options("sqlite:///local.db") == {}
+
+
+def test_pgbouncer_mode_skips_startup_options_and_prepared_statements(monkeypatch):
+    monkeypatch.setenv("DB_PGBOUNCER", "true")
+
+    connect_args = _engine_options("postgresql+psycopg://u:p@pgbouncer:6432/app")[
+        "connect_args"
+    ]
+
+    assert "options" not in connect_args
+    assert connect_args["prepare_threshold"] is None
+
+
+def test_health_is_a_plain_liveness_answer(client):
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json == {"status": "ok", "db": "connected"}
+
+
+def test_runtime_stats_are_super_admin_only(client, owner_user, create_super_admin_user, login):
+    login(owner_user.email, "Password1")
+    assert client.get("/admin/runtime").status_code == 302
+
+    client.get("/logout")
+    create_super_admin_user(email="root-runtime@example.com")
+    login("root-runtime@example.com", "Password1")
+    response = client.get("/admin/runtime")
+
+    assert response.status_code == 200
+    assert response.json["pool"]["class"] == "StaticPool"
+
+
+def test_dispose_engines_leaves_engine_usable(app):
+    dispose_engines(app)
+
+    assert db.session.execute(db.text("SELECT 1")).scalar() == 1
+    assert pool_status(db.engine)["class"] == "StaticPool"
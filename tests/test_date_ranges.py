@@ -0,0 +1,42 @@
+from datetime import date, datetime
+
+from sqlalchemy.dialects import postgresql
+
+from app.date_ranges import month_bucket, month_range_filters, parse_month_start
+from app.models import Job
+from app.timezone import cordoba_month_bounds_utc
+
+
+def test_cordoba_month_bounds_are_half_open_utc_range():
+    assert cordoba_month_bounds_utc(date(2026, 3, 15)) == (
+        datetime(2026, 3, 1, 3, 0),
+        datetime(2026, 4, 1, 3, 0),
+    )
+    assert cordoba_month_bounds_utc(date(2026, 12, 1)) == (
+        datetime(2026, 12, 1, 3, 0),
+        datetime(2027, 1, 1, 3, 0),
+    )
+
+
+def test_parse_month_start_falls_back_to_default():
+    default = date(2026, 1, 1)
+    assert parse_month_start("2026-05", default) == date(2026, 5, 1)
+    assert parse_month_start("mayo", default) == default
+    assert parse_month_start("", None) is None
+
+
+def test_month_filters_compare_bare_column_for_index_range_scan():
+    dialect = postgresql.dialect()
+    filters = month_range_filters(Job.created_at, date(2026, 5, 1))
+    compiled = [str(condition.compile(dialect=dialect)) for condition in filters]
+    assert compiled[0].startswith("jobs.created_at >= ")
+    assert compiled[1].startswith("jobs.created_at < ")
+    assert month_range_filters(Job.created_at, None) == []
+
+
+def test_month_bucket_uses_date_trunc_on_postgresql():
+    compiled = str(month_bucket(Job.created_at).compile(dialect=postgresql.dialect()))
+    assert compiled == (
+        "date_trunc('month', timezone('America/Argentina/Cordoba', "
+        "timezone('UTC', jobs.created_at)))"
+    )
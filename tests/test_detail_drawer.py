@@ -0,0 +1,49 @@
+from app.models import Bicycle, Client, Job
+from tests.test_list_queries import _seed_job
+
+
+def test_list_pages_link_drawer_fragments_instead_of_inline_templates(
+    client, owner_user, login
+):
+    email = owner_user.email
+    _seed_job(owner_user)
+    login(email, "Password1")
+
+    for path in ("/jobs?partial=1", "/clients?partial=1", "/bicycles?partial=1"):
+        html = client.get(path).get_data(as_text=True)
+        assert "<template" not in html
+        assert "/drawer" in html
+
+
+def test_drawer_fragments_render_entity_detail(client, owner_user, login):
+    email = owner_user.email
+    _seed_job(owner_user)
+    login(email, "Password1")
+    job = Job.query.filter_by(code="LQ01").first()
+    bicycle = Bicycle.query.first()
+    customer = Client.query.first()
+
+    job_html = client.get(f"/jobs/{job.id}/drawer").get_data(as_text=True)
+    assert "drawer-detail-body" in job_html
+    assert "Revisar frenos" in job_html
+    assert "Lavado, Frenos" in job_html
+
+    bicycle_html = client.get(f"/bicycles/{bicycle.id}/drawer").get_data(as_text=True)
+    assert "Rodado 29" in bicycle_html
+    assert "Ana Perez" in bicycle_html
+
+    client_html = client.get(f"/clients/{customer.id}/drawer").get_data(as_text=True)
+    assert "#100" in client_html
+
+
+def test_drawer_fragments_are_scoped_to_the_workshop(
+    client, owner_user, create_owner_user, login
+):
+    _seed_job(owner_user)
+    job = Job.query.filter_by(code="LQ01").first()
+    customer = Client.query.first()
+    other = create_owner_user(email="otro@example.com", workshop_name="Otro taller")
+    login(other.email, "Password1")
+
+    assert client.get(f"/jobs/{job.id}/drawer").status_code == 404
+    assert client.get(f"/clients/{customer.id}/drawer").status_code == 404
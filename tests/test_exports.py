@@ -0,0 +1,109 @@
+import csv
+import io
+import os
+import zipfile
+from datetime import date
+from decimal import Decimal
+from xml.etree import ElementTree
+
+from app.exports import csv_chunks, xlsx_chunks
+from app.extensions import db
+from app.models import User
+from tests.test_list_queries import _seed_job
+
+
+def _login_seeded(owner_user, login):
+    email = owner_user.email
+    _seed_job(owner_user)
+    login(email, "Password1")
+
+
+def _csv_rows(response):
+    return list(csv.reader(io.StringIO(response.get_data().decode("utf-8-sig"))))
+
+
+def test_jobs_export_streams_csv_with_list_filters(client, owner_user, login):
+    _login_seeded(owner_user, login)
+
+    response = client.get("/jobs/export?format=csv&status=open&q=frenos")
+
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    assert "attachment" in response.headers["Content-Disposition"]
+    header, row = _csv_rows(response)
+    assert header[:3] == ["codigo", "estado", "cliente"]
+    assert row[:3] == ["LQ01", "Abierto", "Ana Perez"]
+    assert sorted(row[6].split(", ")) == ["Frenos", "Lavado"]
+    assert row[9] == "20.00"
+
+    filtered = client.get("/jobs/export?status=closed")
+    assert len(_csv_rows(filtered)) == 1
+
+    other_month = client.get("/jobs/export?month=2001-01")
+    assert len(_csv_rows(other_month)) == 1
+
+
+def test_clients_and_bicycles_export_match_import_columns(client, owner_user, login):
+    _login_seeded(owner_user, login)
+
+    clients = _csv_rows(client.get("/clients/export?q=ana"))
+    bicycles = _csv_rows(client.get("/bicycles/export?brand=trek"))
+
+    assert clients == [
+        ["codigo", "nombre", "correo", "telefono", "bicicletas"],
+        ["100", "Ana Perez", "", "", "1"],
+    ]
+    assert bicycles == [
+        ["codigo_cliente", "cliente", "marca", "modelo", "descripcion"],
+        ["100", "Ana Perez", "Trek", "Marlin", "Rodado 29"],
+    ]
+
+
+def test_xlsx_export_is_a_valid_workbook(client, owner_user, login):
+    _login_seeded(owner_user, login)
+
+    response = client.get("/jobs/export?format=xlsx")
+
+    archive = zipfile.ZipFile(io.BytesIO(response.get_data()))
+    sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+    namespace = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+    rows = sheet.findall(".//s:row", namespace)
+    assert len(rows) == 2
+    assert rows[1].find("s:c/s:is/s:t", namespace).text == "LQ01"
+    assert "xl/workbook.xml" in archive.namelist()
+
+
+def test_writers_flush_in_chunks():
+    def rows():
+        for index in range(3000):
+            yield os.urandom(40).hex(), index
+
+    assert len(list(csv_chunks(("a", "b"), rows()))) > 1
+    chunks = list(xlsx_chunks("Hoja", ("a", "b"), rows()))
+    assert len(chunks) > 1
+    assert zipfile.ZipFile(io.BytesIO(b"".join(chunks))).testzip() is None
+
+
+def test_csv_escapes_text_that_looks_like_a_formula():
+    rows = [
+        ("=HYPERLINK(\"x\")", "+54 351", "-1", "@SUM(A1)", "\tx", "\rx", "Juan"),
+        (-5, Decimal("-2.50"), date(2026, 1, 2), None, "", "a=b", "Ana"),
+    ]
+
+    body = "".join(csv_chunks(("a", "b", "c", "d", "e", "f", "g"), rows)).lstrip("\ufeff")
+    parsed = list(csv.reader(io.StringIO(body)))
+
+    assert parsed[1] == ["'=HYPERLINK(\"x\")", "'+54 351", "'-1", "'@SUM(A1)", "'\tx", "'\rx", "Juan"]
+    assert parsed[2] == ["-5", "-2.50", "02/01/2026", "", "", "a=b", "Ana"]
+
+
+def test_export_is_owner_only(client, owner_user, login):
+    email = owner_user.email
+    _login_seeded(owner_user, login)
+    user = User.query.filter_by(email=email).one()
+    user.role = "staff"
+    db.session.commit()
+
+    response = client.get("/jobs/export")
+
+    assert response.status_code == 302
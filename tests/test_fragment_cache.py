@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+from flask import g
+from flask_wtf.csrf import generate_csrf
+
+from app.extensions import db
+from app.fragment_cache import FragmentCache
+from app.models import Client
+
+
+def _add_client(workshop_id, code, full_name):
+    item = Client()
+    item.workshop_id = workshop_id
+    item.client_code = code
+    item.full_name = full_name
+    item.phone = "555000"
+    db.session.add(item)
+    db.session.commit()
+    return item
+
+
+def test_client_rows_are_served_from_cache_until_updated(app, client, owner_user, login):
+    workshop = owner_user.workshops[0]
+    item = _add_client(workshop.id, "001", "Cliente Cache")
+    login(owner_user.email, "Password1")
+    cache = app.extensions["fragment_cache"]
+
+    first = client.get("/clients?partial=1").get_data(as_text=True)
+    assert "Cliente Cache" in first
+    hits_before = cache.hits
+    second = client.get("/clients?partial=1").get_data(as_text=True)
+    assert cache.hits == hits_before + 1
+    assert second == first
+
+    item.full_name = "Cliente Renombrado"
+    db.session.commit()
+    third = client.get("/clients?partial=1").get_data(as_text=True)
+    assert "Cliente Renombrado" in third
+    assert "Cliente Cache" not in third
+
+
+def test_fragments_are_scoped_per_workshop(app):
+    template = app.jinja_env.from_string('{% cache "row", 1 %}{{ label }}{% endcache %}')
+    with app.test_request_context("/"):
+        g.active_workshop = SimpleNamespace(id=1)
+        assert template.render(label="Taller uno") == "Taller uno"
+        assert template.render(label="otro") == "Taller uno"
+        g.active_workshop = SimpleNamespace(id=2)
+        assert template.render(label="Taller dos") == "Taller dos"
+
+
+def test_cached_fragments_do_not_leak_csrf_tokens(app):
+    app.config["WTF_CSRF_ENABLED"] = True
+    template = app.jinja_env.from_string(
+        '{% cache "row", 1 %}<input value="{{ csrf_token() }}">{% endcache %}'
+    )
+    with app.test_request_context("/"):
+        # g vive en el app context del fixture: cada "request" arranca sin token.
+        g.pop("csrf_token", None)
+        g.active_workshop = SimpleNamespace(id=1)
+        first = template.render(csrf_token=generate_csrf)
+        first_token = g.csrf_token
+    with app.test_request_context("/"):
+        g.pop("csrf_token", None)
+        g.active_workshop = SimpleNamespace(id=1)
+        second = template.render(csrf_token=generate_csrf)
+        second_token = g.csrf_token
+
+    assert first_token != second_token
+    assert first_token in first
+    assert second_token in second
+    assert first_token not in second
+
+
+def test_fragment_cache_evicts_least_recently_used():
+    cache = FragmentCache(2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"
+    cache.set("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert len(cache) == 2
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Presupuesto generoso para CI; la idea es detectar regresiones grandes
+# (una dependencia pesada importada en el arranque), no medir microsegundos.
+IMPORT_TIME_BUDGET_MS = int(os.environ.get("IMPORT_TIME_BUDGET_MS", "2500"))
+LAZY_MODULES = ("PIL.Image", "reportlab.platypus", "pyotp")
+BOOT_SNIPPET = "from app import create_app; create_app()"
+
+
+def _run_python(*args):
+    env = dict(os.environ, DATABASE_URL="sqlite://", PYTHONDONTWRITEBYTECODE="1")
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _total_import_time_ms(importtime_output):
+    total_us = 0
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        # Solo los imports de primer nivel: su tiempo acumulado ya incluye
+        # el de sus dependencias.
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000
+
+
+def test_create_app_does_not_import_heavy_optional_modules():
+    result = _run_python(
+        "-c",
+        f"import sys; {BOOT_SNIPPET}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))",
+    )
+
+    assert result.stdout.strip() == ""
+
+
+def test_create_app_import_time_within_budget():
+    result = _run_python("-X", "importtime", "-c", BOOT_SNIPPET)
+
+    total_ms = _total_import_time_ms(result.stderr)
+
+    assert 0 < total_ms < IMPORT_TIME_BUDGET_MS, (
+        f"create_app importa en {total_ms:.0f} ms "
+        f"(presupuesto {IMPORT_TIME_BUDGET_MS} ms)"
+    )
@@ -0,0 +1,51 @@
+from datetime import date
+
+from app.extensions import db
+from app.main.list_queries import bicycles_list_query, clients_list_query, jobs_list_query
+from app.models import Bicycle, Client, Job
+
+
+def _query_plan(query):
+    statement = query.statement if hasattr(query, "statement") else query
+    sql = str(statement.compile(db.engine, compile_kwargs={"literal_binds": True}))
+    rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def test_jobs_list_uses_created_at_index(app):
+    query = (
+        jobs_list_query(1, 1)
+        .order_by(Job.created_at.desc(), Job.id.desc())
+        .limit(10)
+    )
+    plan = _query_plan(query)
+    assert "ix_jobs_workshop_store_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_clients_list_uses_full_name_index(app):
+    query = (
+        clients_list_query(1)
+        .order_by(Client.full_name.asc(), Client.id.asc())
+        .limit(10)
+    )
+    plan = _query_plan(query)
+    assert "ix_clients_workshop_full_name" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_bicycles_list_uses_id_desc_index(app):
+    query = bicycles_list_query(1).order_by(Bicycle.id.desc()).limit(10)
+    plan = _query_plan(query)
+    assert "ix_bicycles_workshop_id_desc" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_overdue_jobs_use_partial_active_delivery_index(app):
+    query = Job.query.filter(
+        Job.workshop_id == 1,
+        Job.store_id == 1,
+        Job.active_status_clause(),
+        Job.estimated_delivery_at < date(2026, 3, 1),
+    )
+    assert "ix_jobs_active_delivery" in _query_plan(query)
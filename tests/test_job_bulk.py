@@ -0,0 +1,115 @@
+import io
+import zipfile
+
+from app.extensions import db
+from app.models import AuditLog, Job, JobItem, JobStatusEvent, Workshop, WorkshopMonthlyStat
+from tests.test_list_queries import _seed_job
+
+
+def _seed_jobs(owner_user, login, status="open"):
+    email = owner_user.email
+    _seed_job(owner_user)
+    first = Job.query.filter_by(code="LQ01").one()
+    second = Job(
+        workshop_id=first.workshop_id,
+        store_id=first.store_id,
+        bicycle_id=first.bicycle_id,
+        code="LQ02",
+        status=status,
+        estimated_delivery_at=first.estimated_delivery_at,
+    )
+    db.session.add(second)
+    db.session.commit()
+    login(email, "Password1")
+    return first, second
+
+
+def _audits(action):
+    return AuditLog.query.filter_by(entity_type="job", action=action).count()
+
+
+def test_bulk_status_change_updates_all_jobs_in_one_go(client, owner_user, login):
+    first, second = _seed_jobs(owner_user, login)
+    workshop_id = first.workshop_id
+    version = db.session.get(Workshop, workshop_id).data_version or 0
+    audits = _audits("update")
+    updated_at = first.updated_at
+
+    response = client.post(
+        "/jobs/bulk",
+        data={"action": "status", "status": "ready", "job_ids": [first.id, second.id]},
+        follow_redirects=True,
+    )
+
+    assert "Estado actualizado en 2 trabajos" in response.get_data(as_text=True)
+    db.session.expire_all()
+    assert {job.status for job in Job.query.all()} == {"ready"}
+    assert db.session.get(Job, first.id).updated_at > updated_at
+    assert _audits("update") == audits + 2
+    transitions = JobStatusEvent.query.filter_by(to_status="ready").all()
+    assert sorted(event.job_id for event in transitions) == sorted([first.id, second.id])
+    assert all(event.from_status == "open" and event.user_id for event in transitions)
+    assert db.session.get(Workshop, workshop_id).data_version > version
+
+
+def test_bulk_rejects_unknown_ids_without_changes(client, owner_user, login):
+    first, _ = _seed_jobs(owner_user, login)
+
+    response = client.post(
+        "/jobs/bulk",
+        data={"action": "status", "status": "ready", "job_ids": [first.id, 999999]},
+        follow_redirects=True,
+    )
+
+    assert "Algunos trabajos ya no existen" in response.get_data(as_text=True)
+    db.session.expire_all()
+    assert db.session.get(Job, first.id).status == "open"
+
+
+
+def test_bulk_limit_reads_app_config(app, client, owner_user, login):
+    first, second = _seed_jobs(owner_user, login)
+    app.config["JOBS_BULK_MAX"] = 1
+
+    response = client.post(
+        "/jobs/bulk",
+        data={"action": "status", "status": "ready", "job_ids": [first.id, second.id]},
+        follow_redirects=True,
+    )
+
+    assert "Puedes seleccionar hasta 1 trabajos" in response.get_data(as_text=True)
+    db.session.expire_all()
+    assert {job.status for job in Job.query.all()} == {"open"}
+
+def test_bulk_delete_keeps_in_progress_guard(client, owner_user, login):
+    first, second = _seed_jobs(owner_user, login, status="in_progress")
+    job_ids = [first.id, second.id]
+
+    blocked = client.post(
+        "/jobs/bulk", data={"action": "delete", "job_ids": job_ids}, follow_redirects=True
+    )
+    assert "No puedes eliminar trabajos en proceso: LQ02" in blocked.get_data(as_text=True)
+    assert Job.query.count() == 2
+
+    second.status = "cancelled"
+    db.session.commit()
+    client.post("/jobs/bulk", data={"action": "delete", "job_ids": job_ids})
+
+    db.session.expire_all()
+    assert Job.query.count() == 0
+    assert JobItem.query.count() == 0
+    assert _audits("delete") == 2
+    assert sum(stat.jobs_count for stat in WorkshopMonthlyStat.query.all()) == 0
+
+
+def test_bulk_pdf_returns_zip_with_printable_jobs(client, owner_user, login):
+    first, second = _seed_jobs(owner_user, login, status="ready")
+
+    response = client.post(
+        "/jobs/bulk", data={"action": "pdf", "job_ids": [first.id, second.id]}
+    )
+
+    assert response.mimetype == "application/zip"
+    names = zipfile.ZipFile(io.BytesIO(response.data)).namelist()
+    assert len(names) == 1
+    assert names[0].startswith("LQ02_")
@@ -0,0 +1,98 @@
+import json
+from decimal import Decimal
+
+from app.extensions import db
+from app.models import Job, JobItem
+from tests.test_list_queries import _seed_job
+
+
+def _login_seeded(owner_user, login):
+    email = owner_user.email
+    _seed_job(owner_user)
+    login(email, "Password1")
+    return Job.query.filter_by(code="LQ01").one()
+
+
+def _events(app, store_id):
+    return app.extensions["job_events"].since(store_id, 0)[0]
+
+
+def test_status_change_is_published_and_served_by_long_poll(app, client, owner_user, login):
+    job = _login_seeded(owner_user, login)
+    store_id = job.store_id
+    created = _events(app, store_id)
+    assert [event["type"] for event in created] == ["created"]
+
+    client.post(f"/jobs/{job.id}/status", data={"status": "ready"})
+
+    response = client.get(
+        f"/jobs/events?after={created[0]['id']}", headers={"Accept": "application/json"}
+    )
+    body = response.get_json()
+    assert response.headers["Cache-Control"] == "no-store"
+    assert [(event["type"], event["status"]) for event in body["events"]] == [("status", "ready")]
+    assert body["last_id"] == body["events"][0]["id"]
+    assert body["retry_ms"] == 0
+
+
+def test_item_changes_publish_update_and_rollback_publishes_nothing(app, owner_user):
+    workshop_id, store_id = _seed_job(owner_user)
+    item = JobItem.query.first()
+
+    item.unit_price = Decimal("50")
+    db.session.commit()
+    job = db.session.get(Job, item.job_id)
+    job.status = "closed"
+    db.session.flush()
+    db.session.rollback()
+
+    assert [event["type"] for event in _events(app, store_id)] == ["created", "updated"]
+
+
+def test_event_stream_replays_missed_events(app, client, owner_user, login):
+    app.config["JOB_EVENTS_STREAM_SECONDS"] = 0
+    job = _login_seeded(owner_user, login)
+    created = _events(app, job.store_id)[0]
+
+    response = client.get(
+        "/jobs/events",
+        headers={"Accept": "text/event-stream", "Last-Event-ID": str(created["id"] - 1)},
+    )
+
+    assert response.mimetype == "text/event-stream"
+    body = response.get_data(as_text=True)
+    assert body.startswith("retry: ")
+    payload = body.split("event: job\ndata: ", 1)[1].split("\n", 1)[0]
+    assert json.loads(payload)["job_id"] == job.id
+
+
+def test_row_and_agenda_fragments(client, owner_user, login):
+    job = _login_seeded(owner_user, login)
+
+    row = client.get(f"/jobs/{job.id}/row").get_data(as_text=True)
+    assert row.lstrip().startswith("<tr")
+    assert f'data-job-id="{job.id}"' in row
+    assert f'data-job-id="{job.id}"' in client.get(f"/jobs/{job.id}/agenda-item").get_data(as_text=True)
+
+    job.status = "closed"
+    db.session.commit()
+    assert client.get(f"/jobs/{job.id}/agenda-item").status_code == 204
+
+
+def test_default_config_never_waits_and_sends_ids_as_text(app, client, owner_user, login):
+    job = _login_seeded(owner_user, login)
+    created = _events(app, job.store_id)[0]
+    assert created["id"] > 2**53
+
+    caught_up = client.get(
+        f"/jobs/events?after={created['id'] - 1}", headers={"Accept": "application/json"}
+    ).get_json()
+    assert caught_up["events"][0]["id"] == str(created["id"])
+    assert caught_up["last_id"] == str(created["id"])
+
+    idle = client.get(
+        f"/jobs/events?after={created['id']}", headers={"Accept": "application/json"}
+    ).get_json()
+    assert app.config["JOB_EVENTS_MAX_WAITERS"] == 0
+    assert idle["events"] == []
+    assert idle["retry_ms"] == 15000
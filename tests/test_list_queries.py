@@ -0,0 +1,87 @@
+from datetime import date
+from decimal import Decimal
+
+from app.extensions import db
+from app.main.list_queries import (
+    bicycle_rows,
+    bicycles_list_query,
+    client_rows,
+    clients_list_query,
+    job_rows,
+    jobs_list_query,
+)
+from app.models import Bicycle, Client, Job, JobItem, ServiceType
+from tests.conftest import get_or_create_brand
+
+
+def _seed_job(owner_user):
+    workshop = owner_user.workshops[0]
+    store = owner_user.store
+
+    client = Client(workshop_id=workshop.id, client_code="100", full_name="Ana Perez")
+    db.session.add(client)
+    db.session.flush()
+
+    brand = get_or_create_brand(workshop.id, "Trek")
+    bicycle = Bicycle(
+        workshop_id=workshop.id,
+        client_id=client.id,
+        brand_id=brand.id,
+        model="Marlin",
+        description="Rodado 29",
+    )
+    db.session.add(bicycle)
+    db.session.flush()
+
+    job = Job(
+        workshop_id=workshop.id,
+        store_id=store.id,
+        bicycle_id=bicycle.id,
+        code="LQ01",
+        status="open",
+        notes="Revisar frenos",
+        estimated_delivery_at=date.today(),
+    )
+    db.session.add(job)
+    db.session.flush()
+
+    for name in ("Lavado", "Frenos"):
+        service = ServiceType(workshop_id=workshop.id, name=name, base_price=Decimal("10"))
+        db.session.add(service)
+        db.session.flush()
+        db.session.add(
+            JobItem(job_id=job.id, service_type_id=service.id, quantity=1, unit_price=Decimal("10"))
+        )
+    db.session.commit()
+    ids = (workshop.id, store.id)
+    db.session.expunge_all()
+    return ids
+
+
+def test_job_rows_keep_template_attribute_names_without_loading_entities(owner_user):
+    workshop_id, store_id = _seed_job(owner_user)
+
+    rows = job_rows(jobs_list_query(workshop_id, store_id).all())
+
+    assert len(rows) == 1
+    job = rows[0]
+    assert job.code == "LQ01"
+    assert job.bicycle.client.full_name == "Ana Perez"
+    assert job.bicycle.brand_rel.name == "Trek"
+    assert job.bicycle.model == "Marlin"
+    assert [item.service_type.name for item in job.items] == ["Lavado", "Frenos"]
+    assert not any(isinstance(obj, Job) for obj in db.session.identity_map.values())
+
+
+def test_bicycle_and_client_rows_are_projected(owner_user):
+    workshop_id, _ = _seed_job(owner_user)
+
+    bicycles = bicycle_rows(bicycles_list_query(workshop_id).all())
+    clients = client_rows(clients_list_query(workshop_id).all())
+
+    assert bicycles[0].description == "Rodado 29"
+    assert bicycles[0].client.full_name == "Ana Perez"
+    assert clients[0].bicycle_count == 1
+    assert not any(
+        isinstance(obj, (Bicycle, Client)) for obj in db.session.identity_map.values()
+    )
@@ -0,0 +1,39 @@
+from app.services.memory_service import MemoryService, current_rss_bytes
+
+
+def test_current_rss_bytes_is_positive():
+    assert current_rss_bytes() > 0
+
+
+def test_memory_page_is_super_admin_only(client, owner_user, login):
+    login(owner_user.email, "Password1")
+
+    response = client.get("/admin/memory")
+
+    assert response.status_code == 302
+
+
+def test_tracemalloc_diff_reports_growing_allocation_sites(
+    client, create_super_admin_user, login
+):
+    create_super_admin_user(email="root-memory@example.com")
+    login("root-memory@example.com", "Password1")
+
+    retained = []
+    try:
+        client.post("/admin/memory/start")
+        client.post("/admin/memory/baseline")
+        retained.extend(bytearray(1024) for _ in range(512))
+
+        html = client.get("/admin/memory").get_data(as_text=True)
+
+        assert "test_memory_diagnostics.py" in html
+        assert MemoryService.status()["has_baseline"] is True
+    finally:
+        client.post("/admin/memory/stop")
+        retained.clear()
+
+    assert MemoryService.status()["tracing"] is False
+    assert "Todavia no hay snapshot base" in client.get("/admin/memory").get_data(
+        as_text=True
+    )
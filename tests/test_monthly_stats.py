@@ -0,0 +1,179 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import JobPart, WorkshopMonthlyStat
+from app.services.stats_service import StatsService
+from tests.test_approval import _create_dashboard_job
+
+
+def _stat_rows():
+    return {
+        (row.workshop_id, row.month): row
+        for row in WorkshopMonthlyStat.query.all()
+    }
+
+
+def test_rollup_is_maintained_on_commit(owner_user):
+    workshop_id = owner_user.workshops[0].id
+    job = _create_dashboard_job(
+        owner_user,
+        code="ROLL-1",
+        created_at=datetime(2026, 3, 10, 15, 0),
+        service_price="1000.00",
+        part_price="250.00",
+    )
+
+    row = _stat_rows()[(workshop_id, date(2026, 3, 1))]
+    assert row.jobs_count == 1
+    assert row.service_revenue == Decimal("1000.00")
+    assert row.parts_revenue == Decimal("250.00")
+    assert row.service_units == 1
+
+    # 02:00 UTC del 1 de abril sigue siendo marzo en Cordoba.
+    job.created_at = datetime(2026, 4, 1, 2, 0)
+    db.session.commit()
+    assert (workshop_id, date(2026, 3, 1)) in _stat_rows()
+
+    job.created_at = datetime(2026, 4, 1, 4, 0)
+    db.session.commit()
+    rows = _stat_rows()
+    assert (workshop_id, date(2026, 3, 1)) not in rows
+    assert rows[(workshop_id, date(2026, 4, 1))].jobs_count == 1
+
+    db.session.delete(job)
+    db.session.commit()
+    assert _stat_rows() == {}
+
+
+def test_item_changes_apply_deltas_without_reaggregating_the_month(owner_user):
+    workshop_id = owner_user.workshops[0].id
+    job = _create_dashboard_job(
+        owner_user,
+        code="ROLL-5",
+        created_at=datetime(2026, 3, 10, 15, 0),
+        service_price="1000.00",
+    )
+    item = job.items[0]
+
+    statements = []
+
+    def _collect(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _collect)
+    try:
+        item.quantity = 3
+        db.session.add(JobPart(job=job, description="Cadena", quantity=2, unit_price=Decimal("50")))
+        db.session.commit()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _collect)
+
+    assert not any("count(jobs.id)" in statement for statement in statements)
+    row = _stat_rows()[(workshop_id, date(2026, 3, 1))]
+    assert row.jobs_count == 1
+    assert row.service_revenue == Decimal("3000.00")
+    assert row.parts_revenue == Decimal("100.00")
+    assert row.service_units == 3
+
+    db.session.delete(item)
+    db.session.commit()
+    row = _stat_rows()[(workshop_id, date(2026, 3, 1))]
+    assert row.service_revenue == Decimal("0")
+    assert row.service_units == 0
+
+
+def test_missing_rollup_row_is_rebuilt_from_the_month(owner_user):
+    workshop_id = owner_user.workshops[0].id
+    job = _create_dashboard_job(
+        owner_user,
+        code="ROLL-6",
+        created_at=datetime(2026, 3, 10, 15, 0),
+        service_price="400.00",
+    )
+    WorkshopMonthlyStat.query.delete()
+    db.session.commit()
+
+    job.items[0].unit_price = Decimal("500.00")
+    db.session.commit()
+
+    row = _stat_rows()[(workshop_id, date(2026, 3, 1))]
+    assert row.jobs_count == 1
+    assert row.service_revenue == Decimal("500.00")
+
+
+def test_refresh_range_rebuilds_rollup(owner_user):
+    workshop_id = owner_user.workshops[0].id
+    _create_dashboard_job(
+        owner_user,
+        code="ROLL-2",
+        created_at=datetime(2026, 1, 5, 12, 0),
+        service_price="500.00",
+    )
+    _create_dashboard_job(
+        owner_user,
+        code="ROLL-3",
+        created_at=datetime(2026, 1, 20, 12, 0),
+        service_price="700.00",
+        part_price="100.00",
+    )
+    WorkshopMonthlyStat.query.delete()
+    db.session.commit()
+
+    written = StatsService.refresh_range(date(2025, 12, 1), date(2026, 2, 1))
+
+    assert written == 1
+    row = _stat_rows()[(workshop_id, date(2026, 1, 1))]
+    assert row.jobs_count == 2
+    assert row.service_revenue == Decimal("1200.00")
+    assert row.parts_revenue == Decimal("100.00")
+
+    totals = StatsService.platform_monthly_totals(date(2025, 12, 1), date(2026, 2, 1))
+    assert list(totals) == [date(2026, 1, 1)]
+    assert totals[date(2026, 1, 1)]["service_units"] == 2
+
+
+def test_refresh_monthly_stats_command(app, owner_user):
+    _create_dashboard_job(
+        owner_user,
+        code="ROLL-4",
+        created_at=datetime.utcnow(),
+        service_price="300.00",
+    )
+    WorkshopMonthlyStat.query.delete()
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["refresh-monthly-stats", "--months", "2"])
+
+    assert result.exit_code == 0
+    assert "Rollup mensual actualizado: 1 fila(s)" in result.output
+    assert WorkshopMonthlyStat.query.count() == 1
+
+
+def test_super_admin_dashboard_shows_month_over_month_trend(
+    owner_user, create_super_admin_user, login, client
+):
+    _create_dashboard_job(
+        owner_user,
+        code="TREND-1",
+        created_at=datetime(2026, 4, 10, 12, 0),
+        service_price="1000.00",
+    )
+    _create_dashboard_job(
+        owner_user,
+        code="TREND-2",
+        created_at=datetime(2026, 5, 10, 12, 0),
+        service_price="1500.00",
+    )
+    create_super_admin_user(email="trend-admin@example.com")
+    login("trend-admin@example.com", "Password1")
+
+    response = client.get("/admin/dashboard?month=2026-05")
+
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    assert "Evolucion mensual" in html
+    assert "Junio 2024" in html
+    assert "+50.0%" in html
@@ -0,0 +1,99 @@
+from app.extensions import db
+from app.models import AuditLog, Job, OfflineMutation, User
+from app.services.offline_mutation_service import version_token
+from tests.test_list_queries import _seed_job
+from tests.test_status_history import _delete_with_foreign_keys, _staff_user
+
+
+JSON = {"Accept": "application/json"}
+
+
+def _login_seeded(owner_user, login):
+    email = owner_user.email
+    _seed_job(owner_user)
+    login(email, "Password1")
+    return Job.query.filter_by(code="LQ01").one()
+
+
+def _status_audits():
+    return AuditLog.query.filter_by(entity_type="job", action="update").count()
+
+
+def test_replayed_status_change_applies_and_audits_once(client, owner_user, login):
+    job = _login_seeded(owner_user, login)
+    payload = {
+        "status": "in_progress",
+        "idempotency_key": "k-1",
+        "base_version": version_token(job.updated_at),
+    }
+
+    first = client.post(f"/jobs/{job.id}/status", data=payload, headers=JSON)
+    second = client.post(f"/jobs/{job.id}/status", data=payload, headers=JSON)
+
+    assert first.status_code == 200
+    assert first.get_json()["result"] == "applied"
+    assert second.get_json() == {**first.get_json(), "duplicate": True}
+    assert _status_audits() == 1
+    assert OfflineMutation.query.count() == 1
+
+
+def test_stale_base_version_is_reported_as_conflict(client, owner_user, login):
+    job = _login_seeded(owner_user, login)
+    stale = version_token(job.updated_at)
+    job.notes = "Cambio en el servidor"
+    db.session.commit()
+
+    response = client.post(
+        f"/jobs/{job.id}/status",
+        data={"status": "ready", "idempotency_key": "k-2", "base_version": stale},
+        headers=JSON,
+    )
+
+    assert response.status_code == 409
+    body = response.get_json()
+    assert body["result"] == "conflict"
+    assert body["job"]["status"] == "open"
+    assert db.session.get(Job, job.id).status == "open"
+
+    same_value = client.post(
+        f"/jobs/{job.id}/notes",
+        data={"notes": "Cambio en el servidor", "idempotency_key": "k-3", "base_version": stale},
+        headers=JSON,
+    )
+    assert same_value.get_json()["result"] == "applied"
+
+
+def test_notes_form_updates_job_and_csrf_token_endpoint(client, owner_user, login):
+    job = _login_seeded(owner_user, login)
+
+    response = client.post(
+        f"/jobs/{job.id}/notes", data={"notes": "  Cambiar cadena  "}, follow_redirects=True
+    )
+
+    assert "Notas actualizadas" in response.get_data(as_text=True)
+    assert db.session.get(Job, job.id).notes == "Cambiar cadena"
+
+    token = client.get("/csrf-token")
+    assert token.headers["Cache-Control"] == "no-store"
+    assert token.get_json()["csrf_token"]
+
+
+def test_deleting_a_user_keeps_their_idempotency_keys(client, owner_user, login):
+    staff_id = _staff_user(owner_user)
+    job = _login_seeded(owner_user, login)
+    db.session.add(
+        OfflineMutation(
+            workshop_id=job.workshop_id,
+            user_id=staff_id,
+            job_id=job.id,
+            idempotency_key="k-staff",
+            action="status",
+            result="applied",
+        )
+    )
+
+    response = _delete_with_foreign_keys(client, staff_id)
+
+    assert "Usuario eliminado" in response.get_data(as_text=True)
+    assert db.session.get(User, staff_id) is None
+    assert OfflineMutation.query.filter_by(idempotency_key="k-staff").one().user_id is None
@@ -111,3 +111,35 @@ def test_app_css_is_served_with_no_store(client):
     ]
     for path in expected_imports:
         assert f'{path}?v={expected_version}' in body
+
+
+def test_service_worker_caches_jobs_offline_per_session(client):
+    body = client.get("/sw.js").get_data(as_text=True)
+
+    assert 'PRIVATE_CACHE_PREFIX = "service-bicycle-private-"' in body
+    assert f"OFFLINE_TTL_MS = {12 * 3600 * 1000};" in body
+    assert "OFFLINE_MAX_ENTRIES = 60;" in body
+    assert 'data.type !== "offline-cache"' in body
+
+
+def test_offline_cache_key_is_scoped_to_session_and_cleared_on_logout(
+    owner_user, login, client, app
+):
+    email = owner_user.email
+    app.testing = False
+    app.config["OFFLINE_CACHE_ENABLED"] = True
+    try:
+        html = login(email, "Password1").get_data(as_text=True)
+        with client.session_transaction() as session:
+            key = session["offline_cache_key"]
+        assert f'window.__OFFLINE_CACHE_KEY__ = "{key}";' in html
+
+        response = client.get("/logout")
+        assert response.headers["Clear-Site-Data"] == '"cache"'
+        with client.session_transaction() as session:
+            assert "offline_cache_key" not in session
+        login_html = client.get("/login").get_data(as_text=True)
+        assert "__OFFLINE_CACHE_KEY__" not in login_html
+    finally:
+        app.testing = True
+        app.config["OFFLINE_CACHE_ENABLED"] = False
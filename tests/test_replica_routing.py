@@ -0,0 +1,114 @@
+import shutil
+from datetime import datetime, timezone
+
+import pytest
+from flask import g
+
+from app import create_app
+from app.extensions import db
+from app.models import Client, Store, User, Workshop
+from tests.conftest import TestingConfig
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    primary_path = tmp_path / "primary.db"
+    replica_path = tmp_path / "replica.db"
+
+    class ReplicaConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{primary_path}"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        SQLALCHEMY_BINDS = {"replica": f"sqlite:///{replica_path}"}
+        DB_REPLICA_STICKY_SECONDS = 10
+
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        db.create_all()
+        yield app, primary_path, replica_path
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    # Flask-SQLAlchemy registra una metadata por bind en el objeto global db.
+    db.metadatas.pop("replica", None)
+
+
+def _add_client(engine, workshop_id, name):
+    with engine.begin() as connection:
+        connection.execute(
+            Client.__table__.insert().values(
+                workshop_id=workshop_id, client_code=name[:6], full_name=name
+            )
+        )
+
+
+def test_read_only_views_use_replica_until_a_write(replica_app, monkeypatch):
+    app, primary_path, replica_path = replica_app
+
+    workshop = Workshop(name="Taller Replica")
+    db.session.add(workshop)
+    db.session.flush()
+    store = Store(name="Central", workshop_id=workshop.id)
+    db.session.add(store)
+    db.session.flush()
+    user = User(
+        full_name="Owner Replica",
+        email="replica@example.com",
+        role="owner",
+        store_id=store.id,
+        email_confirmed=True,
+        is_approved=True,
+        approved_at=datetime.now(timezone.utc),
+    )
+    user.set_password("Password1")
+    user.workshops.append(workshop)
+    db.session.add(user)
+    db.session.commit()
+    workshop_id = workshop.id
+
+    db.session.remove()
+    for engine in db.engines.values():
+        engine.dispose()
+    shutil.copyfile(primary_path, replica_path)
+
+    _add_client(db.engines["replica"], workshop_id, "Solo Replica")
+    _add_client(db.engine, workshop_id, "Solo Primario")
+
+    client = app.test_client()
+    client.post(
+        "/login", data={"email": "replica@example.com", "password": "Password1"}
+    )
+
+    # El login es un POST: la marca de primario sigue vigente.
+    html = client.get("/clients").get_data(as_text=True)
+    assert "Solo Primario" in html
+    assert "Solo Replica" not in html
+
+    clock = {"now": 1_000_000.0}
+    monkeypatch.setattr("app.database.time.time", lambda: clock["now"])
+    with client.session_transaction() as session:
+        session["db_primary_until"] = clock["now"] - 1
+
+    html = client.get("/clients").get_data(as_text=True)
+    assert "Solo Replica" in html
+    assert "Solo Primario" not in html
+
+    # Las vistas que no son de solo lectura siguen en el primario.
+    html = client.get("/clients/new").get_data(as_text=True)
+    assert "Solo Replica" not in html
+
+    client.post("/clients/new", data={"full_name": "Nuevo Cliente", "phone": "3510000000"})
+    html = client.get("/clients").get_data(as_text=True)
+    assert "Nuevo Cliente" in html
+    assert "Solo Primario" in html
+
+    clock["now"] += 11
+    html = client.get("/clients").get_data(as_text=True)
+    assert "Solo Replica" in html
+
+
+def test_replica_routing_is_disabled_without_bind(app, client, owner_user, login):
+    login(owner_user.email, "Password1")
+
+    client.get("/clients")
+
+    assert g.get("db_use_replica") is False
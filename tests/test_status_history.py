@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.extensions import db
+from app.models import Job, JobStatusEvent, User
+from app.services.status_history_service import StatusHistoryService
+from tests.test_list_queries import _seed_job
+
+
+def _login_seeded(owner_user, login):
+    email = owner_user.email
+    _seed_job(owner_user)
+    login(email, "Password1")
+    return Job.query.filter_by(code="LQ01").one()
+
+
+def test_new_job_and_status_change_record_transitions(client, owner_user, login):
+    job = _login_seeded(owner_user, login)
+
+    client.post(f"/jobs/{job.id}/status", data={"status": "ready"})
+
+    events = JobStatusEvent.query.filter_by(job_id=job.id).order_by(JobStatusEvent.id).all()
+    assert [(event.from_status, event.to_status) for event in events] == [
+        (None, "open"),
+        ("open", "ready"),
+    ]
+    assert events[0].user_id is None
+    assert events[1].user_id is not None
+    assert events[1].store_id == job.store_id
+
+
+def test_turnaround_reports_percentiles_per_store_and_service(app, owner_user):
+    _seed_job(owner_user)
+    job = Job.query.filter_by(code="LQ01").one()
+    created = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+    job.created_at = created
+    db.session.add_all(
+        JobStatusEvent(
+            job_id=job.id,
+            workshop_id=job.workshop_id,
+            store_id=job.store_id,
+            from_status="open",
+            to_status="ready",
+            at=created + timedelta(hours=hours),
+        )
+        # Solo cuenta la primera llegada al estado.
+        for hours in (10, 30)
+    )
+    db.session.commit()
+
+    rows = StatusHistoryService.turnaround(
+        job.workshop_id,
+        datetime(2026, 3, 1, tzinfo=timezone.utc),
+        datetime(2026, 4, 1, tzinfo=timezone.utc),
+    )
+
+    assert [row["service_name"] for row in rows] == ["Frenos", "Lavado"]
+    for row in rows:
+        assert row["jobs"] == 1
+        assert row["p50_seconds"] == pytest.approx(10 * 3600, abs=1)
+        assert row["p90_seconds"] == pytest.approx(10 * 3600, abs=1)
+
+    assert StatusHistoryService.turnaround(
+        job.workshop_id,
+        datetime(2026, 4, 1, tzinfo=timezone.utc),
+        datetime(2026, 5, 1, tzinfo=timezone.utc),
+    ) == []
+
+
+def test_turnaround_page_renders_for_owner(client, owner_user, login):
+    _login_seeded(owner_user, login)
+
+    response = client.get("/reports/turnaround?month=2026-03&target=closed")
+
+    assert response.status_code == 200
+    assert "Tiempos de ciclo" in response.get_data(as_text=True)
+
+
+def _staff_user(owner_user, email="staff@example.com"):
+    staff = User(
+        full_name="Staff",
+        email=email,
+        role="staff",
+        store_id=owner_user.store_id,
+        email_confirmed=True,
+        is_approved=True,
+    )
+    staff.set_password("Password1")
+    staff.workshops.append(owner_user.workshops[0])
+    db.session.add(staff)
+    db.session.commit()
+    return staff.id
+
+
+def _delete_with_foreign_keys(client, user_id):
+    # SQLite no valida foreign keys salvo que se pida: asi se comporta como Postgres.
+    db.session.commit()
+    db.session.execute(db.text("PRAGMA foreign_keys=ON"))
+    try:
+        return client.post(f"/users/{user_id}/delete", follow_redirects=True)
+    finally:
+        db.session.rollback()
+        db.session.execute(db.text("PRAGMA foreign_keys=OFF"))
+
+
+def test_deleting_a_user_keeps_their_status_events(client, owner_user, login):
+    staff_id = _staff_user(owner_user)
+    job = _login_seeded(owner_user, login)
+    db.session.add(
+        JobStatusEvent(
+            job_id=job.id,
+            workshop_id=job.workshop_id,
+            store_id=job.store_id,
+            from_status="open",
+            to_status="ready",
+            user_id=staff_id,
+        )
+    )
+
+    response = _delete_with_foreign_keys(client, staff_id)
+
+    assert "Usuario eliminado" in response.get_data(as_text=True)
+    assert db.session.get(User, staff_id) is None
+    event = JobStatusEvent.query.filter_by(to_status="ready").one()
+    assert event.user_id is None
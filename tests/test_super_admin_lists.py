@@ -0,0 +1,136 @@
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import AuditLog, Store, User
+from app.services.stats_service import StatsService
+from app.date_ranges import current_month_start
+from tests.test_approval import _create_dashboard_job
+
+
+def _create_owners(create_owner_user, count):
+    return [
+        create_owner_user(
+            email=f"owner{index:02d}@example.com",
+            full_name=f"Owner {index:02d}",
+            workshop_name=f"Taller {index:02d}",
+        )
+        for index in range(count)
+    ]
+
+
+def test_owners_list_is_keyset_paginated(
+    client, create_owner_user, create_super_admin_user, login
+):
+    _create_owners(create_owner_user, 30)
+    create_super_admin_user(email="root-lists@example.com")
+    login("root-lists@example.com", "Password1")
+
+    first_page = client.get("/admin/owners").get_data(as_text=True)
+    assert "owner29@example.com" in first_page
+    assert "owner05@example.com" in first_page
+    assert "owner04@example.com" not in first_page
+
+    last_shown = User.query.filter_by(email="owner05@example.com").first()
+    second_page = client.get(f"/admin/owners?before={last_shown.id}").get_data(as_text=True)
+    assert "owner04@example.com" in second_page
+    assert "owner00@example.com" in second_page
+    assert "owner05@example.com" not in second_page
+
+    first_on_second = User.query.filter_by(email="owner04@example.com").first()
+    back_page = client.get(f"/admin/owners?after={first_on_second.id}").get_data(as_text=True)
+    assert "owner05@example.com" in back_page
+    assert "owner29@example.com" in back_page
+
+
+def test_owners_and_pending_lists_are_searchable(
+    client, create_owner_user, create_super_admin_user, login
+):
+    create_owner_user(email="ana@example.com", full_name="Ana", workshop_name="Rodados Sur")
+    create_owner_user(
+        email="beto@example.com",
+        full_name="Beto",
+        workshop_name="Bici Norte",
+        is_approved=False,
+    )
+    create_super_admin_user(email="root-search@example.com")
+    login("root-search@example.com", "Password1")
+
+    owners_html = client.get("/admin/owners?q=rodados").get_data(as_text=True)
+    assert "ana@example.com" in owners_html
+    assert "beto@example.com" not in owners_html
+
+    pending_html = client.get("/admin/pending?q=ana").get_data(as_text=True)
+    assert "No hay registros que coincidan" in pending_html
+    pending_html = client.get("/admin/pending?q=norte").get_data(as_text=True)
+    assert "beto@example.com" in pending_html
+
+
+def test_owner_usage_is_a_single_grouped_query(app, create_owner_user):
+    owners = _create_owners(create_owner_user, 3)
+    extra_store = Store()
+    extra_store.name = "Sucursal dos"
+    extra_store.workshop_id = owners[0].workshops[0].id
+    db.session.add(extra_store)
+    db.session.add(
+        AuditLog(
+            workshop_id=owners[0].workshops[0].id,
+            action="update",
+            entity_type="job",
+            created_at=datetime(2026, 5, 2, 10, 30),
+        )
+    )
+    db.session.commit()
+    _create_dashboard_job(
+        owners[0],
+        code="USE1",
+        created_at=datetime.utcnow(),
+        service_price="100.00",
+    )
+
+    owner_ids = [owner.id for owner in owners]
+    statements = []
+
+    def _count(*args):
+        statements.append(args)
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        usage = StatsService.owner_usage(owner_ids, current_month_start())
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert len(statements) == 1
+    assert usage[owner_ids[0]]["stores_count"] == 2
+    assert usage[owner_ids[0]]["jobs_month"] == 1
+    assert usage[owner_ids[0]]["last_activity_at"] == datetime(2026, 5, 2, 10, 30)
+    assert usage[owner_ids[1]] == {
+        "workshops_count": 1,
+        "stores_count": 1,
+        "jobs_month": 0,
+        "last_activity_at": None,
+    }
+
+
+def test_audit_list_is_paginated_and_searchable(
+    client, create_super_admin_user, login
+):
+    for index in range(60):
+        db.session.add(
+            AuditLog(action="update", entity_type="job", description=f"Evento {index:02d}")
+        )
+    db.session.add(AuditLog(action="delete", entity_type="owner", description="Owner borrado"))
+    db.session.commit()
+    create_super_admin_user(email="root-audit@example.com")
+    login("root-audit@example.com", "Password1")
+
+    html = client.get("/admin/audit").get_data(as_text=True)
+    assert "Owner borrado" in html
+    assert "Evento 59" in html
+    assert "Evento 00" not in html
+    assert "Siguiente" in html
+
+    html = client.get("/admin/audit?q=borrado").get_data(as_text=True)
+    assert "Owner borrado" in html
+    assert "Evento 59" not in html
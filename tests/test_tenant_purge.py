@@ -0,0 +1,111 @@
+from app.extensions import db
+from app.models import (
+    AuditLog,
+    Job,
+    JobItem,
+    JobStatusEvent,
+    OfflineMutation,
+    Store,
+    User,
+    Workshop,
+    WorkshopMonthlyStat,
+)
+from app.services.tenant_purge_service import TenantPurgeService
+from tests.test_list_queries import _seed_job
+
+
+def _audit(user_id, workshop_id, store_id, entity_id):
+    db.session.add(
+        AuditLog(
+            user_id=user_id,
+            workshop_id=workshop_id,
+            store_id=store_id,
+            action="create",
+            entity_type="job",
+            entity_id=entity_id,
+        )
+    )
+
+
+def test_purge_deletes_workshop_data_in_batches_and_keeps_audit_rows(
+    app, owner_user, create_owner_user
+):
+    owner_id = owner_user.id
+    workshop_id, store_id = _seed_job(owner_user)
+    other = create_owner_user(email="other@example.com", workshop_name="Otro taller")
+    other_workshop_id = other.workshops[0].id
+    job_id = Job.query.filter_by(code="LQ01").one().id
+    db.session.add(
+        OfflineMutation(
+            workshop_id=workshop_id,
+            user_id=owner_id,
+            job_id=job_id,
+            idempotency_key="k1",
+            action="status",
+            result="ok",
+        )
+    )
+    for _ in range(3):
+        _audit(owner_id, workshop_id, store_id, job_id)
+    _audit(owner_id, None, store_id, job_id)
+    _audit(other.id, other_workshop_id, other.store_id, None)
+    db.session.commit()
+    assert WorkshopMonthlyStat.query.filter_by(workshop_id=workshop_id).count() == 1
+    assert TenantPurgeService.has_business_data(workshop_id)
+
+    calls = []
+    counts = TenantPurgeService.purge(
+        workshop_id, batch_size=2, progress=lambda table, rows: calls.append((table, rows))
+    )
+
+    assert db.session.get(Workshop, workshop_id) is None
+    assert db.session.get(Store, store_id) is None
+    assert Job.query.count() == 0
+    assert JobItem.query.count() == 0
+    assert JobStatusEvent.query.count() == 0
+    assert OfflineMutation.query.count() == 0
+    assert WorkshopMonthlyStat.query.filter_by(workshop_id=workshop_id).count() == 0
+    assert counts["job_items"] == 2
+    # Las dos pasadas sobre audit_logs (por taller y por sucursal) suman un solo total.
+    assert counts["audit_logs"] == 4
+    assert [rows for table, rows in calls if table == "audit_logs"] == [2, 3, 4]
+
+    assert AuditLog.query.filter_by(store_id=None, user_id=owner_id).count() == 4
+    assert AuditLog.query.filter_by(workshop_id=other_workshop_id).count() == 1
+    assert db.session.get(Workshop, other_workshop_id) is not None
+    owner = db.session.get(User, owner_id)
+    assert owner.store_id is None and owner.workshops == []
+
+
+def test_owner_delete_anonymizes_owner_audit_rows(
+    client, create_owner_user, create_super_admin_user, login
+):
+    super_admin = create_super_admin_user(email="root-purge@example.com")
+    owner = create_owner_user(email="purge-owner@example.com", is_approved=False, is_active=False)
+    owner_id = owner.id
+    workshop_id = owner.workshops[0].id
+    _audit(owner_id, workshop_id, owner.store_id, None)
+    _audit(owner_id, None, None, None)
+    db.session.commit()
+
+    login(super_admin.email, "Password1")
+    response = client.post(f"/admin/owners/{owner_id}/delete", follow_redirects=True)
+
+    assert "Owner eliminado con su taller y sucursales" in response.get_data(as_text=True)
+    db.session.expire_all()
+    assert db.session.get(User, owner_id) is None
+    assert db.session.get(Workshop, workshop_id) is None
+    assert AuditLog.query.filter_by(user_id=owner_id).count() == 0
+    assert AuditLog.query.filter_by(entity_type="job", user_id=None, workshop_id=None).count() == 2
+
+
+def test_tenant_purge_command_reports_progress(app, owner_user):
+    workshop_id, _ = _seed_job(owner_user)
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["tenant-purge", str(workshop_id), "--yes"])
+
+    assert result.exit_code == 0, result.output
+    assert "jobs: 1 fila(s)" in result.output
+    assert f"Taller {workshop_id} borrado" in result.output
+    assert db.session.get(Workshop, workshop_id) is None
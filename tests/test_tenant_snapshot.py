@@ -0,0 +1,97 @@
+from psycopg import sql
+
+from app.extensions import db
+from app.services.tenant_snapshot_service import (
+    JOB_CODE_ALPHABET,
+    TABLES,
+    _export_select,
+    _insert_statement,
+    _job_code_expression,
+    _references,
+)
+
+
+def test_snapshot_tables_cover_workshop_data_in_dependency_order(app):
+    for position, table_name in enumerate(TABLES):
+        for target in _references(table_name).values():
+            assert target == "users" or target in TABLES[:position], (table_name, target)
+
+    scoped = {
+        table.name
+        for table in db.metadata.sorted_tables
+        if "workshop_id" in table.c and table.name not in ("user_workshops",)
+    }
+    # Derivadas o transitorias: se recalculan o no tienen sentido en otra instancia.
+    assert scoped - set(TABLES) == {"workshop_monthly_stats", "offline_mutations"}
+
+
+def test_tenant_commands_require_postgresql(app, tmp_path):
+    runner = app.test_cli_runner()
+
+    exported = runner.invoke(args=["tenant-export", "1", "--output", str(tmp_path / "t.tar")])
+
+    assert exported.exit_code != 0
+    assert "requiere PostgreSQL" in exported.output
+
+
+def _sql_text(composed):
+    return composed.as_string()
+
+
+def test_insert_statement_remaps_references_through_staging_tables(app):
+    statement = _sql_text(_insert_statement(sql, "jobs", 7))
+
+    assert statement.startswith('INSERT INTO "jobs" (')
+    assert 'SELECT s.new_id, 7, "ref_store_id".new_id, "ref_bicycle_id".new_id, s."code"' in statement
+    assert 'FROM "snapshot_jobs" s ' in statement
+    assert 'LEFT JOIN "snapshot_stores" "ref_store_id" ON "ref_store_id".id = s."store_id"' in statement
+    assert (
+        'LEFT JOIN "snapshot_bicycles" "ref_bicycle_id" ON "ref_bicycle_id".id = s."bicycle_id"'
+        in statement
+    )
+    # El taller no se une: todas las filas van al taller nuevo.
+    assert "snapshot_workshops" not in statement
+
+
+def test_insert_statement_remaps_audit_entities_by_type(app):
+    statement = _sql_text(_insert_statement(sql, "audit_logs", 7))
+
+    assert (
+        'LEFT JOIN snapshot_users_map "ref_user_id" ON "ref_user_id".id = s."user_id"' in statement
+    )
+    assert "CASE s.entity_type " in statement
+    assert (
+        """WHEN 'job' THEN (SELECT x.new_id FROM "snapshot_jobs" x WHERE x.id = s.entity_id)"""
+        in statement
+    )
+    assert (
+        "WHEN 'owner' THEN (SELECT x.new_id FROM snapshot_users_map x WHERE x.id = s.entity_id)"
+        in statement
+    )
+
+
+def test_export_select_scopes_job_children_through_jobs(app):
+    columns = ["id", "job_id"]
+
+    items = _sql_text(_export_select(sql, "job_items", columns, 3))
+    jobs = _sql_text(_export_select(sql, "jobs", columns, 3))
+
+    assert items == (
+        'SELECT "id", "job_id" FROM "job_items" '
+        "WHERE job_id IN (SELECT id FROM jobs WHERE workshop_id = 3)"
+    )
+    assert jobs.endswith('FROM "jobs" WHERE workshop_id = 3')
+
+
+def test_job_code_expression_covers_the_whole_code_space(app):
+    expression = _sql_text(_job_code_expression(sql, 4))
+    last = len(JOB_CODE_ALPHABET) ** 4 - 1
+
+    codes = db.session.execute(
+        db.text(
+            f"SELECT {expression} FROM (SELECT 0 AS n UNION ALL SELECT 35 UNION ALL "
+            f"SELECT 36 UNION ALL SELECT {last}) ORDER BY n"
+        )
+    ).scalars().all()
+
+    assert codes == ["AAAA", "AAA9", "AABA", "9999"]
@@ -0,0 +1,78 @@
+import sqlalchemy as sa
+
+from app.extensions import db
+from app.services import pdf_service
+from app.warmup import warm_up
+
+
+def test_warm_up_compiles_templates_queries_and_pdf_styles(app):
+    pdf_service.pdf_styles.cache_clear()
+    compiled_cache = db.engine._compiled_cache
+    compiled_cache.clear()
+
+    summary = warm_up(app)
+
+    assert summary["templates"] >= 20
+    cached_names = {name for _, name in app.jinja_env.cache.keys()}
+    assert "main/jobs/index.html" in cached_names
+    assert summary["queries"] >= 10
+    assert len(compiled_cache) >= summary["queries"]
+    assert summary["pdf"] is True
+    assert pdf_service.pdf_styles.cache_info().currsize == 1
+
+
+def test_warmup_command(app):
+    result = app.test_cli_runner().invoke(args=["warmup"])
+
+    assert result.exit_code == 0
+    assert "Warm-up:" in result.output
+    assert "PDF listo" in result.output
+
+
+def test_warm_up_survives_database_errors(app, monkeypatch):
+    def broken_queries():
+        raise sa.exc.OperationalError("SELECT 1", {}, Exception("db caida"))
+
+    monkeypatch.setattr("app.warmup.warm_queries", broken_queries)
+
+    summary = warm_up(app)
+
+    assert summary["queries"] == 0
+    assert summary["templates"] > 0
+
+
+def test_compile_templates_writes_bytecode_cache(tmp_path):
+    from app import create_app
+    from tests.conftest import TestingConfig
+
+    class BytecodeConfig(TestingConfig):
+        JINJA_BYTECODE_CACHE_DIR = str(tmp_path / "jinja")
+
+    app = create_app(BytecodeConfig)
+    result = app.test_cli_runner().invoke(args=["compile-templates"])
+
+    assert result.exit_code == 0
+    assert "template(s) compilados" in result.output
+    cached_files = list((tmp_path / "jinja").iterdir())
+    assert len(cached_files) >= 20
+
+    # Otro proceso (otro worker) carga el bytecode sin recompilar.
+    fresh_app = create_app(BytecodeConfig)
+    bucket_loads = []
+    cache = fresh_app.jinja_env.bytecode_cache
+    original_load = cache.load_bytecode
+
+    def tracking_load(bucket):
+        original_load(bucket)
+        bucket_loads.append(bucket.code is not None)
+
+    cache.load_bytecode = tracking_load
+    fresh_app.jinja_env.get_template("main/jobs/index.html")
+    assert bucket_loads == [True]
+
+
+def test_compile_templates_requires_cache_dir(app):
+    result = app.test_cli_runner().invoke(args=["compile-templates"])
+
+    assert result.exit_code != 0
+    assert "JINJA_BYTECODE_CACHE_DIR" in result.output